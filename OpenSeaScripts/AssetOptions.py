@@ -1,5 +1,7 @@
 class AssetOptions:
     preview_extensions = ["mp4", "webm", "mp3", "wav", "ogg", "glb", "gltf"]
+    __slots__ = ["asset_path", "preview_path", "name", "external_link", "description", "properties", "levels", "stats",
+        "unlockable_content", "explicit", "supply", "blockchain", "listed_link"] # No per-instance __dict__, large batches stay small
 
     def __init__(self, asset_path, name):
         self.asset_path = asset_path
@@ -159,4 +161,16 @@ class AssetOptions:
         return self
     
     def get_listed_link(self):
-        return self.listed_link
\ No newline at end of file
+        return self.listed_link
+
+    def to_dict(self):
+        return {field: ([dict(item) for item in getattr(self, field)] if isinstance(getattr(self, field), list) else getattr(self, field)) for field in AssetOptions.__slots__}
+
+    def from_dict(values):
+        asset_options = AssetOptions(values["asset_path"], values["name"])
+
+        for field in AssetOptions.__slots__:
+            if field in values:
+                setattr(asset_options, field, [dict(item) for item in values[field]] if isinstance(values[field], list) else values[field])
+
+        return asset_options
@@ -0,0 +1,449 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio, functools, time
+from OpenSeaScripts.AssetOptions import AssetOptions
+from OpenSeaScripts.StepError import StepError, ElementTimeoutError, ValidationError, ConfirmationMissingError
+from OpenSeaScripts import Scripts
+
+class AsyncOSSBrowser:
+    default_concurrency = 8 # Blocking calls allowed at once across every AsyncOSSBrowser sharing the default limits
+    ready_waits = {"upload.media": ("media", 7, ElementTimeoutError, "Element not found"), "upload.details": ("name", 7, ElementTimeoutError, "Element not found"),
+        "upload.create": ("create", 7, ElementTimeoutError, "Element not found"), "upload.confirmation": ("created", 15, ConfirmationMissingError, "Failed to create asset"),
+        "sell.price": ("price", 7, ElementTimeoutError, "Element not found"), "sell.submit": ("submit", 7, ElementTimeoutError, "Element not found"),
+        "sell.sign_window": ("sign", 7, ElementTimeoutError, "Element not found")} # Step -> (selector name, timeout, error class, message) of the element it waits for first
+    _default_executor = None
+    _default_semaphores = {} # Event loop -> its default semaphore
+
+    def __init__(self, browser, executor:ThreadPoolExecutor = None, semaphore:asyncio.Semaphore = None):
+        """
+        Wrap an OSSBrowser so it can be driven from asyncio. Uploads and sales run OSSBrowser's steps one at a time
+        from the event loop: each step's WebDriver calls run on a shared thread pool, and the element or confirmation
+        it waits for first is polled with asyncio.sleep in between, so a session only holds a thread while the browser
+        is working. A semaphore caps how many blocking calls run at once across every session sharing it.
+        Waits inside a step, such as for an attribute modal or the MetaMask window, still hold its thread.
+        Use AsyncOSSBrowser.create to open the browser too.
+
+        Args:
+            browser (OSSBrowser): The browser to wrap.
+            executor (ThreadPoolExecutor, optional): The threads blocking calls run on. Defaults to a pool shared by every AsyncOSSBrowser.
+            semaphore (asyncio.Semaphore, optional): Limits how many blocking calls run at once. Defaults to a semaphore of
+                AsyncOSSBrowser.default_concurrency shared by every AsyncOSSBrowser on the running event loop.
+        """
+        self.browser = browser
+        self.executor = executor if executor is not None else AsyncOSSBrowser._shared_executor()
+        self.semaphore = semaphore
+        self._session_lock = asyncio.Lock() # A session can only do one thing at a time
+        self._running = None # The future of the last blocking call, which may outlive a cancelled operation
+
+    @classmethod
+    def _shared_executor(cls):
+        if cls._default_executor is None:
+            cls._default_executor = ThreadPoolExecutor(max_workers=cls.default_concurrency, thread_name_prefix="AsyncOSSBrowser")
+
+        return cls._default_executor
+
+    def _get_semaphore(self):
+        if self.semaphore is None:
+            loop = asyncio.get_running_loop()
+
+            if loop not in AsyncOSSBrowser._default_semaphores:
+                AsyncOSSBrowser._default_semaphores[loop] = asyncio.Semaphore(AsyncOSSBrowser.default_concurrency)
+
+            self.semaphore = AsyncOSSBrowser._default_semaphores[loop]
+
+        return self.semaphore
+
+    @classmethod
+    async def create(cls, *args, executor:ThreadPoolExecutor = None, semaphore:asyncio.Semaphore = None, **kwargs):
+        """
+        Open an OSSBrowser without blocking the event loop, and wrap it.
+
+        Args:
+            *args: Arguments for OSSBrowser.
+            executor (ThreadPoolExecutor, optional): See AsyncOSSBrowser.
+            semaphore (asyncio.Semaphore, optional): See AsyncOSSBrowser.
+            **kwargs: Keyword arguments for OSSBrowser.
+
+        Returns:
+            AsyncOSSBrowser: The wrapped browser.
+        """
+        from OpenSeaScripts.OSSBrowser import OSSBrowser # Imported here so this module can be imported without Selenium
+
+        executor = executor if executor is not None else cls._shared_executor()
+        browser = await asyncio.get_running_loop().run_in_executor(executor, functools.partial(OSSBrowser, *args, **kwargs))
+        return cls(browser, executor, semaphore)
+
+    async def _run(self, func, *args, **kwargs):
+        """
+        Run a quick blocking call on the executor, holding a slot of the semaphore only while it runs.
+        If the caller is cancelled, the call finishes in the background and its slot is released once it does.
+
+        Args:
+            func (callable): The blocking function.
+            *args: Arguments for func.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            The value returned by func.
+        """
+        semaphore = self._get_semaphore()
+        await semaphore.acquire()
+
+        def release(done):
+            if not done.cancelled():
+                done.exception() # Retrieved so an abandoned call's error isn't reported as never retrieved
+
+            semaphore.release()
+
+        self._running = asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+        self._running.add_done_callback(release)
+        return await asyncio.shield(self._running)
+
+    async def _exclusive(self, func, *args, timeout:float = None):
+        """
+        Run a coroutine function that drives the browser while holding the session, so it does one thing at a time.
+        If it times out or is cancelled, the error is raised at once and the browser's waits are cancelled, so a
+        blocking call still running stops at its next wait. The session is only released once that call is done.
+
+        Args:
+            func (callable): The coroutine function.
+            *args: Arguments for func.
+            timeout (float, optional): Seconds before asyncio.TimeoutError is raised. Defaults to None.
+
+        Raises:
+            asyncio.TimeoutError: If func took longer than timeout.
+
+        Returns:
+            The value returned by func.
+        """
+        await self._session_lock.acquire()
+        self.browser.waiter.reset()
+        self._running = None
+
+        try:
+            return await asyncio.wait_for(func(*args), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            self.browser.waiter.cancel() # Stop the blocking call still running at its next wait
+            raise
+        finally:
+            running = self._running
+
+            if running is not None and not running.done():
+                running.add_done_callback(lambda done: self._session_lock.release()) # Keep the session until the thread is done with it
+            else:
+                self._session_lock.release()
+
+    async def _operation(self, operation:str, steps:list, retries:int, ready_args:dict, **attributes):
+        """
+        Run the steps of an OSSBrowser operation from the event loop. Each step's WebDriver calls run on the executor,
+        and what the step waits for first is awaited without holding a thread. Like OSSBrowser._run_operation,
+        the operation is paced by the browser's scheduler if it has one, and retried from where _resume_index allows.
+
+        Args:
+            operation (str): The operation name, such as "upload".
+            steps (list): (name, callable) pairs from OSSBrowser._upload_steps or _sell_steps.
+            retries (int): How many times to retry a failed operation.
+            ready_args (dict): Selector name -> values for its placeholders, for the selectors in ready_waits.
+            **attributes: Extra values stored in every span.
+
+        Raises:
+            StepError: If a step fails and the operation can't be retried.
+
+        Returns:
+            The value returned by the last step.
+        """
+        browser = self.browser
+        scheduler = browser.scheduler
+
+        if scheduler is not None:
+            while True:
+                wait = scheduler.try_acquire()
+
+                if wait == 0:
+                    break
+
+                await asyncio.sleep(wait if wait is not None else browser.waiter.max_interval) # None waits for another operation to finish
+
+        ok = False
+        throttled = None
+
+        try:
+            with browser.tracer.span(operation, **attributes):
+                start = 0
+
+                while True:
+                    try:
+                        result = await self._steps(operation, steps, start, ready_args, **attributes)
+                        ok = True
+                        return result
+                    except StepError as e:
+                        index = browser._resume_index(operation, steps, e) if retries > 0 else None
+
+                        if index is None:
+                            e.committed = browser._committed(operation, steps, e)
+
+                            if scheduler is not None:
+                                throttled = await self._run(browser.is_throttled)
+
+                            raise
+
+                        print("Retrying", operation, "from", steps[index][0] + ":", e)
+                        start = index
+                        retries -= 1
+        finally:
+            if scheduler is not None:
+                scheduler.release(ok, throttled is not None, throttled or "")
+
+    async def _steps(self, operation:str, steps:list, start:int, ready_args:dict, **attributes):
+        """
+        Run steps[start:] in order, timing each with the browser's tracer. A step that fails raises a StepError
+        tagged with the step's name, as in OSSBrowser._run_steps.
+
+        Args:
+            operation (str): The operation name, such as "upload".
+            steps (list): (name, callable) pairs.
+            start (int): The index of the first step to run.
+            ready_args (dict): See _operation.
+            **attributes: Extra values stored in every span.
+
+        Raises:
+            StepError: If a step fails.
+
+        Returns:
+            The value returned by the last step.
+        """
+        result = None
+
+        for name, step in steps[start:]:
+            with self.browser.tracer.span(operation + "." + name, **attributes):
+                try:
+                    await self._ready(operation, name, ready_args)
+                    result = await self._run(step)
+                except StepError as e:
+                    if e.step is None: # Tag the error with where it happened
+                        e.step, e.operation = name, operation
+
+                    raise
+                except Exception as e:
+                    raise StepError(str(e), name, operation) from e
+
+        return result
+
+    async def _ready(self, operation:str, name:str, ready_args:dict):
+        """
+        Wait, without holding a thread, for what a step waits for first, so the step finds it at once.
+        Elements found are cached in the browser's selectors for the step to use.
+
+        Args:
+            operation (str): The operation name, such as "upload".
+            name (str): The step name, such as "confirmation".
+            ready_args (dict): See _operation.
+
+        Raises:
+            StepError: The error the step would raise, if what it waits for doesn't appear in time.
+        """
+        browser = self.browser
+        key = operation + "." + name
+
+        if key == "sell.confirmation": # A listing or a rejection, see OSSBrowser._await_listed
+            probe = lambda: browser.driver.execute_script(Scripts.LISTING_STATE, "Your NFT is listed!", browser.rejection_texts)
+            await self._poll(probe, 15, "listed", ConfirmationMissingError, "Failed to sell asset")
+            return
+
+        if key not in AsyncOSSBrowser.ready_waits:
+            return
+
+        selector_name, timeout, error, error_message = AsyncOSSBrowser.ready_waits[key]
+        selector = browser.selectors.get(selector_name, *ready_args.get(selector_name, ()))
+        find = self._probe(selector.by, selector.value, selector.text)
+
+        def probe():
+            element = find()
+
+            if element is not None:
+                browser.selectors.store(selector, element)
+
+            return element
+
+        await self._poll(probe, timeout, selector.value, error, error_message)
+
+    async def upload_asset(self, asset_options, create_link:str = "https://opensea.io/asset/create?enable_supply=true", timeout:float = None,
+        batch_attributes:bool = True, fast_fill:bool = True, retries:int = 1):
+        """
+        Upload a given asset to opensea.io. See OSSBrowser.upload_asset.
+
+        Args:
+            asset_options (AssetOptions): The asset object to upload.
+            create_link (str, optional): The URL to use to upload. Defaults to "https://opensea.io/asset/create?enable_supply=true".
+            timeout (float, optional): Seconds before asyncio.TimeoutError is raised. Defaults to None.
+            batch_attributes (bool, optional): See OSSBrowser.upload_asset. Defaults to True.
+            fast_fill (bool, optional): See OSSBrowser.upload_asset. Defaults to True.
+            retries (int, optional): How many times to retry after a transient failure. Defaults to 1.
+
+        Returns:
+            Boolean: False if the asset was not uploaded.
+            str: The URL of the asset if it was uploaded.
+        """
+        async def upload():
+            try:
+                if not isinstance(asset_options, AssetOptions):
+                    raise ValidationError("Asset options must be an instance of AssetOptions")
+
+                await self._run(self.browser._before_operation)
+                steps = self.browser._upload_steps(asset_options, create_link, batch_attributes, fast_fill)
+                return await self._operation("upload", steps, retries, {"created": (asset_options.get_name(),)}, asset=asset_options.get_name())
+            except Exception as e:
+                print("Error:", e)
+                self.browser.last_error = e
+                return False
+
+        return await self._exclusive(upload, timeout=timeout)
+
+    async def sell_asset(self, asset_link:str, price:float, start_date = None, end_date = None, timeout:float = None, retries:int = 1):
+        """
+        Sell an uploaded asset from the given URL. See OSSBrowser.sell_asset.
+
+        Args:
+            asset_link (str): The URL of the asset to sell.
+            price (float): The price to sell the asset for.
+            start_date (datetime, optional): The start date of the sale.
+            end_date (datetime, optional): The end date of the sale.
+            timeout (float, optional): Seconds before asyncio.TimeoutError is raised. Defaults to None.
+            retries (int, optional): How many times to retry after a transient failure. Defaults to 1.
+
+        Returns:
+            True if the asset was sold successfully, False otherwise.
+        """
+        async def sell():
+            try:
+                await self._run(self.browser._before_operation)
+                steps = self.browser._sell_steps(asset_link, price, start_date, end_date)
+                return await self._operation("sell", steps, retries, {}, asset=asset_link)
+            except Exception as e:
+                print("Error:", e)
+                self.browser.last_error = e
+                return False
+
+        return await self._exclusive(sell, timeout=timeout)
+
+    def _probe(self, by:str, value:str, content_text:str = None):
+        """
+        Returns a quick blocking check for an element, to run on the executor.
+
+        Args:
+            by (str): The method to search for value. Most likely By.ID or By.CSS_SELECTOR.
+            value (str): The value to search for.
+            content_text (str, optional): The content the element must have, or None for any. Defaults to None.
+
+        Returns:
+            callable: Returns the element, or None if it isn't on the page.
+        """
+        from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException # Imported here so this module can be imported without Selenium
+        from selenium.webdriver.common.by import By
+
+        driver = self.browser.driver
+
+        def probe():
+            try:
+                if content_text is None:
+                    elements = driver.find_elements(by, value)
+                    return elements[0] if len(elements) > 0 else None
+
+                if by == By.CSS_SELECTOR:
+                    return driver.execute_script(Scripts.FIND_BY_TEXT, value, content_text) # One round trip instead of one per element
+
+                for element in driver.find_elements(by, value):
+                    if element.text == content_text: # Check if element has the correct content
+                        return element
+            except (NoSuchElementException, StaleElementReferenceException):
+                pass # The page changed under us, try again
+
+            return None
+
+        return probe
+
+    async def _poll(self, probe, timeout:float, description:str, error:type = ElementTimeoutError, error_message:str = "Element not found"):
+        """
+        Call a quick blocking probe on the executor until it returns a truthy value, sleeping between probes without
+        holding a thread, with the same adaptive interval as the browser's ElementWaiter. Each wait is recorded
+        in the waiter's history, so its on_wait hook sees it.
+
+        Args:
+            probe (callable): Returns a truthy value when the wait is over.
+            timeout (float): How long to wait before failing.
+            description (str): A name for this wait, stored in its WaitRecord.
+            error (type, optional): The StepError class raised on timeout. Defaults to ElementTimeoutError.
+            error_message (str, optional): The message of the exception raised on timeout. Defaults to "Element not found".
+
+        Raises:
+            StepError: An error of class error, if the probe doesn't succeed after timeout seconds.
+
+        Returns:
+            The truthy value returned by probe.
+        """
+        waiter = self.browser.waiter
+        start = time.monotonic()
+        deadline = start + timeout
+        interval = waiter.min_interval
+
+        while True:
+            result = await self._run(probe)
+
+            if result:
+                waiter.record(description, start, True)
+                return result
+
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                waiter.record(description, start, False)
+                raise error(error_message)
+
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * waiter.backoff, waiter.max_interval)
+
+    async def wait_for_element(self, by:str, value:str, timeout:float = 7):
+        """
+        Wait for an HTML element to appear without blocking the event loop.
+
+        Args:
+            by (str): The method to search for value. Most likely By.ID or By.CSS_SELECTOR.
+            value (str): The value to search for.
+            timeout (float, optional): How long to wait before failing. Defaults to 7.
+
+        Raises:
+            ElementTimeoutError: If the element is not found after timeout seconds.
+
+        Returns:
+            selenium.webdriver.remote.webelement.WebElement: The element found.
+        """
+        return await self._exclusive(self._poll, self._probe(by, value), timeout, value)
+
+    async def wait_for_text(self, by:str, value:str, content_text:str, timeout:float = 7):
+        """
+        Wait for an HTML element with content content_text to appear without blocking the event loop.
+
+        Args:
+            by (str): The method to search for value. Most likely By.ID or By.CSS_SELECTOR.
+            value (str): The value to search for.
+            content_text (str): The content of the element to search for.
+            timeout (float, optional): How long to wait before failing. Defaults to 7.
+
+        Raises:
+            ElementTimeoutError: If the element is not found after timeout seconds.
+
+        Returns:
+            selenium.webdriver.remote.webelement.WebElement: The element found.
+        """
+        return await self._exclusive(self._poll, self._probe(by, value, content_text), timeout, value + " " + content_text)
+
+    async def get_session_data(self):
+        """
+        Returns the session data of the wrapped browser. See OSSBrowser.get_session_data.
+        """
+        return self.browser.get_session_data()
+
+    async def close(self):
+        """
+        Closes the browser.
+        """
+        await self._exclusive(self._run, self.browser.close)
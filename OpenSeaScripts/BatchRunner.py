@@ -0,0 +1,503 @@
+from OpenSeaScripts.ManifestLoader import ManifestLoader
+from OpenSeaScripts.OSSBrowserPool import OSSBrowserPool
+import collections, datetime, json, sys, threading, time
+
+BatchResult = collections.namedtuple("BatchResult", ["asset", "url", "listed", "error", "seconds"])
+
+def parse_duration(text):
+    """
+    Returns a length of time in seconds, from a number of seconds or a number followed by s, m, h or d.
+
+    Args:
+        text (str): The duration, such as "90", "30m", "2h" or "7d".
+
+    Raises:
+        ValueError: If the duration can't be read.
+
+    Returns:
+        float: The duration in seconds.
+    """
+    units = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+    text = str(text).strip().lower()
+
+    try:
+        if text[-1:] in units:
+            return float(text[:-1]) * units[text[-1]]
+
+        return float(text)
+    except ValueError:
+        raise ValueError("Invalid duration: " + text)
+
+class SellTemplate:
+    def __init__(self, price:float, start_in:float = None, duration:float = None, prices:dict = None):
+        """
+        Create a template for listing every asset of a batch: its price, and when each sale starts and ends,
+        counted from when the asset is listed.
+
+        Args:
+            price (float): The price of every asset not in prices.
+            start_in (float, optional): Seconds from listing until the sale starts. Defaults to starting at once.
+            duration (float, optional): Seconds the sale lasts, or None for OpenSea's default duration. Defaults to None.
+            prices (dict, optional): Asset name -> price, for assets with their own price. Defaults to None.
+
+        Raises:
+            ValueError: If start_in is given without a duration, or a price isn't positive.
+        """
+        if start_in is not None and duration is None:
+            raise ValueError("A sale start needs a duration")
+
+        self.price = price
+        self.start_in = start_in
+        self.duration = duration
+        self.prices = dict(prices or {})
+
+        for value in [price] + list(self.prices.values()):
+            if not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError("Prices must be positive numbers")
+
+    def listing(self, asset_options):
+        """
+        Returns the sell_asset arguments of an asset, with its sale starting and ending relative to now.
+
+        Args:
+            asset_options (AssetOptions): The asset to list.
+
+        Returns:
+            tuple: The price, start date and end date. The dates are None for OpenSea's default duration.
+        """
+        price = self.prices.get(asset_options.get_name(), self.price)
+
+        if self.duration is None:
+            return price, None, None
+
+        start_date = datetime.datetime.now() + datetime.timedelta(seconds=self.start_in or 0)
+        return price, start_date, start_date + datetime.timedelta(seconds=self.duration)
+
+def load_template(path:str, price:float = None, start_in:float = None, duration:float = None):
+    """
+    Returns a SellTemplate from a JSON file such as {"price": 0.05, "start_in": "1h", "duration": "7d", "prices": {"NFT #1": 0.2}}.
+    Arguments that aren't None replace the values in the file.
+
+    Args:
+        path (str): The JSON file, or None to only use the arguments.
+        price (float, optional): The price of every asset. Defaults to the file's.
+        start_in (float, optional): Seconds from listing until the sale starts. Defaults to the file's.
+        duration (float, optional): Seconds the sale lasts. Defaults to the file's.
+
+    Raises:
+        ValueError: If there is no price, or a value is invalid.
+
+    Returns:
+        SellTemplate: The template.
+    """
+    values = {}
+
+    if path is not None:
+        with open(path, "r") as file:
+            values = json.load(file)
+
+    price = price if price is not None else values.get("price")
+    start_in = start_in if start_in is not None else values.get("start_in")
+    duration = duration if duration is not None else values.get("duration")
+
+    if price is None:
+        raise ValueError("A sell template needs a price")
+
+    return SellTemplate(float(price), parse_duration(start_in) if start_in is not None else None,
+        parse_duration(duration) if duration is not None else None, values.get("prices"))
+
+class BatchProgress:
+    def __init__(self, total:int = None, stream = None, interval:float = 1):
+        """
+        Track the progress of a batch and show it as one line: assets done, failures, assets per minute and
+        time remaining. On a terminal the line is redrawn in place, otherwise a line is written every 30 intervals.
+
+        Args:
+            total (int, optional): The number of assets in the batch, needed for the time remaining. Defaults to None.
+            stream (file, optional): Where progress is written. Defaults to sys.stderr.
+            interval (float, optional): Seconds between redraws while running. Defaults to 1.
+        """
+        self.total = total
+        self.stream = stream if stream is not None else sys.stderr
+        self.interval = interval
+        self.done = 0 # Assets finished, successfully or not
+        self.uploaded = 0 # Assets uploaded, now or in an earlier run
+        self.listed = 0 # Assets listed for sale
+        self.failed = 0 # Assets that failed to upload or list
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._output_lock = threading.Lock() # Keeps the background redraw and messages from interleaving
+        self._stop = threading.Event()
+        self._thread = None
+        self._tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+
+    def record(self, result:BatchResult, listing:bool = False):
+        """
+        Count a finished asset.
+
+        Args:
+            result (BatchResult): The result of the asset.
+            listing (bool, optional): Whether assets are being listed, so an unlisted one failed. Defaults to False.
+        """
+        with self._lock:
+            self.done += 1
+            self.uploaded += 1 if result.url else 0
+            self.listed += 1 if result.listed else 0
+            self.failed += 1 if not result.url or (listing and not result.listed) else 0
+
+    def rate(self):
+        """
+        Returns the assets finished per minute so far.
+
+        Returns:
+            float: Assets per minute.
+        """
+        elapsed = time.monotonic() - self.started
+        return self.done * 60 / elapsed if elapsed > 0 else 0.0
+
+    def eta(self):
+        """
+        Returns the estimated seconds until the batch is done, at the rate so far.
+
+        Returns:
+            float: Seconds remaining, or None if the total or rate isn't known yet.
+        """
+        rate = self.rate()
+
+        if self.total is None or rate == 0:
+            return None
+
+        return max(self.total - self.done, 0) * 60 / rate
+
+    def line(self):
+        """
+        Returns the progress as one line of text.
+
+        Returns:
+            str: The progress line.
+        """
+        with self._lock:
+            done = str(self.done) + ("/" + str(self.total) if self.total is not None else "")
+            line = done + " done, " + str(self.failed) + " failed, " + str(round(self.rate(), 1)) + " assets/min"
+
+        eta = self.eta()
+
+        if eta is not None:
+            line += ", ETA " + str(datetime.timedelta(seconds=round(eta)))
+
+        return line
+
+    def render(self, final:bool = False):
+        """
+        Write the progress line.
+
+        Args:
+            final (bool, optional): Whether this is the last line, which ends with a newline on a terminal. Defaults to False.
+        """
+        with self._output_lock:
+            if self._tty:
+                self.stream.write("\r\033[K" + self.line() + ("\n" if final else ""))
+            else:
+                self.stream.write(self.line() + "\n")
+
+            self.stream.flush()
+
+    def message(self, text:str):
+        """
+        Write a line of text, such as a failure, above the progress line.
+
+        Args:
+            text (str): The text to write.
+        """
+        with self._output_lock:
+            self.stream.write(("\r\033[K" if self._tty else "") + text + "\n")
+            self.stream.flush()
+
+    def start(self):
+        """
+        Start redrawing the progress line in the background, so it stays live while every browser is busy.
+        """
+        def loop():
+            ticks = 0
+
+            while not self._stop.wait(self.interval):
+                ticks += 1
+
+                if self._tty or ticks % 30 == 0: # Don't flood logs
+                    self.render()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name="BatchProgress", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop redrawing and write the final progress line.
+        """
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.render(final=True)
+
+    def summary(self):
+        """
+        Returns the progress as a dict.
+
+        Returns:
+            dict: The counts, the "seconds" elapsed and the "assets_per_minute".
+        """
+        with self._lock:
+            return {"total": self.total, "done": self.done, "uploaded": self.uploaded, "listed": self.listed, "failed": self.failed,
+                "seconds": round(time.monotonic() - self.started, 3), "assets_per_minute": round(self.rate(), 3)}
+
+class BatchRunner:
+    def __init__(self, parallel:int = 1, headless:bool = False, profile_root:str = "OSSProfiles", create_link:str = "https://opensea.io/asset/create?enable_supply=true",
+        template:SellTemplate = None, journal = None, cache = None, scheduler = None, browser_options:dict = None):
+        """
+        Create a runner that uploads a batch of assets, and lists each one for sale once it is uploaded,
+        with a pool of browsers. Selenium is only imported once the first browser is opened.
+
+        Args:
+            parallel (int, optional): The number of browsers working at once. Defaults to 1.
+            headless (bool, optional): Wether to operate the browsers in headless mode or not. Defaults to False.
+            profile_root (str, optional): The directory holding each browser's Chrome profile, see OSSBrowserPool. Defaults to "OSSProfiles".
+            create_link (str, optional): The URL to use to upload. Defaults to "https://opensea.io/asset/create?enable_supply=true".
+            template (SellTemplate, optional): How to list each asset, or None to only upload. Defaults to None.
+            journal (UploadJournal, optional): Records progress, so an interrupted batch can be run again. Defaults to None.
+            cache (UploadCache, optional): Skips assets uploaded in earlier batches. Defaults to None.
+            scheduler (RateScheduler, optional): Paces operations to stay under OpenSea's rate limits. Defaults to None.
+            browser_options (dict, optional): Extra keyword arguments for each OSSBrowser. Defaults to None.
+        """
+        self.parallel = parallel
+        self.headless = headless
+        self.profile_root = profile_root
+        self.create_link = create_link
+        self.template = template
+        self.journal = journal
+        self.cache = cache
+        self.scheduler = scheduler
+        self.browser_options = browser_options
+        self.results = [] # A BatchResult for every asset finished, in the order they finished
+        self._results_lock = threading.Lock()
+
+    def _process(self, browser, asset_options):
+        """
+        Upload and list one asset. Run on a browser of the pool.
+
+        Args:
+            browser (OSSBrowser): The browser to use.
+            asset_options (AssetOptions): The asset.
+
+        Returns:
+            BatchResult: The result of the asset.
+        """
+        start = time.perf_counter()
+        browser.last_error = None
+
+        try:
+            known = self.cache.get(asset_options) if self.cache is not None else None
+        except OSError:
+            known = None # Let the upload report the unreadable file
+
+        if known is not None and (known["listed"] or self.template is None): # Nothing left to do
+            return BatchResult(asset_options, known["url"], known["listed"], None, time.perf_counter() - start)
+
+        if self.cache is not None:
+            url = self.cache.upload(browser, asset_options, self.create_link, self.journal)
+        elif self.journal is not None:
+            url = self.journal.upload(browser, asset_options, self.create_link)
+        else:
+            url = browser.upload_asset(asset_options, self.create_link)
+
+        listed = False
+
+        if url and self.template is not None:
+            price, start_date, end_date = self.template.listing(asset_options)
+
+            if self.journal is not None:
+                listed = self.journal.sell(browser, asset_options, price, start_date, end_date)
+            else:
+                listed = browser.sell_asset(url, price, start_date, end_date)
+
+            if listed and self.cache is not None:
+                self.cache.put(asset_options, url, listed=True)
+
+        failed = not url or (self.template is not None and not listed)
+        error = str(browser.last_error) if failed and browser.last_error is not None else None
+
+        if failed and error is None and self.journal is not None: # Skipped by the journal, such as an uncertain upload
+            record = self.journal.get(asset_options)
+            error = (record["reason"] or None) if record is not None else None
+        return BatchResult(asset_options, url or None, listed, error, time.perf_counter() - start)
+
+    def run(self, assets, progress:BatchProgress = None):
+        """
+        Upload and list a batch, yielding each result as soon as its asset is done. Assets are read from the iterable
+        only as browsers become free. If the run is interrupted, or the generator is closed early, assets not started
+        are dropped and running ones are stopped at their next wait; every asset that finishes is still in results.
+
+        Args:
+            assets (iterable): The AssetOptions to upload.
+            progress (BatchProgress, optional): Counts each result. Defaults to None.
+
+        Yields:
+            BatchResult: The result of each asset, in the order they finish.
+        """
+        def process(browser, asset_options):
+            result = self._process(browser, asset_options)
+
+            with self._results_lock: # Recorded here, so assets finishing after an interrupt are in the report
+                self.results.append(result)
+
+            if progress is not None:
+                progress.record(result, self.template is not None)
+
+            return result
+
+        with OSSBrowserPool(self.parallel, self.profile_root, self.headless, max_concurrency=self.parallel, browser_options=self.browser_options,
+            scheduler=self.scheduler) as pool:
+            try:
+                for asset_options, result in pool.run(process, assets, ordered=False):
+                    yield result
+            except BaseException: # KeyboardInterrupt, or GeneratorExit when closed early
+                pool.cancel()
+                raise
+
+    def report(self, progress:BatchProgress = None):
+        """
+        Returns a summary of the batch so far, with a line for every asset.
+
+        Args:
+            progress (BatchProgress, optional): Adds the batch's counts and speed. Defaults to None.
+
+        Returns:
+            dict: The "summary" and a list of "assets", each with its name, file, URL, whether it was listed,
+                the error it failed with, and the seconds it took.
+        """
+        summary = progress.summary() if progress is not None else {}
+        assets = [{"name": result.asset.get_name(), "file": result.asset.get_asset_path(), "url": result.url, "listed": result.listed,
+            "error": result.error, "seconds": round(result.seconds, 3)} for result in self.results]
+        return {"summary": summary, "assets": assets}
+
+def main(argv:list = None):
+    """
+    Run the oss-batch command: upload every asset in a manifest, and list them for sale if a price is given.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status, 0 if every asset succeeded, 1 if any failed, or 2 if the batch couldn't start.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="oss-batch", description="Upload a manifest of assets to OpenSea, and list them for sale")
+    parser.add_argument("manifest", help="A manifest file or metadata directory, see ManifestLoader")
+    parser.add_argument("--media-dir", help="The directory relative media paths are found in")
+    parser.add_argument("-p", "--parallel", type=int, default=1, help="The number of browsers working at once")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--profile-root", default="OSSProfiles", help="The directory holding each browser's Chrome profile")
+    parser.add_argument("--offline", action="store_true", help="Only use the cached Chrome driver")
+    parser.add_argument("--create-link", default="https://opensea.io/asset/create?enable_supply=true")
+    parser.add_argument("--price", type=float, help="List each asset for this price after uploading")
+    parser.add_argument("--start-in", help="Start each sale this long after listing, such as 1h")
+    parser.add_argument("--duration", help="How long each sale lasts, such as 7d")
+    parser.add_argument("--template", help="A JSON sell template with price, start_in, duration and per-name prices")
+    parser.add_argument("--journal", help="An UploadJournal file, so an interrupted batch can be run again")
+    parser.add_argument("--cache", help="An UploadCache file, to skip assets uploaded in earlier batches")
+    parser.add_argument("--rate", type=float, help="Start at this many operations per minute, backing off when throttled")
+    parser.add_argument("--preflight", action="store_true", help="Check and dedupe the batch before opening any browser")
+    parser.add_argument("--report", default="oss-batch-report.json", help="Where to write the summary report")
+    args = parser.parse_args(argv)
+
+    if args.parallel < 1:
+        parser.error("--parallel must be at least 1")
+
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+
+    try:
+        template = None
+
+        if args.template is not None or args.price is not None:
+            template = load_template(args.template, args.price, args.start_in, args.duration)
+    except (OSError, ValueError) as e:
+        print("Error:", e, file=sys.stderr)
+        return 2
+
+    loader = ManifestLoader(args.manifest, args.media_dir, on_error=lambda error: print("Skipped", error.source + ":" + str(error.line), error.message, file=sys.stderr))
+    assets = loader # Streamed into the pool, so large manifests aren't held in memory
+    rejected = 0
+
+    try:
+        if args.preflight: # Deduping needs the whole batch
+            from OpenSeaScripts.Preflight import preflight
+
+            checked = preflight(list(loader))
+            print(checked.summary(), file=sys.stderr)
+            assets = checked.assets
+            rejected = len(checked.rejected) + len(checked.duplicates)
+            total = len(assets)
+        else:
+            total = loader.count() # Bad rows are counted too, so the time remaining is an estimate
+    except OSError as e:
+        print("Error:", e, file=sys.stderr)
+        return 2
+
+    journal = cache = scheduler = None
+
+    if args.journal is not None:
+        from OpenSeaScripts.UploadJournal import UploadJournal
+        journal = UploadJournal(args.journal)
+
+    if args.cache is not None:
+        from OpenSeaScripts.UploadCache import UploadCache
+        cache = UploadCache(args.cache)
+
+    if args.rate is not None:
+        from OpenSeaScripts.RateScheduler import RateScheduler
+        scheduler = RateScheduler(initial_rate=args.rate, min_rate=min(args.rate, 0.5), max_rate=max(args.rate, 60), max_concurrency=args.parallel) # Widen the default limits to fit --rate, so it is kept after the first success
+
+    runner = BatchRunner(args.parallel, args.headless, args.profile_root, args.create_link, template, journal, cache, scheduler, {"offline": args.offline})
+    progress = BatchProgress(total)
+    results = runner.run(assets, progress)
+    interrupted = False
+    progress.start()
+
+    try:
+        for result in results:
+            if result.error is not None:
+                progress.message("Failed " + result.asset.get_name() + ": " + result.error)
+    except KeyboardInterrupt:
+        interrupted = True
+        print("\nInterrupted, stopping the assets in progress and writing the report of the assets finished", file=sys.stderr)
+    except OSError as e: # The manifest couldn't be read part way through
+        interrupted = True
+        print("Error:", e, file=sys.stderr)
+    finally:
+        results.close() # Stops the pool's browsers if the loop didn't finish
+        progress.stop()
+
+        if journal is not None:
+            journal.close()
+
+        if cache is not None:
+            cache.close()
+
+    report = runner.report(progress)
+    report["summary"]["manifest_errors"] = len(loader.errors)
+    report["summary"]["rejected"] = rejected
+
+    with open(args.report, "w") as file:
+        json.dump(report, file, indent=4)
+
+    summary = report["summary"]
+    print(summary["uploaded"], "uploaded,", summary["listed"], "listed,", summary["failed"], "failed in", str(datetime.timedelta(seconds=round(summary["seconds"]))) +
+        ", " + str(summary["assets_per_minute"]) + " assets/min. Report written to " + args.report)
+    return 1 if summary["failed"] > 0 or interrupted else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+from OpenSeaScripts.AssetOptions import AssetOptions
+from OpenSeaScripts.MockSite import MockSite
+from OpenSeaScripts.OSSBrowserPool import OSSBrowserPool
+from OpenSeaScripts.Tracer import Tracer
+import itertools, os, shutil, tempfile, time
+
+def make_assets(directory:str, count:int, trait_count:int, file_size:int):
+    """
+    Create benchmark asset files and their AssetOptions. Traits are split between properties, levels and stats.
+
+    Args:
+        directory (str): The directory to write the files in.
+        count (int): The number of assets.
+        trait_count (int): The number of traits of each asset.
+        file_size (int): The size of each asset file in bytes.
+
+    Returns:
+        list: The AssetOptions.
+    """
+    assets = []
+
+    for i in range(count):
+        path = os.path.join(directory, "asset_" + str(i) + "_" + str(file_size) + ".png")
+
+        with open(path, "wb") as file:
+            file.write(os.urandom(file_size)) # Random, so no two assets are the same
+
+        asset_options = AssetOptions(path, "Benchmark #" + str(i)).set_description("Benchmark asset")
+
+        for trait in range(trait_count):
+            if trait % 3 == 0:
+                asset_options.add_property("Property " + str(trait), "Value " + str(trait))
+            elif trait % 3 == 1:
+                asset_options.add_level("Level " + str(trait), "2", "5")
+            else:
+                asset_options.add_stat("Stat " + str(trait), "50", "100")
+
+        assets.append(asset_options)
+
+    return assets
+
+def run_benchmark(trait_counts:list = (0, 10, 30), file_sizes:list = (10000, 1000000), pool_sizes:list = (1, 2), assets_per_run:int = 5, sell:bool = True, headless:bool = True, delays:dict = None, browser_options:dict = None):
+    """
+    Upload, and optionally sell, assets on a local MockSite for every combination of trait count, file size and pool size.
+    Browsers are started before each run is timed.
+
+    Args:
+        trait_counts (list, optional): The numbers of traits per asset to try. Defaults to (0, 10, 30).
+        file_sizes (list, optional): The asset file sizes in bytes to try. Defaults to (10000, 1000000).
+        pool_sizes (list, optional): The numbers of browser sessions to try. Defaults to (1, 2).
+        assets_per_run (int, optional): How many assets each run uploads. Defaults to 5.
+        sell (bool, optional): Whether to also list every uploaded asset. Defaults to True.
+        headless (bool, optional): Whether to run the browsers in headless mode. Defaults to True.
+        delays (dict, optional): The MockSite render delays. Defaults to MockSite.default_delays.
+        browser_options (dict, optional): Extra keyword arguments for each OSSBrowser. Defaults to None.
+
+    Returns:
+        list: A dict for each run, with its "traits", "file_size", "pool_size", "assets", "failures", "seconds",
+            "assets_per_minute", and "phases", the Tracer summary of the run.
+    """
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="oss_benchmark_")
+
+    try:
+        with MockSite(delays=delays) as site:
+            for trait_count, file_size, pool_size in itertools.product(trait_counts, file_sizes, pool_sizes):
+                assets = make_assets(work_dir, assets_per_run, trait_count, file_size)
+                tracer = Tracer()
+                options = dict(browser_options or {})
+                options["tracer"] = tracer
+
+                with OSSBrowserPool(pool_size, os.path.join(work_dir, "profiles"), headless, pool_size, browser_options=options) as pool:
+                    pool.warm(site.create_link) # Don't time browser startup
+                    tracer.history.clear()
+                    failures = 0
+                    start = time.perf_counter()
+
+                    links = []
+
+                    for asset_options, result in pool.upload_assets(assets, site.create_link, ordered=False):
+                        if result:
+                            links.append((result, 1))
+                        else:
+                            failures += 1
+
+                    if sell:
+                        for listing, result in pool.sell_assets(links, ordered=False):
+                            if not result:
+                                failures += 1
+
+                    seconds = time.perf_counter() - start
+
+                for asset_options in assets:
+                    os.remove(asset_options.get_asset_path())
+
+                results.append({"traits": trait_count, "file_size": file_size, "pool_size": pool_size, "assets": len(assets),
+                    "failures": failures, "seconds": seconds, "assets_per_minute": len(assets) * 60 / seconds, "phases": tracer.summary()})
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+def format_results(results:list):
+    """
+    Returns benchmark results as a table, with the p50 and p99 of every phase under each run.
+
+    Args:
+        results (list): The results of run_benchmark.
+
+    Returns:
+        str: The table.
+    """
+    lines = []
+
+    for result in results:
+        lines.append("traits={traits} file_size={file_size} pool_size={pool_size}: {assets_per_minute:.1f} assets/min, "
+            "{failures} failures in {seconds:.1f}s".format(**result))
+
+        for name, phase in sorted(result["phases"].items()):
+            lines.append("    {:<22} p50 {:7.3f}s  p99 {:7.3f}s  n={}".format(name, phase["p50"], phase["p99"], phase["count"]))
+
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark OSSBrowser against a local mock of OpenSea")
+    parser.add_argument("--traits", type=int, nargs="+", default=[0, 10, 30], help="Trait counts to try")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 1000000], help="File sizes in bytes to try")
+    parser.add_argument("--pools", type=int, nargs="+", default=[1, 2], help="Pool sizes to try")
+    parser.add_argument("--assets", type=int, default=5, help="Assets per run")
+    parser.add_argument("--no-sell", action="store_true", help="Only upload")
+    parser.add_argument("--show", action="store_true", help="Show the browser windows")
+    args = parser.parse_args()
+
+    print(format_results(run_benchmark(args.traits, args.sizes, args.pools, args.assets, not args.no_sell, not args.show)))
@@ -0,0 +1,40 @@
+import hashlib, os
+
+def file_hash(path:str, algorithm:str = "sha256", chunk_size:int = 1024 * 1024):
+    """
+    Hash the contents of a file without reading it into memory all at once.
+
+    Args:
+        path (str): The path of the file to hash.
+        algorithm (str, optional): The hashlib algorithm to use. Defaults to "sha256".
+        chunk_size (int, optional): How many bytes to read at a time. Defaults to 1 MiB.
+
+    Raises:
+        OSError: If the file can't be read.
+
+    Returns:
+        str: The hex digest of the file's contents.
+    """
+    digest = hashlib.new(algorithm)
+
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+def file_signature(path:str):
+    """
+    Returns a cheap signature of a file that changes when the file is modified, used to avoid re-hashing unchanged files.
+
+    Args:
+        path (str): The path of the file.
+
+    Raises:
+        OSError: If the file doesn't exist.
+
+    Returns:
+        list: The file's size in bytes and modification time in nanoseconds.
+    """
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
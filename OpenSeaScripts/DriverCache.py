@@ -0,0 +1,67 @@
+import json, os, threading, time
+
+_resolved_path = None # The driver path resolved by this process, shared by every browser it opens
+_lock = threading.Lock()
+
+def default_cache_file():
+    """
+    Returns the default location of the driver path cache, in the user's cache directory.
+
+    Returns:
+        str: The cache file path.
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(cache_dir, "OpenSeaScripts", "chromedriver.json")
+
+def resolve_driver_path(offline:bool = False, cache_file:str = None, max_age:float = 7 * 24 * 60 * 60):
+    """
+    Returns the path of a Chrome driver executable, installing one with webdriver_manager only when needed.
+    The resolved path is cached on disk, so later runs start without a network lookup.
+
+    Args:
+        offline (bool, optional): Never use the network. The cached driver is used regardless of its age. Defaults to False.
+        cache_file (str, optional): The cache file to use. Defaults to default_cache_file().
+        max_age (float, optional): How many seconds a cached path is used before checking for a newer driver. Defaults to 7 days.
+
+    Raises:
+        Exception: If offline is True and no cached driver exists.
+
+    Returns:
+        str: The path of the Chrome driver.
+    """
+    global _resolved_path
+
+    with _lock:
+        if _resolved_path is not None and os.path.isfile(_resolved_path):
+            return _resolved_path
+
+        if cache_file is None:
+            cache_file = default_cache_file()
+
+        try:
+            with open(cache_file, "r", encoding="utf-8") as file:
+                cached = json.load(file)
+
+            if os.path.isfile(cached["path"]) and (offline or time.time() - cached["time"] < max_age):
+                _resolved_path = cached["path"]
+                return _resolved_path
+        except (OSError, ValueError, KeyError, TypeError):
+            pass # No usable cache
+
+        if offline:
+            raise Exception("No cached Chrome driver found. Run once without offline mode to install one.")
+
+        from webdriver_manager.chrome import ChromeDriverManager # Imported here since it is only needed to install
+
+        path = ChromeDriverManager().install()
+
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        temp_file = cache_file + ".tmp"
+
+        with open(temp_file, "w", encoding="utf-8") as file:
+            json.dump({"path": path, "time": time.time()}, file)
+
+        os.replace(temp_file, cache_file) # Replace atomically so a crash never leaves a broken cache
+
+        _resolved_path = path
+        return path
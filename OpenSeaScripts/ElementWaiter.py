@@ -0,0 +1,116 @@
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from OpenSeaScripts.StepError import ElementTimeoutError, WaitCancelledError
+import collections, threading, time
+
+WaitRecord = collections.namedtuple("WaitRecord", ["description", "duration", "found"])
+
+class ElementWaiter:
+    def __init__(self, min_interval:float = 0.02, max_interval:float = 0.1, backoff:float = 1.5, history_size:int = 1000, on_wait = None):
+        """
+        Create a new ElementWaiter, which polls a condition with an adaptive interval until it is met.
+        The interval starts at min_interval seconds and grows by backoff after each miss, up to max_interval seconds,
+        so fast elements are returned almost immediately while slow ones don't flood the driver with requests.
+
+        Args:
+            min_interval (float, optional): The first delay between checks. Defaults to 0.02.
+            max_interval (float, optional): The longest delay between checks. Defaults to 0.1.
+            backoff (float, optional): The factor the delay grows by after each miss. Defaults to 1.5.
+            history_size (int, optional): How many WaitRecords to keep in history. Defaults to 1000.
+            on_wait (callable, optional): Called with a WaitRecord after every wait. Defaults to None.
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.history = collections.deque(maxlen=history_size) # Most recent waits, oldest first
+        self.on_wait = on_wait
+        self.last_duration = 0.0
+        self._cancelled = threading.Event()
+
+    def until(self, condition, timeout:float = 7, description:str = "", base_delay:float = 0, error_message:str = "Element not found"):
+        """
+        Call condition until it returns a truthy value, waiting up to timeout seconds.
+        Missing and stale element errors raised by condition are treated as a miss.
+
+        Args:
+            condition (callable): Function taking no arguments, returning a truthy value when the wait is over.
+            timeout (float, optional): How long to wait before failing. Fractions of a second are honored. Defaults to 7.
+            description (str, optional): A name for this wait, stored in its WaitRecord. Defaults to "".
+            base_delay (float, optional): How long to wait before the first check. Defaults to 0.
+            error_message (str, optional): The message of the exception raised on timeout. Defaults to "Element not found".
+
+        Raises:
+            ElementTimeoutError: If the condition is not met after timeout seconds.
+            WaitCancelledError: If the wait is cancelled.
+
+        Returns:
+            The truthy value returned by condition.
+        """
+        start = time.monotonic()
+        deadline = start + base_delay + timeout
+        interval = self.min_interval
+
+        if base_delay > 0:
+            self._cancelled.wait(base_delay)
+
+        while not self._cancelled.is_set():
+            try:
+                result = condition()
+            except (NoSuchElementException, StaleElementReferenceException):
+                result = None # The page changed under us, try again
+
+            if result:
+                self.record(description, start, True)
+                return result
+
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                break
+
+            self._cancelled.wait(min(interval, remaining)) # Sleep, waking early if cancelled
+            interval = min(interval * self.backoff, self.max_interval)
+
+        self.record(description, start, False)
+
+        if self._cancelled.is_set():
+            raise WaitCancelledError("Wait cancelled")
+
+        raise ElementTimeoutError(error_message) # Raise exception if not met after timeout seconds
+
+    def cancel(self):
+        """
+        Make the current wait, and every wait after it until reset() is called, fail immediately.
+        Used to stop an operation running in another thread.
+        """
+        self._cancelled.set()
+
+    def reset(self):
+        """
+        Allow waits again after cancel().
+        """
+        self._cancelled.clear()
+
+    def record(self, description:str, start:float, found:bool):
+        """
+        Store how long a wait took and notify the on_wait hook. AsyncOSSBrowser also records the waits it does without a thread.
+
+        Args:
+            description (str): The name of the wait.
+            start (float): The time.monotonic() value when the wait started.
+            found (bool): Whether the condition was met.
+        """
+        self.last_duration = time.monotonic() - start
+        record = WaitRecord(description, self.last_duration, found)
+        self.history.append(record)
+
+        if self.on_wait is not None:
+            self.on_wait(record)
+
+    def total_wait_time(self):
+        """
+        Returns the total time spent in the waits kept in history.
+
+        Returns:
+            float: The total wait time in seconds.
+        """
+        return sum(record.duration for record in self.history)
@@ -0,0 +1,131 @@
+from OpenSeaScripts import Scripts
+import collections, time
+
+PageStats = collections.namedtuple("PageStats", ["url", "ready_time", "load_time", "transfer_bytes", "resource_count"])
+
+class LeanProfile:
+    default_blocked_urls = ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*",
+        "*segment.io*", "*segment.com*", "*sentry.io*", "*intercom.io*", "*intercomcdn.com*", "*hotjar.com*",
+        "*datadoghq*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"] # Analytics, chat widgets and web fonts
+    resource_type_urls = {
+        "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*i.seadn.io*", "*lh3.googleusercontent.com*"],
+        "font": ["*.woff", "*.woff2", "*.ttf", "*.otf"],
+        "media": ["*.mp4", "*.webm", "*.mp3", "*.wav", "*.ogg", "*.glb", "*.gltf"],
+    } # URL patterns for each blockable resource type
+
+    def __init__(self, blocked_urls:list = None, blocked_types:list = ("image", "font", "media"), page_load_strategy:str = "eager", disable_images:bool = True):
+        """
+        Create a lean browser profile, which makes pages ready sooner by skipping what the automation never uses.
+        Pass it to OSSBrowser with the lean_profile argument.
+
+        Args:
+            blocked_urls (list, optional): URL patterns to block, where * matches anything. Defaults to LeanProfile.default_blocked_urls.
+            blocked_types (list, optional): Resource types to block, keys of LeanProfile.resource_type_urls. Defaults to ("image", "font", "media").
+            page_load_strategy (str, optional): The Selenium page load strategy. "eager" returns from driver.get once the
+                document is parsed, without waiting for every resource. Defaults to "eager".
+            disable_images (bool, optional): Whether to turn off image decoding in Chrome. Defaults to True.
+
+        Raises:
+            ValueError: If a blocked type is unknown.
+        """
+        for blocked_type in blocked_types:
+            if blocked_type not in LeanProfile.resource_type_urls:
+                raise ValueError("Unknown resource type: " + str(blocked_type))
+
+        self.blocked_urls = list(LeanProfile.default_blocked_urls if blocked_urls is None else blocked_urls)
+        self.blocked_types = list(blocked_types)
+        self.page_load_strategy = page_load_strategy
+        self.disable_images = disable_images
+        self.history = collections.deque(maxlen=1000) # PageStats of the most recent pages opened
+
+    def blocked_patterns(self):
+        """
+        Returns every URL pattern this profile blocks.
+
+        Returns:
+            list: The URL patterns.
+        """
+        patterns = list(self.blocked_urls)
+
+        for blocked_type in self.blocked_types:
+            patterns += LeanProfile.resource_type_urls[blocked_type]
+
+        return patterns
+
+    def apply_options(self, chrome_options):
+        """
+        Configure the options of a browser that is about to be opened.
+
+        Args:
+            chrome_options (selenium.webdriver.chrome.options.Options): The options to configure.
+        """
+        chrome_options.page_load_strategy = self.page_load_strategy
+
+        if self.disable_images:
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+
+    def apply_driver(self, driver):
+        """
+        Start blocking URLs in an open browser through the Chrome DevTools Protocol.
+        Drivers without DevTools access, such as reconnected remote sessions, are left unchanged.
+
+        Args:
+            driver (selenium.webdriver.Chrome): The browser's driver.
+
+        Returns:
+            bool: Whether blocking was turned on.
+        """
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return False
+
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_patterns()})
+        return True
+
+    def record_page(self, driver):
+        """
+        Measure the page the driver just opened and add it to history.
+
+        Args:
+            driver (selenium.webdriver.Chrome): The browser's driver.
+
+        Returns:
+            PageStats: How long the page took to become ready and load, in seconds, and how much it transferred.
+        """
+        stats = driver.execute_script(Scripts.PAGE_STATS)
+        page_stats = PageStats(driver.current_url, stats["ready"] / 1000, stats["load"] / 1000, stats["bytes"], stats["count"])
+        self.history.append(page_stats)
+        return page_stats
+
+    def measure_savings(self, driver, url:str, settle_time:float = 5):
+        """
+        Load a page once without URL blocking and once with it, and compare them. The browser's other lean settings apply to both.
+        Both loads wait settle_time seconds so late resources are counted.
+
+        Args:
+            driver (selenium.webdriver.Chrome): The driver of a browser using this profile.
+            url (str): The page to measure, such as the create page.
+            settle_time (float, optional): How long to let each load run before measuring. Defaults to 5.
+
+        Raises:
+            Exception: If the driver has no DevTools access.
+
+        Returns:
+            dict: The PageStats of the "full" and "lean" loads, and the "bytes_saved" and "ready_time_saved" between them.
+        """
+        if not hasattr(driver, "execute_cdp_cmd"):
+            raise Exception("Measuring savings needs a local Chrome session")
+
+        results = {}
+
+        for name, patterns in (("full", []), ("lean", self.blocked_patterns())):
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {}) # Compare cold loads
+            driver.get(url)
+            time.sleep(settle_time)
+            results[name] = self.record_page(driver)
+
+        results["bytes_saved"] = results["full"].transfer_bytes - results["lean"].transfer_bytes
+        results["ready_time_saved"] = results["full"].ready_time - results["lean"].ready_time
+        return results
@@ -0,0 +1,272 @@
+from OpenSeaScripts.AssetOptions import AssetOptions
+import collections, csv, json, os
+
+ManifestError = collections.namedtuple("ManifestError", ["source", "line", "message"])
+
+class ManifestLoader:
+    def __init__(self, path:str, media_dir:str = None, on_error = None):
+        """
+        Create a loader that builds AssetOptions from a manifest, one at a time, as it is iterated.
+        The manifest can be:
+            - A CSV file with a header row.
+            - A JSON lines file, with one item per line.
+            - A JSON file holding a list of items.
+            - A directory of per-item JSON metadata files, such as 1.json, 2.json, ...
+
+        Items can use the flat format, with the keys file, name, preview, description, external_link,
+        unlockable_content, explicit, supply and blockchain, and "property:<name>", "level:<name>" or "stat:<name>"
+        keys whose values are "value" for properties and "value/max" for levels and stats.
+        Items can also be ERC-721 metadata, with the keys name, description, image, animation_url, external_url
+        and attributes. Media files are found by the file name at the end of image or animation_url.
+
+        Rows that fail validation are skipped and reported, without stopping the rest of the manifest.
+
+        Args:
+            path (str): The path of the manifest file or metadata directory.
+            media_dir (str, optional): The directory relative media paths are found in. Defaults to the manifest's directory.
+            on_error (callable, optional): Called with a ManifestError for each bad row. Defaults to None.
+        """
+        self.path = path
+
+        if media_dir is None:
+            media_dir = path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+
+        self.media_dir = media_dir
+        self.on_error = on_error
+        self.errors = [] # Every ManifestError found so far
+
+    def __iter__(self):
+        """
+        Yields:
+            AssetOptions: Each valid item in the manifest.
+        """
+        for source, line, record in self._records():
+            try:
+                if isinstance(record, Exception):
+                    raise record
+
+                yield self._build(record)
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError, OSError) as e:
+                self._report(source, line, e)
+
+    def count(self):
+        """
+        Returns the number of items in the manifest, without building or validating them, such as to estimate
+        how long a batch will take before streaming it. Bad rows are counted too.
+
+        Raises:
+            OSError: If the manifest can't be read.
+
+        Returns:
+            int: The number of items.
+        """
+        if os.path.isdir(self.path):
+            return len([name for name in os.listdir(self.path) if name.lower().endswith(".json")])
+
+        if self.path.lower().endswith(".jsonl"):
+            with open(self.path, "r", encoding="utf-8") as file:
+                return sum(1 for text in file if text.strip() != "")
+
+        return sum(1 for record in self._records()) # CSV rows can span lines, and a JSON list has to be parsed
+
+    def _report(self, source:str, line:int, error:Exception):
+        """
+        Store and report a bad row.
+
+        Args:
+            source (str): The file the row came from.
+            line (int): The line or item number of the row.
+            error (Exception): What was wrong with it.
+        """
+        message = str(error) if not isinstance(error, KeyError) else "Missing field " + str(error)
+        manifest_error = ManifestError(source, line, message)
+        self.errors.append(manifest_error)
+
+        if self.on_error is not None:
+            self.on_error(manifest_error)
+
+    def _records(self):
+        """
+        Yields:
+            tuple: The source file, line number and record dict for each item. Records that can't be parsed are yielded
+                as the exception raised, so they can be reported in order.
+        """
+        if os.path.isdir(self.path):
+            names = [name for name in os.listdir(self.path) if name.lower().endswith(".json")]
+            names.sort(key=lambda name: (len(name), name)) # 2.json before 10.json
+
+            for name in names:
+                file_path = os.path.join(self.path, name)
+
+                try:
+                    with open(file_path, "r", encoding="utf-8") as file:
+                        yield file_path, 1, json.load(file)
+                except ValueError as e:
+                    yield file_path, 1, ValueError("Invalid JSON: " + str(e))
+
+        elif self.path.lower().endswith(".csv"):
+            with open(self.path, "r", encoding="utf-8", newline="") as file:
+                for line, row in enumerate(csv.DictReader(file), start=2): # Line 1 is the header
+                    yield self.path, line, {key: value for key, value in row.items() if key is not None and value not in (None, "")}
+
+        elif self.path.lower().endswith(".jsonl"):
+            with open(self.path, "r", encoding="utf-8") as file:
+                for line, text in enumerate(file, start=1):
+                    if text.strip() == "":
+                        continue
+
+                    try:
+                        yield self.path, line, json.loads(text)
+                    except ValueError as e:
+                        yield self.path, line, ValueError("Invalid JSON: " + str(e))
+
+        else:
+            with open(self.path, "r", encoding="utf-8") as file:
+                items = json.load(file)
+
+            if isinstance(items, dict):
+                items = [items]
+
+            for line, item in enumerate(items, start=1):
+                yield self.path, line, item
+
+    def _media_path(self, path:str):
+        """
+        Returns the local path of a media file named in a manifest.
+
+        Args:
+            path (str): A path relative to media_dir, an absolute path, or a URI whose file name is in media_dir.
+
+        Returns:
+            str: The absolute path of the file.
+        """
+        if "://" in path:
+            path = path.rstrip("/").split("/")[-1] # ipfs://<cid>/1.png -> 1.png
+
+        return os.path.abspath(os.path.join(self.media_dir, path))
+
+    def _build(self, record:dict):
+        """
+        Build and validate an AssetOptions from a manifest record.
+
+        Args:
+            record (dict): The record.
+
+        Raises:
+            ValueError: If the record is invalid or its media files don't exist.
+            KeyError: If a required field is missing.
+
+        Returns:
+            AssetOptions: The asset.
+        """
+        if not isinstance(record, dict):
+            raise ValueError("Item must be an object")
+
+        if "attributes" in record or "image" in record:
+            asset_options = self._build_metadata(record)
+        else:
+            asset_options = self._build_flat(record)
+
+        if not os.path.isfile(asset_options.get_asset_path()):
+            raise ValueError("Asset file not found: " + asset_options.get_asset_path())
+
+        if AssetOptions.needs_preview(asset_options.get_asset_path().split(".")[-1]):
+            if asset_options.get_preview_path() == "":
+                raise ValueError("Multimedia files need a preview image")
+            elif not os.path.isfile(asset_options.get_preview_path()):
+                raise ValueError("Preview file not found: " + asset_options.get_preview_path())
+
+        return asset_options
+
+    def _build_flat(self, record:dict):
+        """
+        Build an AssetOptions from a flat CSV or JSON record.
+        """
+        asset_options = AssetOptions(self._media_path(record["file"]), "")
+        asset_options.set_name(record["name"])
+
+        if "preview" in record:
+            asset_options.set_preview_path(self._media_path(record["preview"]))
+
+        asset_options.set_description(record.get("description", ""))
+        asset_options.set_external_link(record.get("external_link", ""))
+        asset_options.set_unlockable_content(record.get("unlockable_content", ""))
+        asset_options.set_explicit(_to_bool(record.get("explicit", False)))
+        asset_options.set_supply(int(record.get("supply", 1)))
+        asset_options.set_blockchain(record.get("blockchain", "Ethereum"))
+
+        for key, value in record.items():
+            kind, separator, name = key.partition(":")
+
+            if separator == "":
+                continue
+            elif kind == "property":
+                asset_options.add_property(name, _to_text(value))
+            elif kind == "level" or kind == "stat":
+                value, slash, max_value = _to_text(value).partition("/")
+                add = asset_options.add_level if kind == "level" else asset_options.add_stat
+                add(name, value, max_value if slash != "" else value)
+            else:
+                raise ValueError("Unknown column type: " + kind)
+
+        return asset_options
+
+    def _build_metadata(self, record:dict):
+        """
+        Build an AssetOptions from ERC-721 metadata. When there is an animation_url, it is the asset and image is its preview.
+        """
+        if record.get("animation_url", "") != "":
+            asset_options = AssetOptions(self._media_path(record["animation_url"]), "")
+            asset_options.set_preview_path(self._media_path(record["image"]))
+        else:
+            asset_options = AssetOptions(self._media_path(record["image"]), "")
+
+        asset_options.set_name(_to_text(record["name"]))
+        asset_options.set_description(record.get("description", ""))
+        asset_options.set_external_link(record.get("external_url", ""))
+
+        for attribute in record.get("attributes", []):
+            name = _to_text(attribute["trait_type"])
+            value = attribute["value"]
+            display_type = attribute.get("display_type")
+
+            if display_type == "number": # Shown as a stat on OpenSea
+                asset_options.add_stat(name, _to_text(value), _to_text(attribute.get("max_value", value)))
+            elif display_type is None and isinstance(value, (int, float)) and not isinstance(value, bool): # Shown as a level on OpenSea
+                asset_options.add_level(name, _to_text(value), _to_text(attribute.get("max_value", value)))
+            else:
+                asset_options.add_property(name, _to_text(value))
+
+        return asset_options
+
+def _to_text(value):
+    """
+    Convert a manifest value to the string AssetOptions expects, writing whole numbers without a decimal point.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+
+    return str(value).strip()
+
+def _to_bool(value):
+    """
+    Convert a manifest value such as True, "true", "yes" or "1" to a bool.
+    """
+    if isinstance(value, bool):
+        return value
+
+    return str(value).strip().lower() in ("true", "yes", "1", "y")
+
+def load_manifest(path:str, media_dir:str = None, on_error = None):
+    """
+    Shortcut for iterating a ManifestLoader.
+
+    Args:
+        path (str): The path of the manifest file or metadata directory.
+        media_dir (str, optional): The directory relative media paths are found in. Defaults to the manifest's directory.
+        on_error (callable, optional): Called with a ManifestError for each bad row. Defaults to None.
+
+    Returns:
+        ManifestLoader: The loader, which yields AssetOptions when iterated.
+    """
+    return ManifestLoader(path, media_dir, on_error)
@@ -0,0 +1,359 @@
+from concurrent.futures import ProcessPoolExecutor
+from OpenSeaScripts.AssetOptions import AssetOptions
+from OpenSeaScripts.ContentHash import file_hash, file_signature
+import collections, json, os, shutil, struct, subprocess, tempfile, zlib
+
+PreprocessError = collections.namedtuple("PreprocessError", ["asset", "message"])
+
+def default_cache_dir():
+    """
+    Returns the default location of generated previews and downscaled media, in the user's cache directory.
+
+    Returns:
+        str: The cache directory path.
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(cache_dir, "OpenSeaScripts", "media")
+
+class MediaPreprocessor:
+    video_extensions = ["mp4", "webm"]
+    model_extensions = ["glb", "gltf"]
+    image_extensions = ["jpg", "jpeg", "png"] # Images that can be downscaled. Animated GIFs are left alone
+
+    def __init__(self, cache_dir:str = None, workers:int = None, model_renderer = None, downscale:bool = False,
+        max_dimension:int = 4096, max_size:int = 100 * 1024 * 1024, ffmpeg:str = "ffmpeg", on_error = None):
+        """
+        Create a preprocessor that prepares the media of a batch before uploading. Assets that need a preview and
+        have none get one: a frame of a video, a placeholder image for audio, or a render of a 3D model.
+        Optionally, images larger than max_dimension and media larger than max_size are shrunk, which also makes
+        each upload faster. Media that can't be shrunk under max_size is reported as an error. Work is done in a process pool, and results are cached on disk by the media's content
+        hash, so running the same batch again is nearly free. Media is only hashed again if its size or modification
+        time changed since the last run.
+
+        Videos need ffmpeg. Downscaling images needs Pillow (pip install Pillow).
+
+        Args:
+            cache_dir (str, optional): Where generated files are kept. Defaults to default_cache_dir().
+            workers (int, optional): The number of worker processes, or 0 to work in this process. Defaults to the number of CPU cores.
+            model_renderer (callable, optional): Called with a .glb or .gltf path and a .png path to write a preview of
+                the model to. It must be a module-level function, so it can be sent to worker processes. Models get
+                a placeholder preview without one. Defaults to None.
+            downscale (bool, optional): Whether to shrink oversized media. Defaults to False.
+            max_dimension (int, optional): The longest side in pixels of an image after downscaling. Defaults to 4096.
+            max_size (int, optional): Media larger than this many bytes is recompressed. Defaults to OpenSea's 100 MB limit.
+            ffmpeg (str, optional): The ffmpeg executable. Defaults to "ffmpeg".
+            on_error (callable, optional): Called with a PreprocessError for each asset that couldn't be prepared. Defaults to None.
+        """
+        self.cache_dir = cache_dir if cache_dir is not None else default_cache_dir()
+        self.workers = workers
+        self.model_renderer = model_renderer
+        self.downscale = downscale
+        self.max_dimension = max_dimension
+        self.max_size = max_size
+        self.ffmpeg = ffmpeg
+        self.on_error = on_error
+        self.errors = [] # Every PreprocessError so far
+
+    def process(self, assets):
+        """
+        Prepare the media of a batch of assets. Generated previews are set with set_preview_path, and shrunk media
+        with set_asset_path. Assets that couldn't be prepared are left unchanged and reported.
+
+        Args:
+            assets (iterable): The AssetOptions to prepare.
+
+        Returns:
+            list: The AssetOptions, in the same order.
+        """
+        assets = list(assets)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        index = self._load_index()
+        signatures = [] # (absolute path, signature or None) of each asset's media
+        jobs = []
+
+        for asset_options in assets:
+            path = os.path.abspath(asset_options.get_asset_path())
+
+            try:
+                signature = file_signature(path)
+            except OSError:
+                signature = None # Reported by the worker
+
+            known = index.get(path)
+            known_hash = known[1] if known is not None and signature is not None and known[0] == signature else None
+            signatures.append((path, signature))
+            jobs.append((asset_options.get_asset_path(), asset_options.get_preview_path(), self.cache_dir, self.model_renderer, self.downscale,
+                self.max_dimension, self.max_size, self.ffmpeg, known_hash))
+
+        executor = None
+
+        if self.workers == 0 or len(jobs) < 2: # Not worth starting processes
+            results = map(_prepare, jobs)
+        else:
+            workers = self.workers or os.cpu_count() or 1
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(_prepare, jobs)
+
+        changed = False
+
+        try:
+            for asset_options, (path, signature), (asset_path, preview_path, error, media_hash) in zip(assets, signatures, results):
+                if media_hash is not None and signature is not None and index.get(path) != [signature, media_hash]:
+                    index[path] = [signature, media_hash]
+                    changed = True
+
+                if error is not None:
+                    preprocess_error = PreprocessError(asset_options, error)
+                    self.errors.append(preprocess_error)
+
+                    if self.on_error is not None:
+                        self.on_error(preprocess_error)
+
+                    continue
+
+                if asset_path != asset_options.get_asset_path():
+                    asset_options.set_asset_path(asset_path)
+
+                if preview_path != asset_options.get_preview_path():
+                    asset_options.set_preview_path(preview_path)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+            if changed:
+                self._save_index(index)
+
+        return assets
+
+    def _load_index(self):
+        """
+        Returns the hashes of media seen in earlier runs.
+
+        Returns:
+            dict: Absolute media path -> [file signature, content hash].
+        """
+        try:
+            with open(os.path.join(self.cache_dir, "hashes.json"), "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {} # First run, or a damaged index that will be rebuilt
+
+    def _save_index(self, index:dict):
+        """
+        Write the hashes of media seen so far, replacing the index atomically.
+
+        Args:
+            index (dict): Absolute media path -> [file signature, content hash].
+        """
+        handle, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+
+        try:
+            with os.fdopen(handle, "w") as file:
+                json.dump(index, file)
+
+            os.replace(temp_path, os.path.join(self.cache_dir, "hashes.json"))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path) # The index is only an optimization
+
+def _prepare(job:tuple):
+    """
+    Prepare the media of one asset. Run in a worker process.
+
+    Args:
+        job (tuple): The asset path, preview path, cache directory, model renderer, whether to downscale,
+            the largest image dimension, the largest media size, the ffmpeg executable, and the media's content hash
+            if it is known from an earlier run, or None.
+
+    Returns:
+        tuple: The asset path and preview path to use, an error message or None, and the media's content hash or None.
+    """
+    asset_path, preview_path, cache_dir, model_renderer, downscale, max_dimension, max_size, ffmpeg, media_hash = job
+    extension = os.path.splitext(asset_path)[1][1:].lower()
+
+    try:
+        if media_hash is None: # Only read the file if it changed since it was last hashed
+            media_hash = file_hash(asset_path)
+
+        if preview_path == "" and AssetOptions.needs_preview(extension):
+            preview_path = os.path.join(cache_dir, media_hash + ".preview.png")
+
+            if not os.path.isfile(preview_path): # Not made in an earlier run
+                _make_preview(asset_path, extension, preview_path, model_renderer, ffmpeg)
+
+        if downscale:
+            asset_path = _shrink(asset_path, extension, media_hash, cache_dir, max_dimension, max_size, ffmpeg)
+    except Exception as e:
+        return asset_path, preview_path, str(e), media_hash
+
+    return asset_path, preview_path, None, media_hash
+
+def _make_preview(asset_path:str, extension:str, preview_path:str, model_renderer, ffmpeg:str):
+    """
+    Write a preview image for a video, audio or 3D model file. The preview is written to a temporary file
+    first, so an interrupted run never leaves a broken preview in the cache.
+
+    Args:
+        asset_path (str): The media file.
+        extension (str): Its lowercase extension.
+        preview_path (str): The .png file to write.
+        model_renderer (callable): Renders 3D models, or None for a placeholder.
+        ffmpeg (str): The ffmpeg executable.
+    """
+    temp_path = preview_path + "." + str(os.getpid()) + ".tmp.png"
+
+    try:
+        if extension in MediaPreprocessor.video_extensions:
+            for seconds in ("1", "0"): # A frame one second in is rarely a black title card, but short videos need the first frame
+                _run_ffmpeg(ffmpeg, ["-ss", seconds, "-i", asset_path, "-frames:v", "1", temp_path])
+
+                if os.path.isfile(temp_path) and os.path.getsize(temp_path) > 0:
+                    break
+            else:
+                raise Exception("ffmpeg found no frame in " + asset_path)
+        elif extension in MediaPreprocessor.model_extensions and model_renderer is not None:
+            model_renderer(asset_path, temp_path)
+
+            if not os.path.isfile(temp_path):
+                raise Exception("Model renderer wrote no preview for " + asset_path)
+        else: # Audio, or a model without a renderer
+            with open(temp_path, "wb") as file:
+                file.write(placeholder_png())
+
+        os.replace(temp_path, preview_path)
+    finally:
+        if os.path.isfile(temp_path):
+            os.remove(temp_path)
+
+def _shrink(asset_path:str, extension:str, media_hash:str, cache_dir:str, max_dimension:int, max_size:int, ffmpeg:str):
+    """
+    Returns a smaller copy of oversized media, made once and cached, or asset_path if it doesn't need shrinking.
+    Images are downscaled further until they fit in max_size, and videos are recompressed.
+
+    Args:
+        asset_path (str): The media file.
+        extension (str): Its lowercase extension.
+        media_hash (str): The content hash of the file.
+        cache_dir (str): Where the copy is kept.
+        max_dimension (int): The longest side in pixels of an image.
+        max_size (int): The largest file size in bytes.
+        ffmpeg (str): The ffmpeg executable.
+
+    Raises:
+        Exception: If the media is still larger than max_size, or is larger and of a type that can't be shrunk.
+
+    Returns:
+        str: The path of the media to upload.
+    """
+    oversized = os.path.getsize(asset_path) > max_size
+
+    if extension in MediaPreprocessor.image_extensions:
+        from PIL import Image # Imported here so Pillow is only needed when downscaling images
+
+        with Image.open(asset_path) as image:
+            if not oversized and max(image.size) <= max_dimension:
+                return asset_path
+
+        output_path = os.path.join(cache_dir, media_hash + "." + str(max_dimension) + "." + str(max_size) + "." + extension)
+
+        if not os.path.isfile(output_path):
+            temp_path = output_path + "." + str(os.getpid()) + ".tmp." + extension
+
+            try:
+                with Image.open(asset_path) as image:
+                    image.thumbnail((max_dimension, max_dimension)) # Keeps the aspect ratio
+
+                    for attempt in range(8):
+                        image.save(temp_path, quality=85, optimize=True)
+                        size = os.path.getsize(temp_path)
+
+                        if size <= max_size:
+                            break
+
+                        dimension = int(max(image.size) * min(max(max_size / size, 0.25) ** 0.5, 0.9)) # Size goes with the area, so scale the sides by its square root
+                        image.thumbnail((dimension, dimension))
+                    else:
+                        raise Exception("Couldn't shrink " + asset_path + " under " + str(max_size) + " bytes")
+
+                os.replace(temp_path, output_path)
+            finally:
+                if os.path.isfile(temp_path):
+                    os.remove(temp_path)
+
+        if os.path.getsize(output_path) > max_size: # Made by an earlier version
+            raise Exception("Couldn't shrink " + asset_path + " under " + str(max_size) + " bytes")
+
+        return output_path
+
+    if extension in MediaPreprocessor.video_extensions and oversized:
+        output_path = os.path.join(cache_dir, media_hash + "." + str(max_dimension) + "." + str(max_size) + "." + extension)
+
+        if not os.path.isfile(output_path):
+            temp_path = output_path + "." + str(os.getpid()) + ".tmp." + extension
+            _run_ffmpeg(ffmpeg, ["-i", asset_path, "-vf", "scale='min(" + str(max_dimension) + ",iw)':-2", "-crf", "28", temp_path])
+            os.replace(temp_path, output_path)
+
+        if os.path.getsize(output_path) > max_size:
+            raise Exception("Couldn't shrink " + asset_path + " under " + str(max_size) + " bytes")
+
+        return output_path
+
+    if oversized: # Such as audio, 3D models and GIFs
+        raise Exception(asset_path + " is over " + str(max_size) + " bytes, and ." + extension + " files can't be shrunk")
+
+    return asset_path
+
+def _run_ffmpeg(ffmpeg:str, arguments:list):
+    """
+    Run ffmpeg quietly, overwriting its output.
+
+    Args:
+        ffmpeg (str): The ffmpeg executable.
+        arguments (list): The arguments after the executable.
+
+    Raises:
+        Exception: If ffmpeg isn't installed or fails.
+    """
+    if shutil.which(ffmpeg) is None:
+        raise Exception("ffmpeg is needed for video files, but " + ffmpeg + " was not found")
+
+    completed = subprocess.run([ffmpeg, "-y", "-loglevel", "error"] + arguments, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    if completed.returncode != 0:
+        raise Exception("ffmpeg failed: " + completed.stderr.decode("utf-8", "replace").strip())
+
+def placeholder_png(width:int = 512, height:int = 512, color:tuple = (32, 33, 36)):
+    """
+    Returns a PNG image of a single color, made without any imaging library.
+
+    Args:
+        width (int, optional): The width in pixels. Defaults to 512.
+        height (int, optional): The height in pixels. Defaults to 512.
+        color (tuple, optional): The (red, green, blue) color. Defaults to a dark gray.
+
+    Returns:
+        bytes: The PNG file.
+    """
+    def chunk(kind:bytes, data:bytes):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    row = b"\x00" + bytes(color) * width # Each row starts with filter type 0
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0) # 8 bit RGB
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(row * height, 9)) + chunk(b"IEND", b"")
+
+def preprocess(assets, cache_dir:str = None, workers:int = None, model_renderer = None, downscale:bool = False, on_error = None):
+    """
+    Shortcut for MediaPreprocessor(...).process(assets).
+
+    Args:
+        assets (iterable): The AssetOptions to prepare.
+        cache_dir (str, optional): See MediaPreprocessor.
+        workers (int, optional): See MediaPreprocessor.
+        model_renderer (callable, optional): See MediaPreprocessor.
+        downscale (bool, optional): See MediaPreprocessor.
+        on_error (callable, optional): See MediaPreprocessor.
+
+    Returns:
+        list: The AssetOptions, in the same order.
+    """
+    return MediaPreprocessor(cache_dir, workers, model_renderer, downscale, on_error=on_error).process(assets)
@@ -0,0 +1,383 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import json, threading, time
+
+CREATE_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Create New Item</title></head>
+<body>
+<script>var DELAYS = __DELAYS__;</script>
+<div id="app"></div>
+<script>
+function after(seconds, callback) {
+    setTimeout(callback, seconds * 1000);
+}
+
+function button(label, onClick, ariaLabel) {
+    var element = document.createElement("button");
+    element.type = "button";
+    element.innerText = label;
+
+    if (ariaLabel) {
+        element.setAttribute("aria-label", ariaLabel);
+    }
+
+    element.addEventListener("click", onClick);
+    return element;
+}
+
+function input(attributes) {
+    var element = document.createElement(attributes.tag || "input");
+
+    Object.keys(attributes).forEach(function (key) {
+        if (key !== "tag") {
+            element.setAttribute(key, attributes[key]);
+        }
+    });
+
+    return element;
+}
+
+var state = {properties: [], levels: [], stats: [], chain: "Ethereum", unlockable: false, explicit: false};
+
+function openModal(kind) {
+    var modal = document.getElementById("modal");
+    modal.innerHTML = "";
+    var rows = document.createElement("div");
+
+    function addRow() {
+        var row = document.createElement("div");
+
+        if (kind === "properties") {
+            row.appendChild(input({placeholder: "Character"}));
+            row.appendChild(input({placeholder: "Male"}));
+        } else {
+            row.appendChild(input({placeholder: "Speed"}));
+            row.appendChild(input({placeholder: "Min", value: "3"}));
+            row.appendChild(input({placeholder: "Max", value: "5"}));
+        }
+
+        rows.appendChild(row);
+    }
+
+    after(DELAYS.modal, function () {
+        addRow();
+        modal.appendChild(rows);
+        modal.appendChild(button("Add more", addRow));
+        modal.appendChild(button("Save", function () {
+            state[kind] = Array.from(rows.children).map(function (row) {
+                return Array.from(row.querySelectorAll("input")).map(function (field) { return field.value; });
+            }).filter(function (values) { return values[0] !== ""; });
+            modal.innerHTML = "";
+        }));
+    });
+}
+
+function create() {
+    var media = document.getElementById("media").files[0];
+    var details = {
+        name: document.getElementById("name").value,
+        external_link: document.getElementById("external_link").value,
+        description: document.getElementById("description").value,
+        properties: state.properties,
+        levels: state.levels,
+        stats: state.stats,
+        unlockable_content: state.unlockable ? document.querySelector("textarea[placeholder^='Enter content']").value : "",
+        explicit: state.explicit,
+        supply: document.getElementById("supply").value,
+        blockchain: state.chain,
+        media_size: media ? media.size : 0
+    };
+
+    fetch("/api/media", {method: "POST", body: media || ""}).then(function () {
+        return fetch("/api/create", {method: "POST", body: JSON.stringify(details)});
+    }).then(function (response) {
+        return response.json();
+    }).then(function (created) {
+        after(DELAYS.confirmation, function () {
+            history.pushState({}, "", "/assets/mock/" + created.id);
+            var heading = document.createElement("h4");
+            heading.innerText = "You created " + details.name + "!";
+            document.body.appendChild(heading);
+        });
+    });
+}
+
+after(DELAYS.render, function () {
+    var app = document.getElementById("app");
+    app.appendChild(input({type: "file", id: "media", style: "display: none"}));
+    app.appendChild(input({type: "file", name: "preview", style: "display: none"}));
+    app.appendChild(input({id: "name"}));
+    app.appendChild(input({id: "external_link"}));
+    app.appendChild(input({tag: "textarea", id: "description"}));
+    app.appendChild(button("+", function () { openModal("properties"); }, "Add properties"));
+    app.appendChild(button("+", function () { openModal("levels"); }, "Add levels"));
+    app.appendChild(button("+", function () { openModal("stats"); }, "Add stats"));
+
+    var unlockable = input({type: "checkbox", id: "unlockable-content-toggle"});
+    var content = input({tag: "textarea", placeholder: "Enter content (access key, code to redeem, link to a file, etc.)", style: "display: none"});
+    unlockable.addEventListener("click", function () {
+        state.unlockable = unlockable.checked;
+        content.style.display = unlockable.checked ? "block" : "none";
+    });
+    app.appendChild(unlockable);
+    app.appendChild(content);
+
+    var explicit = input({type: "checkbox", id: "explicit-content-toggle"});
+    explicit.addEventListener("click", function () { state.explicit = explicit.checked; });
+    app.appendChild(explicit);
+
+    app.appendChild(input({id: "supply", value: "1"}));
+
+    var chain = document.createElement("div");
+    var chainInput = input({id: "chain", value: "Ethereum", readonly: "readonly"});
+    chain.appendChild(chainInput);
+    chain.addEventListener("click", function () {
+        var option = document.createElement("div");
+        option.id = "tippy-9";
+        option.innerText = "Polygon";
+        option.addEventListener("click", function (event) {
+            event.stopPropagation();
+            state.chain = "Polygon";
+            chainInput.value = "Polygon";
+            option.remove();
+        });
+        chain.appendChild(option);
+    });
+    app.appendChild(chain);
+
+    var modal = document.createElement("div");
+    modal.id = "modal";
+    app.appendChild(modal);
+    app.appendChild(button("Create", create));
+});
+</script>
+</body>
+</html>
+"""
+
+SELL_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Sell</title></head>
+<body>
+<script>var DELAYS = __DELAYS__; var ASSET_ID = __ASSET_ID__;</script>
+<div id="app"></div>
+<script>
+function after(seconds, callback) {
+    setTimeout(callback, seconds * 1000);
+}
+
+function element(tag, attributes, text) {
+    var created = document.createElement(tag);
+
+    Object.keys(attributes).forEach(function (key) {
+        created.setAttribute(key, attributes[key]);
+    });
+
+    if (text) {
+        created.innerText = text;
+    }
+
+    return created;
+}
+
+window.addEventListener("message", function (event) {
+    if (event.data !== "signed") {
+        return;
+    }
+
+    fetch("/api/list", {method: "POST", body: JSON.stringify({id: ASSET_ID, price: document.querySelector("input[name='price']").value})});
+
+    after(DELAYS.confirmation, function () {
+        document.body.appendChild(element("h4", {}, "Your NFT is listed!"));
+    });
+});
+
+after(DELAYS.render, function () {
+    var app = document.getElementById("app");
+    app.appendChild(element("input", {name: "price"}));
+
+    var duration = element("button", {type: "button", id: "duration"}, "Duration");
+    var box = element("div", {style: "display: none"});
+    box.appendChild(element("input", {type: "date"}));
+    box.appendChild(element("input", {type: "date"}));
+    box.appendChild(element("input", {type: "time", id: "start-time"}));
+    box.appendChild(element("input", {type: "time", id: "end-time"}));
+    duration.addEventListener("click", function () { box.style.display = "block"; });
+    app.appendChild(duration);
+    app.appendChild(box);
+
+    var submit = element("button", {type: "submit"}, "Complete listing");
+    submit.addEventListener("click", function () {
+        after(DELAYS.modal, function () {
+            var sign = element("button", {type: "button"}, "Sign");
+            sign.addEventListener("click", function () {
+                after(DELAYS.sign_window, function () {
+                    window.open("/sign", "sign", "width=360,height=600");
+                });
+            });
+            app.appendChild(sign);
+        });
+    });
+    app.appendChild(submit);
+});
+</script>
+</body>
+</html>
+"""
+
+SIGN_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>MetaMask Notification</title></head>
+<body>
+<script>var DELAYS = __DELAYS__;</script>
+<script>
+setTimeout(function () {
+    var sign = document.createElement("button");
+    sign.setAttribute("data-testid", "request-signature__sign");
+    sign.innerText = "Sign";
+    sign.addEventListener("click", function () {
+        window.opener.postMessage("signed", "*");
+        setTimeout(function () { window.close(); }, 50);
+    });
+    document.body.appendChild(sign);
+}, DELAYS.render * 1000);
+</script>
+</body>
+</html>
+"""
+
+class MockSite:
+    default_delays = {"render": 0.2, "modal": 0.1, "confirmation": 1.0, "sign_window": 0.5}
+
+    def __init__(self, host:str = "127.0.0.1", port:int = 0, delays:dict = None):
+        """
+        Create a local stand-in for OpenSea's create and sell pages, for benchmarking and testing OSSBrowser without
+        the real site or a wallet. It serves pages with the elements OSSBrowser uses, and a MetaMask-style sign popup.
+        Created and listed assets are recorded in the created and listed lists.
+
+        Args:
+            host (str, optional): The address to serve on. Defaults to "127.0.0.1".
+            port (int, optional): The port to serve on, or 0 for any free port. Defaults to 0.
+            delays (dict, optional): Seconds the pages wait before each part appears. Keys are "render" (page content),
+                "modal" (attribute modals and the sign button), "confirmation" (the created and listed messages) and
+                "sign_window" (the sign popup). Defaults to MockSite.default_delays.
+        """
+        self.delays = dict(MockSite.default_delays)
+        self.delays.update(delays or {})
+        self.created = [] # Details of every asset created
+        self.listed = [] # Details of every asset listed
+        self.media_bytes = 0 # Total size of uploaded media
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        The base URL of the site, such as "http://127.0.0.1:8000".
+        """
+        host, port = self._server.server_address[:2]
+        return "http://" + host + ":" + str(port)
+
+    @property
+    def create_link(self):
+        """
+        The create page URL to pass to upload_asset.
+        """
+        return self.url + "/asset/create"
+
+    def start(self):
+        """
+        Start serving in a background thread.
+
+        Returns:
+            MockSite: This site.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MockSite", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def _handler(site:MockSite):
+    """
+    Returns a request handler class serving the pages of site.
+    """
+    class MockSiteHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass # Keep benchmark output clean
+
+        def _send(self, body:str, content_type:str = "text/html"):
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type + "; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            path = self.path.split("?")[0].rstrip("/")
+            delays = json.dumps(site.delays)
+
+            if path == "/asset/create":
+                self._send(CREATE_PAGE.replace("__DELAYS__", delays))
+            elif path.startswith("/assets/mock/") and path.endswith("/sell"):
+                self._send(SELL_PAGE.replace("__DELAYS__", delays).replace("__ASSET_ID__", json.dumps(path.split("/")[3])))
+            elif path == "/sign":
+                self._send(SIGN_PAGE.replace("__DELAYS__", delays))
+            elif path == "" or path.startswith("/assets/mock/"):
+                self._send("<!DOCTYPE html><html><body><h1>Mock OpenSea</h1></body></html>")
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            with site._lock:
+                if self.path == "/api/media":
+                    site.media_bytes += len(body)
+                    self._send("{}", "application/json")
+                elif self.path == "/api/create":
+                    details = json.loads(body)
+                    details["id"] = str(len(site.created) + 1)
+                    details["time"] = time.time()
+                    site.created.append(details)
+                    self._send(json.dumps({"id": details["id"]}), "application/json")
+                elif self.path == "/api/list":
+                    details = json.loads(body)
+                    details["time"] = time.time()
+                    site.listed.append(details)
+                    self._send("{}", "application/json")
+                else:
+                    self.send_error(404)
+
+    return MockSiteHandler
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for OpenSea's create and sell pages")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    site = MockSite(args.host, args.port).start()
+    print("Create page:", site.create_link)
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        site.stop()
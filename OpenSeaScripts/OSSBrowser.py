@@ -3,13 +3,50 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.file_detector import UselessFileDetector
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.remote_connection import RemoteConnection
 from selenium.webdriver.common.keys import Keys
-from webdriver_manager.chrome import ChromeDriverManager
-import time, datetime
+from selenium.common.exceptions import NoSuchWindowException, StaleElementReferenceException
+import contextlib, time, datetime
 from OpenSeaScripts.AssetOptions import AssetOptions
+from OpenSeaScripts.DriverCache import resolve_driver_path
+from OpenSeaScripts.ElementWaiter import ElementWaiter
+from OpenSeaScripts.StepError import StepError, ElementTimeoutError, ValidationError, ConfirmationMissingError, SignRejectedError
+from OpenSeaScripts.LeanProfile import LeanProfile
+from OpenSeaScripts.SelectorRegistry import SelectorRegistry
+from OpenSeaScripts.SessionRecycler import SessionRecycler
+from OpenSeaScripts.Tracer import Tracer, SpanRecord
+from OpenSeaScripts import Scripts
+
+class _AttachedRemote(webdriver.Remote):
+    def __init__(self, command_executor_url:str, session_id:str):
+        """
+        Create a Remote driver attached to an existing session, without asking the server to start a new one.
+
+        Args:
+            command_executor_url (str): The URL of the WebDriver server.
+            session_id (str): The session to attach to.
+        """
+        self._attach_session_id = session_id
+        super().__init__(command_executor=RemoteConnection(client_config=ClientConfig(command_executor_url)), file_detector=UselessFileDetector(), options=Options()) # Files are already on the remote machine
+
+    def start_session(self, capabilities:dict):
+        """
+        Take over the existing session instead of creating one.
+        """
+        self.session_id = self._attach_session_id
 
 class OSSBrowser:
-    def __init__(self, command_executor_url:str = None, session_id:str = None, headless:bool = False):
+    property_fields = [("name", "property_name"), ("value", "property_value")] # Selector names of the inputs in a property row
+    sign_button_locators = [(By.CSS_SELECTOR, "button[data-testid='request-signature__sign']"), (By.CSS_SELECTOR, "button[data-testid='signature-sign-button']"),
+        (By.CSS_SELECTOR, "button[data-testid='page-container-footer-next']")] # MetaMask sign buttons, tried in order
+    rejection_texts = ["User denied", "User rejected", "rejected the request", "Signature request was rejected"] # Shown on the sell page when signing fails
+    resumable_steps = {"upload": ["media", "details", "chain", "confirmation"], "sell": ["sign", "confirmation"]} # Steps that can safely run again on the same page
+    commit_steps = {"upload": "create", "sell": "sign_window"} # Starting over from or after these could create or list an asset twice
+    throttle_texts = ["Too many requests", "rate limit", "Please try again later", "Something went wrong"] # Error banners shown when OpenSea is throttling
+    level_fields = [("name", "level_name"), ("max", "level_max"), ("value", "level_value")] # Selector names of the inputs in a level or stat row, max before value so the value fits
+
+    def __init__(self, command_executor_url:str = None, session_id:str = None, headless:bool = False, user_data_dir:str = None, start_url:str = "https://www.opensea.io/", offline:bool = False, lean_profile:LeanProfile = None, tracer:Tracer = None, recycler:SessionRecycler = None, selectors:SelectorRegistry = None):
         """
         Create a new OSSBrowser instance by opening a new chrome window or reconnecting to an existing session.
         If command_executor_url and session_id are provided, the browser will be reconnected to an existing session.
@@ -18,29 +55,124 @@ class OSSBrowser:
             command_executor_url (str, optional): The command_executor_url of an existing browser session. Defaults to None.
             session_id (str, optional): The session_id of an existing browser session. Defaults to None.
             headless (bool, optional): Wether to operate in headless mode or not. Defaults to False.
+            user_data_dir (str, optional): The Chrome profile directory to use, so logins such as MetaMask persist. Defaults to None.
+            start_url (str, optional): The page to open once started, or None to stay on the current page. Defaults to "https://www.opensea.io/".
+            offline (bool, optional): Only use the cached Chrome driver instead of checking for one online. Defaults to False.
+            lean_profile (LeanProfile, optional): Block resources the automation doesn't need, so pages are ready sooner,
+                and record PageStats for every page opened in lean_profile.history. Defaults to None.
+            tracer (Tracer, optional): Times each phase of uploads and sales. Share one between browsers to combine their timings. Defaults to a new Tracer.
+            recycler (SessionRecycler, optional): Relaunches Chrome on the same user_data_dir once it uses too much memory
+                or has run too many operations. Only used for new windows. Defaults to None.
+            selectors (SelectorRegistry, optional): The selectors used to find elements, which also caches the elements
+                found on each page. Give one with updated selectors if OpenSea changes a page. Defaults to a new SelectorRegistry.
         """
 
-        service = Service(ChromeDriverManager().install()) # Install the Chrome driver and create a new Service
+        self.waiter = ElementWaiter() # Polls for elements, see self.waiter.history for how long each wait took
+        self.last_error = None # The error that made the last upload or sale fail
+        self.last_sign_latency = None # Seconds from requesting a signature to signing it in MetaMask
+        self._sign_locator = OSSBrowser.sign_button_locators[0] # The sign button locator that last worked
+        self.lean_profile = lean_profile
+        self.tracer = tracer if tracer is not None else Tracer()
+        self.recycler = recycler
+        self.operations = 0 # Uploads and sales since Chrome was launched
+        self._launch_options = None # How a window this instance opened was launched, so it can be relaunched
+        self.selectors = selectors if selectors is not None else SelectorRegistry()
+        self.scheduler = None # A RateScheduler pacing uploads and sales, set by RateScheduler.attach
+
+        if command_executor_url is not None and session_id is not None: # If command_executor_url and session_id are provided, connect to an existing session
+            self.driver = _AttachedRemote(command_executor_url, session_id) # Connect to an existing session, without starting another
+
+            if lean_profile is not None:
+                lean_profile.apply_driver(self.driver) # Block unneeded resources
+        else: # Otherwise, open a new window
+            self._launch_options = (headless, user_data_dir, offline)
+            self._launch()
+
+        if start_url is not None:
+            self._open_page(start_url) # Go to the OpenSea website
+
+    def _launch(self):
+        """
+        Open a new Chrome window with the options this browser was created with.
+        """
+        headless, user_data_dir, offline = self._launch_options
+        service = Service(resolve_driver_path(offline)) # Find the Chrome driver, installing it only if it isn't cached
 
         chrome_options = Options() # Create an Options object to configure the browser
 
         if headless:
             chrome_options.add_argument("--headless") # Add headless argument if headless is True
 
-        if command_executor_url is not None and session_id is not None: # If command_executor_url and session_id are provided, connect to an existing session
-            self.driver = webdriver.Remote(command_executor=command_executor_url, desired_capabilities={}) # Connect to an existing session
-            self.driver.close()
-            self.driver.session_id = session_id
-            self.driver.file_detector = UselessFileDetector() # Use a different file_detector for existing sessions
-        else: # Otherwise, open a new window
-            self.driver = webdriver.Chrome(chrome_options=chrome_options, service=service) # Create a new browser window
+        if user_data_dir is not None:
+            chrome_options.add_argument("--user-data-dir=" + user_data_dir) # Use a separate profile, needed to run several browsers at once
 
-        self.driver.get("https://www.opensea.io/") # Go to the OpenSea website
+        if self.lean_profile is not None:
+            self.lean_profile.apply_options(chrome_options) # Load pages eagerly and without images
+
+        self.driver = webdriver.Chrome(options=chrome_options, service=service) # Create a new browser window
 
         if not headless:
             self.driver.maximize_window() # Operate in full screen
 
-    def _find_element_timeout(self, by:str, value:str, timeout:float = 7, base_delay:float = 0.1):
+        if self.lean_profile is not None:
+            self.lean_profile.apply_driver(self.driver) # Block unneeded resources
+
+    def relaunch(self):
+        """
+        Quit Chrome and open it again on the same profile, freeing the memory it has built up.
+        Logins such as MetaMask are kept if the browser was created with a user_data_dir.
+
+        Raises:
+            Exception: If the browser is attached to a remote session, which can't be relaunched.
+        """
+        if self._launch_options is None:
+            raise Exception("Only browsers opened by OSSBrowser can be relaunched")
+
+        try:
+            self.driver.quit()
+        except Exception:
+            pass # Already gone, which may be why it is being relaunched
+
+        self._launch()
+        self.operations = 0
+        self.selectors.invalidate() # Elements of the old Chrome are gone
+        self.selectors.switch(None)
+
+    def chrome_pid(self):
+        """
+        Returns the process id of the Chrome driver, whose descendants are every Chrome process of this browser.
+
+        Returns:
+            int: The process id, or None if the browser is attached to a remote session.
+        """
+        if self._launch_options is None:
+            return None
+
+        return self.driver.service.process.pid
+
+    def _before_operation(self):
+        """
+        Relaunch Chrome if the recycler says it has grown too large, then count the operation about to start.
+        """
+        if self.recycler is not None:
+            self.recycler.check(self)
+
+        self.operations += 1
+
+    def _open_page(self, url:str):
+        """
+        Open a page in the browser, recording its PageStats if a lean profile is in use.
+
+        Args:
+            url (str): The URL to open.
+        """
+        self.selectors.invalidate(self.selectors.window) # Elements of the previous page are gone
+        self.driver.get(url)
+
+        if self.lean_profile is not None:
+            self.lean_profile.record_page(self.driver)
+
+    def _find_element_timeout(self, by:str, value:str, timeout:float = 7, base_delay:float = 0):
         """Find an HTML element, waiting up to timeout seconds for it to appear and delaying base_delay
         seconds before searching. Uses the Selenium By method to search for value.
 
@@ -48,204 +180,552 @@ class OSSBrowser:
             by (str): The method to search for value. Most likely By.ID or By.CSS_SELECTOR.
             value (str): The value to search for.
             timeout (float, optional): How long to wait before failing. Defaults to 7.
-            base_delay (float, optional): How long to wait before the first check. Defaults to 0.1.
+            base_delay (float, optional): How long to wait before the first check. Defaults to 0.
 
         Raises:
-            Exception: If the element is not found after timeout seconds.
+            ElementTimeoutError: If the element is not found after timeout seconds.
 
         Returns:
             selenium.webdriver.remote.webelement.WebElement: The element found.
         """
-        time.sleep(base_delay)
-
-        for i in range(timeout):
-            try:
-                return self.driver.find_element(by, value) # Attempt to find element
-            except:
-                time.sleep(1) # Wait if not found
+        return self.waiter.until(lambda: self.driver.find_element(by, value), timeout, value, base_delay)
 
-        raise Exception("Element not found") # Raise exception if not found after timeout seconds
-
-    def _find_elements_timeout(self, by:str, value:str, timeout:float = 7, base_delay:float = 0.1):
-        """Find HTML elements, waiting up to timeout seconds for them to appear and delaying base_delay
-        seconds before searching. Uses the Selenium By method to search for value.
+    def _find_elements_timeout(self, by:str, value:str, timeout:float = 7, base_delay:float = 0, min_count:int = 1):
+        """Find HTML elements, waiting up to timeout seconds for at least min_count of them to appear and delaying
+        base_delay seconds before searching. Uses the Selenium By method to search for value.
 
         Args:
             by (str): The method to search for value. Most likely By.ID or By.CSS_SELECTOR.
             value (str): The value to search for.
             timeout (float, optional): How long to wait before failing. Defaults to 7.
-            base_delay (float, optional): How long to wait before the first check. Defaults to 0.1.
+            base_delay (float, optional): How long to wait before the first check. Defaults to 0.
+            min_count (int, optional): How many elements must be found. Defaults to 1.
 
         Raises:
-            Exception: If elements are not found after timeout seconds.
+            ElementTimeoutError: If elements are not found after timeout seconds.
 
         Returns:
             list: The elements found.
         """
+        def condition():
+            elements = self.driver.find_elements(by, value) # Attempt to find elements
+            return elements if len(elements) >= min_count else None
 
-        time.sleep(base_delay)
+        return self.waiter.until(condition, timeout, value, base_delay, "Elements not found")
 
-        for i in range(timeout):
-            try:
-                return self.driver.find_elements(by, value) # Attempt to find elements
-            except:
-                time.sleep(1) # Wait if not found
-
-        raise Exception("Elements not found") # Raise exception if not found after timeout seconds
-
-    def _find_element_content_timeout(self, by:str, value:str, content_text:str, timeout:float = 7, base_delay:float = 0.1):
+    def _find_element_content_timeout(self, by:str, value:str, content_text:str, timeout:float = 7, base_delay:float = 0):
         """Find an HTML element with content content_text, waiting up to timeout seconds
         for it to appear and delaying base_delay seconds before searching.
-        Uses the Selenium By method to search for value.
+        Uses the Selenium By method to search for value. CSS selectors are matched in one script per check,
+        instead of reading the text of every element found.
 
         Args:
             by (str): The method to search for value. Most likely By.ID or By.CSS_SELECTOR.
             value (str): The value to search for.
             content_text (str): The content of the element to search for.
             timeout (float, optional): How long to wait before failing. Defaults to 7.
-            base_delay (float, optional): How long to wait before the first check. Defaults to 0.1.
+            base_delay (float, optional): How long to wait before the first check. Defaults to 0.
 
         Raises:
-            Exception: If the element is not found after timeout seconds.
+            ElementTimeoutError: If the element is not found after timeout seconds.
 
         Returns:
             selenium.webdriver.remote.webelement.WebElement: The element found.
         """
+        def condition():
+            if by == By.CSS_SELECTOR:
+                return self.driver.execute_script(Scripts.FIND_BY_TEXT, value, content_text)
 
-        time.sleep(base_delay)
+            for element in self.driver.find_elements(by, value):
+                if element.text == content_text: # Check if element has the correct content
+                    return element
 
-        for i in range(timeout):
-            try:
-                elements = self.driver.find_elements(by, value) # Attempt to find elements
+            return None
 
-                for element in elements:
-                    if element.text == content_text: # Check if element has the correct content
-                        return element
+        return self.waiter.until(condition, timeout, value + " " + content_text, base_delay)
 
-                raise Exception("Element not found") # Jump to except if not found
-            except:
-                time.sleep(1) # Wait if not found
+    def _find(self, name:str, *args, timeout:float = 7):
+        """
+        Find an element by the name of its selector in self.selectors, waiting up to timeout seconds for it to appear.
+        The element is cached until the page changes, so finding it again takes no WebDriver calls.
 
-        raise Exception("Element not found") # Raise exception if not found after timeout seconds
+        Args:
+            name (str): The name of the selector, such as "create".
+            *args: Values for the selector's {} placeholders.
+            timeout (float, optional): How long to wait before failing. Defaults to 7.
 
+        Raises:
+            ElementTimeoutError: If the element is not found after timeout seconds.
 
-    def upload_asset(self, asset_options:AssetOptions, create_link:str = "https://opensea.io/asset/create?enable_supply=true"):
+        Returns:
+            selenium.webdriver.remote.webelement.WebElement: The element found.
         """
-        Upload a given asset to opensea.io.
+        selector = self.selectors.get(name, *args)
+        element = self.selectors.cached(selector)
+
+        if element is not None:
+            return element
+
+        if selector.text is None:
+            element = self._find_element_timeout(selector.by, selector.value, timeout)
+        else:
+            element = self._find_element_content_timeout(selector.by, selector.value, selector.text, timeout)
+
+        self.selectors.store(selector, element)
+        return element
+
+    def _use(self, name:str, action, *args, timeout:float = 7):
+        """
+        Find an element with _find and run action on it. If the element went stale, such as when the page
+        re-renders it, the cache is cleared and the element is found again once.
 
         Args:
-            asset_options (AssetOptions): The asset object to upload.
-            create_link (str, optional): The URL to use to upload. Use this for uploading to a collection. Defaults to "https://opensea.io/asset/create?enable_supply=true".
+            name (str): The name of the selector, such as "create".
+            action (callable): Called with the element.
+            *args: Values for the selector's {} placeholders.
+            timeout (float, optional): How long to wait for the element. Defaults to 7.
 
         Raises:
-            ValueError: If the asset_options is of the wrong type.
-            ValueError: If the asset_options is missing required fields.
-            Exception: If the asset upload fails.
+            ElementTimeoutError: If the element is not found after timeout seconds.
 
         Returns:
-            Boolean: False if the asset was not uploaded.
-            str: The URL of the asset if it was uploaded.
+            The value returned by action.
         """
+        try:
+            return action(self._find(name, *args, timeout=timeout))
+        except StaleElementReferenceException:
+            self.selectors.invalidate()
+            return action(self._find(name, *args, timeout=timeout))
 
-        try: # Wrap the whole thing in a try/except block to safely return False if errors occur
-            if not isinstance(asset_options, AssetOptions):
-                raise ValueError("Asset options must be an instance of AssetOptions")
+    def _switch_window(self, window:str):
+        """
+        Focus on a window, caching elements under it from now on.
+
+        Args:
+            window (str): The window handle.
+        """
+        self.driver.switch_to.window(window)
+        self.selectors.switch(window)
 
-            self.driver.get(create_link) # Go to the create page
+    def _enter_attributes(self, button_label:str, attributes:list, fields:list, batch:bool = True):
+        """
+        Open an attribute modal (properties, levels or stats), fill in its rows, and save it.
+
+        Args:
+            button_label (str): The aria-label of the button that opens the modal, such as "Add properties".
+            attributes (list): The attribute dicts from AssetOptions, such as asset_options.get_levels().
+            fields (list): (key, selector name) pairs for each input in a row, in the order they are filled.
+            batch (bool, optional): Whether to add the rows and fill every input with one script each,
+                instead of typing into each input. Defaults to True.
+
+        Raises:
+            ElementTimeoutError: If the modal, its rows, or its buttons are not found.
+            ValidationError: If a value could not be set.
+        """
+        self._use("attribute_button", lambda button: button.click(), button_label)
+        fields = [(key, self.selectors.css(name)) for key, name in fields]
+        name_selector = fields[0][1]
+
+        if batch:
+            self._find_elements_timeout(By.CSS_SELECTOR, name_selector) # Wait for the modal to open
+            add_more = self.selectors.get("add_more")
+
+            if self.driver.execute_script(Scripts.ADD_ROWS, name_selector, add_more.text, len(attributes), add_more.value) < 0:
+                raise ElementTimeoutError("Element not found")
+
+            self._find_elements_timeout(By.CSS_SELECTOR, name_selector, min_count=len(attributes)) # Wait for the new rows to render
+
+            values = [[selector, i, attribute[key]] for i, attribute in enumerate(attributes) for key, selector in fields]
+
+            if len(self.driver.execute_script(Scripts.SET_VALUES, values)) > 0:
+                raise ValidationError("Failed to enter " + button_label[4:])
+        else:
+            for i, attribute in enumerate(attributes):
+                for key, selector in fields:
+                    field = self._find_elements_timeout(By.CSS_SELECTOR, selector, min_count=i + 1)[i]
+                    field.send_keys(Keys.CONTROL, "a") # Replace any default value
+                    field.send_keys(attribute[key])
+
+                self._use("add_more", lambda button: button.click())
+
+        self._use("save", lambda button: button.click())
+
+    def _upload_steps(self, asset_options:AssetOptions, create_link:str, batch_attributes:bool = True, fast_fill:bool = True):
+        """
+        Returns the steps of uploading an asset, in order. Steps not needed for this asset, such as
+        entering levels when it has none, are left out.
+
+        Args:
+            asset_options (AssetOptions): The asset to upload.
+            create_link (str): The URL to use to upload.
+            batch_attributes (bool, optional): Whether to enter properties, levels and stats with a few scripts. Defaults to True.
+            fast_fill (bool, optional): Whether to set text fields with a script instead of typing them. Defaults to True.
+
+        Returns:
+            list: (name, callable) pairs. The last step returns the URL of the uploaded asset.
+        """
+        steps = [("navigation", lambda: self._open_page(create_link)), ("media", lambda: self._upload_media(asset_options)), ("details", lambda: self._upload_details(asset_options, fast_fill))]
+
+        if not len(asset_options.get_properties()) == 0: # If there are properties, set them
+            steps.append(("properties", lambda: self._enter_attributes("Add properties", asset_options.get_properties(), OSSBrowser.property_fields, batch_attributes)))
+
+        if not len(asset_options.get_levels()) == 0: # If there are levels, set them
+            steps.append(("levels", lambda: self._enter_attributes("Add levels", asset_options.get_levels(), OSSBrowser.level_fields, batch_attributes)))
+
+        if not len(asset_options.get_stats()) == 0: # If there are stats, set them
+            steps.append(("stats", lambda: self._enter_attributes("Add stats", asset_options.get_stats(), OSSBrowser.level_fields, batch_attributes)))
+
+        steps.append(("options", lambda: self._upload_options(asset_options, fast_fill)))
+
+        if asset_options.get_blockchain() == "Polygon": # If the asset is on Polygon, set the blockchain
+            steps.append(("chain", self._select_polygon))
+
+        steps.append(("create", lambda: self._use("create", lambda button: button.click()))) # Click the create button
+        steps.append(("confirmation", lambda: self._await_created(asset_options)))
+        return steps
+
+    def _upload_media(self, asset_options:AssetOptions):
+        """
+        Upload the asset file, and its preview image if it needs one.
+
+        Args:
+            asset_options (AssetOptions): The asset to upload.
+
+        Raises:
+            ValidationError: If the asset needs a preview and has none.
+        """
+        self._use("media", lambda fileUpload: self._send_file(fileUpload, asset_options.get_asset_path())) # Upload the asset
+
+        if AssetOptions.needs_preview(asset_options.get_asset_path().split(".")[-1]): # Determine if the asset needs a preview (certain file types do on Opensea)
+            preview_path = asset_options.get_preview_path()
+
+            if preview_path == "":
+                raise ValidationError("Multimedia files need a preview image")
+
+            self._use("preview", lambda previewUpload: self._send_file(previewUpload, preview_path)) # Upload the preview image
+
+    def _send_file(self, file_input, path:str):
+        """
+        Make a hidden file input visible and send it a file.
 
-            fileUpload = self._find_element_timeout(By.ID, "media")
-            self.driver.execute_script('arguments[0].style = ""; arguments[0].style.display = "block"; arguments[0].style.visibility = "visible";', fileUpload)
-            fileUpload.send_keys(asset_options.get_asset_path()) # Upload the asset
+        Args:
+            file_input (selenium.webdriver.remote.webelement.WebElement): The file input.
+            path (str): The file to upload.
+        """
+        self.driver.execute_script('arguments[0].style = ""; arguments[0].style.display = "block"; arguments[0].style.visibility = "visible";', file_input)
+        file_input.send_keys(path)
 
-            if AssetOptions.needs_preview(asset_options.get_asset_path().split(".")[-1]): # Determine if the asset needs a preview (certain file types do on Opensea)
-                previewUpload = self._find_element_timeout(By.NAME, "preview")
-                self.driver.execute_script('arguments[0].style = ""; arguments[0].style.display = "block"; arguments[0].style.visibility = "visible";', previewUpload)
-                preview_path = asset_options.get_preview_path()
+    def _fill_fields(self, fields:list, fast_fill:bool = True):
+        """
+        Enter text into fields. With fast_fill, every field is set in one script through the native value setter,
+        as if typed, then read back in a second script. Only fields whose value doesn't match exactly are typed.
+        Line endings are normalized first the way the page stores them: CRLF becomes LF, and inputs drop line breaks.
 
-                if preview_path == "":
-                    raise ValueError("Multimedia files need a preview image")
+        Args:
+            fields (list): (selector name, text) pairs. Fields with empty text are left alone.
+            fast_fill (bool, optional): Whether to set the fields with a script instead of typing them. Defaults to True.
 
-                previewUpload.send_keys(preview_path) # Upload the preview image
+        Raises:
+            ElementTimeoutError: If a field is not found.
+            ValidationError: If a field still doesn't match after typing.
+        """
+        fields = [(selector, text) for selector, text in fields if text != ""]
 
-            self._find_element_timeout(By.ID, "name").send_keys(asset_options.get_name()) # Set the name
-            self._find_element_timeout(By.ID, "external_link").send_keys(asset_options.get_external_link()) # Set the external link
-            self._find_element_timeout(By.ID, "description").send_keys(asset_options.get_description()) # Set the description
+        if len(fields) == 0:
+            return
 
-            if not len(asset_options.get_properties()) == 0: # If there are properties, set them
-                self._find_element_timeout(By.CSS_SELECTOR, "button[aria-label='Add properties'").click()
+        def expected_value(element, text):
+            text = text.replace("\r\n", "\n").replace("\r", "\n") # A textarea's value only holds LF
 
-                for i, property in enumerate(asset_options.get_properties()):
-                    self._find_elements_timeout(By.CSS_SELECTOR, "input[placeholder='Character']")[i].send_keys(property["name"])
-                    self._find_elements_timeout(By.CSS_SELECTOR, "input[placeholder='Male']")[i].send_keys(property["value"])
-                    self._find_element_content_timeout(By.CSS_SELECTOR, "button[type='button']", "Add more").click()
+            if element.tag_name.lower() == "input":
+                text = text.replace("\n", "") # Inputs strip line breaks
 
-                self._find_element_content_timeout(By.CSS_SELECTOR, "button[type='button']", "Save").click()
+            return text
 
-            if not len(asset_options.get_levels()) == 0: # If there are levels, set them
-                self._find_element_timeout(By.CSS_SELECTOR, "button[aria-label='Add levels'").click()
+        for i, (name, text) in enumerate(fields):
+            self._find(name) # Wait for every field to exist
 
-                for i, level in enumerate(asset_options.get_levels()):
-                    self._find_elements_timeout(By.CSS_SELECTOR, "input[placeholder='Speed']")[i].send_keys(level["name"])
-                    max_field = self._find_elements_timeout(By.CSS_SELECTOR, "input[placeholder='Max']")[i]
-                    max_field.send_keys(Keys.CONTROL, "a")
-                    max_field.send_keys(level["max"])
-                    val_field = self._find_elements_timeout(By.CSS_SELECTOR, "input[placeHolder='Min']")[i]
-                    val_field.send_keys(Keys.CONTROL, "a")
-                    val_field.send_keys(level["value"])
-                    self._find_element_content_timeout(By.CSS_SELECTOR, "button[type='button']", "Add more").click()
+            if "\r" in text or "\n" in text: # Only look up the field's type when it matters
+                fields[i] = (name, self._use(name, lambda element: expected_value(element, text)))
 
-                self._find_element_content_timeout(By.CSS_SELECTOR, "button[type='button']", "Save").click()
+        if fast_fill:
+            self.driver.execute_script(Scripts.SET_VALUES, [[self.selectors.css(name), 0, text] for name, text in fields])
+            values = self.driver.execute_script(Scripts.GET_VALUES, [[self.selectors.css(name), 0] for name, text in fields]) # Check after the page has reacted
+            rejected = [field for field, value in zip(fields, values) if value != field[1]]
+        else:
+            rejected = fields
 
-            if not len(asset_options.get_stats()) == 0: # If there are stats, set them
-                self._find_element_timeout(By.CSS_SELECTOR, "button[aria-label='Add stats'").click()
+        def type_text(field, text):
+            if fast_fill:
+                field.send_keys(Keys.CONTROL, "a") # Replace the injected value
 
-                for i, stat in enumerate(asset_options.get_stats()):
-                    self._find_elements_timeout(By.CSS_SELECTOR, "input[placeholder='Speed']")[i].send_keys(stat["name"])
-                    max_field = self._find_elements_timeout(By.CSS_SELECTOR, "input[placeHolder='Max']")[i]
-                    max_field.send_keys(Keys.CONTROL, "a")
-                    max_field.send_keys(stat["max"])
-                    val_field = self._find_elements_timeout(By.CSS_SELECTOR, "input[placeHolder='Min']")[i]
-                    val_field.send_keys(Keys.CONTROL, "a")
-                    val_field.send_keys(stat["value"])
+            field.send_keys(text)
 
-                    self._find_element_content_timeout(By.CSS_SELECTOR, "button[type='button']", "Add more").click()
+        for name, text in rejected: # Type the fields that were rejected
+            self._use(name, lambda field: type_text(field, text))
 
-                self._find_element_content_timeout(By.CSS_SELECTOR, "button[type='button']", "Save").click()
+        if fast_fill and len(rejected) > 0:
+            values = self.driver.execute_script(Scripts.GET_VALUES, [[self.selectors.css(name), 0] for name, text in rejected])
 
-            if not asset_options.get_unlockable_content() == "": # If there is unlockable content, set it
-                content_check = self._find_element_timeout(By.CSS_SELECTOR, "input[id='unlockable-content-toggle']")
-                self.driver.execute_script('arguments[0].click();', content_check)
-                self._find_element_timeout(By.CSS_SELECTOR, "textarea[placeholder='Enter content (access key, code to redeem, link to a file, etc.)']").send_keys(asset_options.get_unlockable_content())
+            for (name, text), value in zip(rejected, values):
+                if value != text:
+                    raise ValidationError("Failed to enter " + name)
 
-            if asset_options.get_explicit(): # If the asset is explicit, flip the switch
-                explicit_check = self._find_element_timeout(By.CSS_SELECTOR, "input[id='explicit-content-toggle']")
-                self.driver.execute_script('arguments[0].click();', explicit_check)
+    def _upload_details(self, asset_options:AssetOptions, fast_fill:bool = True):
+        """
+        Enter the name, external link and description of an asset.
 
-            if asset_options.get_supply() > 1: # If the asset has a supply greater than 1, set it
-                supply_field = self._find_element_timeout(By.CSS_SELECTOR, "input[id='supply']")
+        Args:
+            asset_options (AssetOptions): The asset to upload.
+            fast_fill (bool, optional): Whether to set the fields with a script instead of typing them. Defaults to True.
+        """
+        self._fill_fields([("name", asset_options.get_name()), ("external_link", asset_options.get_external_link()), ("description", asset_options.get_description())], fast_fill)
+
+    def _upload_options(self, asset_options:AssetOptions, fast_fill:bool = True):
+        """
+        Set the unlockable content, explicit content switch and supply of an asset.
+
+        Args:
+            asset_options (AssetOptions): The asset to upload.
+            fast_fill (bool, optional): Whether to set the unlockable content with a script instead of typing it. Defaults to True.
+        """
+        if not asset_options.get_unlockable_content() == "": # If there is unlockable content, set it
+            self._use("unlockable_toggle", lambda content_check: self.driver.execute_script('arguments[0].click();', content_check))
+            self._fill_fields([("unlockable_content", asset_options.get_unlockable_content())], fast_fill)
+
+        if asset_options.get_explicit(): # If the asset is explicit, flip the switch
+            self._use("explicit_toggle", lambda explicit_check: self.driver.execute_script('arguments[0].click();', explicit_check))
+
+        if asset_options.get_supply() > 1: # If the asset has a supply greater than 1, set it
+            def enter_supply(supply_field):
                 supply_field.send_keys(Keys.CONTROL, "a")
                 supply_field.send_keys(asset_options.get_supply())
 
-            if asset_options.get_blockchain() == "Polygon": # If the asset is on Polygon, set the blockchain
-                chain_input = self._find_element_timeout(By.CSS_SELECTOR, "input[id='chain']")
-                chain_input.find_element(By.XPATH, "..").click()
-                self._find_element_timeout(By.CSS_SELECTOR, "div[id='tippy-9']").click()
+            self._use("supply", enter_supply)
 
-            self._find_element_content_timeout(By.CSS_SELECTOR, "button[type='button']", "Create").click() # Click the create button
+    def _select_polygon(self):
+        """
+        Select the Polygon blockchain in the chain dropdown.
+        """
+        self._use("chain", lambda chain_input: chain_input.find_element(By.XPATH, "..").click())
+        self._use("polygon_option", lambda option: option.click())
 
-            if self._find_element_content_timeout(By.CSS_SELECTOR, "h4", "You created " + asset.get_name() + "!", timeout=15) is not None: # Check if the asset was created successfully
-                asset.set_listed_link(self.driver.current_url)
-                return self.driver.current_url
-            else:
-                raise Exception("Failed to create asset")
+    def _await_created(self, asset_options:AssetOptions):
+        """
+        Wait for the message shown once an asset is created.
+
+        Args:
+            asset_options (AssetOptions): The asset being uploaded.
+
+        Raises:
+            ConfirmationMissingError: If the message doesn't appear.
+
+        Returns:
+            str: The URL of the created asset.
+        """
+        try:
+            self._find("created", asset_options.get_name(), timeout=15) # Check if the asset was created successfully
+        except ElementTimeoutError:
+            raise ConfirmationMissingError("Failed to create asset")
+
+        asset_options.set_listed_link(self.driver.current_url)
+        return self.driver.current_url
+
+    def _run_steps(self, operation:str, steps:list, whole:bool = True, retries:int = 0, start:int = 0, end:int = None, **attributes):
+        """
+        Run steps in order, timing the whole operation and each step with the tracer.
+        A step that fails raises a StepError tagged with the step's name. When steps are the whole operation,
+        a failed operation is retried up to retries times, from the failed step if _resume_index allows it,
+        and the error it finally fails with is marked committed if it failed at or after its commit step.
+        A whole operation can also be run in parts with start and end, such as to do other work while OpenSea confirms it.
+        Only an operation run in one part gets its own span.
+
+        Args:
+            operation (str): The operation name, such as "upload". Steps are traced as "<operation>.<step name>".
+            steps (list): (name, callable) pairs.
+            whole (bool, optional): Whether steps are the whole operation, so it gets its own span too. Defaults to True.
+            retries (int, optional): How many times to retry a failed operation. Only used if whole is True. Defaults to 0.
+            start (int, optional): The index of the first step to run. Defaults to 0.
+            end (int, optional): The index after the last step to run. Defaults to the end of steps.
+            **attributes: Extra values stored in every span.
+
+        Raises:
+            StepError: If a step fails and the operation can't be retried.
+
+        Returns:
+            The value returned by the last step.
+        """
+        end = len(steps) if end is None else end
+        result = None
+
+        if not whole:
+            for name, step in steps[start:end]:
+                with self.tracer.span(operation + "." + name, **attributes):
+                    try:
+                        result = step()
+                    except StepError as e:
+                        if e.step is None: # Tag the error with where it happened
+                            e.step, e.operation = name, operation
+
+                        raise
+                    except Exception as e:
+                        raise StepError(str(e), name, operation) from e
+
+            return result
+
+        with self.tracer.span(operation, **attributes) if start == 0 and end == len(steps) else contextlib.nullcontext():
+            while True:
+                try:
+                    return self._run_steps(operation, steps, False, start=start, end=end, **attributes)
+                except StepError as e:
+                    index = self._resume_index(operation, steps, e) if retries > 0 else None
+
+                    if index is None:
+                        e.committed = self._committed(operation, steps, e)
+                        raise
+
+                    print("Retrying", operation, "from", steps[index][0] + ":", e)
+                    start = index
+                    retries -= 1
+
+    def _run_operation(self, operation:str, steps:list, retries:int = 0, end:int = None, **attributes):
+        """
+        Run the steps of a whole operation with _run_steps, paced by the scheduler if one is attached.
+        Only this browser work is paced, so assets skipped by a journal or cache don't wait for the scheduler.
+
+        Args:
+            operation (str): The operation name, such as "upload".
+            steps (list): (name, callable) pairs.
+            retries (int, optional): How many times to retry a failed operation. Defaults to 0.
+            end (int, optional): The index after the last step to run, to finish the operation later with _finish_operation. Defaults to the end of steps.
+            **attributes: Extra values stored in every span.
+
+        Raises:
+            StepError: If a step fails and the operation can't be retried.
+
+        Returns:
+            The value returned by the last step run.
+        """
+        if self.scheduler is None:
+            return self._run_steps(operation, steps, retries=retries, end=end, **attributes)
+
+        return self.scheduler.call(self, self._run_steps, operation, steps, retries=retries, end=end, **attributes)
+
+    def _finish_operation(self, operation:str, steps:list, start:int, retries:int = 0, **attributes):
+        """
+        Run the rest of an operation started with _run_operation, such as waiting for its confirmation.
+        This only waits for OpenSea, so it isn't paced, but an error banner shown when it fails makes the scheduler back off.
+
+        Args:
+            operation (str): The operation name, such as "upload".
+            steps (list): (name, callable) pairs of the whole operation.
+            start (int): The index of the first step to run.
+            retries (int, optional): How many times to retry, from the failed step if _resume_index allows it. Defaults to 0.
+            **attributes: Extra values stored in every span.
+
+        Raises:
+            StepError: If a step fails and the operation can't be retried.
+
+        Returns:
+            The value returned by the last step.
+        """
+        try:
+            return self._run_steps(operation, steps, retries=retries, start=start, **attributes)
+        except StepError:
+            throttled = self.is_throttled() if self.scheduler is not None else None
+
+            if throttled is not None:
+                self.scheduler.signal_throttle(throttled)
+
+            raise
+
+    def _resume_index(self, operation:str, steps:list, error:StepError):
+        """
+        Find where to retry a failed operation. The failed step runs again on the same page if the error was
+        transient and the step is in resumable_steps. Otherwise the operation starts over, but only if it failed
+        before its step in commit_steps started. A failure in the commit step itself isn't retried, since its click
+        may have reached the page, so an asset is never created or listed twice.
+
+        Args:
+            operation (str): The operation name, such as "upload".
+            steps (list): (name, callable) pairs of the whole operation.
+            error (StepError): The error the operation failed with.
+
+        Returns:
+            int: The index of the step to retry from, or None if the operation shouldn't be retried.
+        """
+        names = [name for name, step in steps]
+
+        if not error.retryable or error.step not in names:
+            return None
+
+        failed = names.index(error.step)
+
+        if error.resumable and error.step in OSSBrowser.resumable_steps.get(operation, []):
+            return failed
+
+        if not self._committed(operation, steps, error):
+            return 0 # Start over
+
+        return None
+
+    def _committed(self, operation:str, steps:list, error:StepError):
+        """
+        Returns whether an operation failed at or after its step in commit_steps, so its click may have reached
+        the page and the asset may have been created or listed even though the operation failed.
+
+        Args:
+            operation (str): The operation name, such as "upload".
+            steps (list): (name, callable) pairs of the whole operation.
+            error (StepError): The error the operation failed with.
+
+        Returns:
+            bool: True if the operation must not be started over.
+        """
+        names = [name for name, step in steps]
+        commit = OSSBrowser.commit_steps.get(operation)
+
+        if commit not in names or error.step not in names:
+            return False
+
+        return names.index(error.step) >= names.index(commit)
+
+    def upload_asset(self, asset_options:AssetOptions, create_link:str = "https://opensea.io/asset/create?enable_supply=true", batch_attributes:bool = True, fast_fill:bool = True, retries:int = 1):
+        """
+        Upload a given asset to opensea.io.
+
+        Args:
+            asset_options (AssetOptions): The asset object to upload.
+            create_link (str, optional): The URL to use to upload. Use this for uploading to a collection. Defaults to "https://opensea.io/asset/create?enable_supply=true".
+            batch_attributes (bool, optional): Whether to enter properties, levels and stats with a few scripts instead of typing each field. Defaults to True.
+            fast_fill (bool, optional): Whether to set the name, external link, description and unlockable content with a script
+                instead of typing them one key at a time. Fields the page rejects are typed instead. Defaults to True.
+            retries (int, optional): How many times to retry after a transient failure. Retries resume from the failed
+                step on the same page when that is safe, instead of starting over. Defaults to 1.
+
+        Errors are not raised. The StepError the upload failed with, such as ValidationError if asset_options is of
+        the wrong type or is missing required fields, is stored in last_error, with the step that failed.
+
+        Returns:
+            Boolean: False if the asset was not uploaded.
+            str: The URL of the asset if it was uploaded.
+        """
+
+        try: # Wrap the whole thing in a try/except block to safely return False if errors occur
+            if not isinstance(asset_options, AssetOptions):
+                raise ValidationError("Asset options must be an instance of AssetOptions")
+
+            self._before_operation()
+            return self._run_operation("upload", self._upload_steps(asset_options, create_link, batch_attributes, fast_fill), retries, asset=asset_options.get_name())
 
         except Exception as e:
             print("Error:", e)
+            self.last_error = e
             return False
 
-    def sell_asset(self, asset_link:str, price:float, start_date:datetime = None, end_date:datetime = None):
+    def _sell_steps(self, asset_link:str, price:float, start_date:datetime = None, end_date:datetime = None):
         """
-        Sell an uploaded asset from the given URL.
+        Returns the steps of selling an asset, in order.
 
         Args:
             asset_link (str): The URL of the asset to sell.
@@ -254,115 +734,394 @@ class OSSBrowser:
             end_date (datetime, optional): The end date of the sale.
 
         Returns:
-            True if the asset was sold successfully, False otherwise.
+            list: (name, callable) pairs. The last step returns True once the asset is listed.
         """
-        try:
-            sell_link = asset_link
+        sell_link = asset_link
 
-            if asset_link.endswith("/"):
-                sell_link += "sell"
-            elif asset_link.endswith("/sell"):
-                pass
-            else:
-                sell_link += "/sell"
+        if asset_link.endswith("/"):
+            sell_link += "sell"
+        elif asset_link.endswith("/sell"):
+            pass
+        else:
+            sell_link += "/sell"
 
-            self.driver.get(sell_link) # Open the asset's sell page in the browser
+        windows = {} # Window handles shared between the signing steps
 
-            self._find_element_timeout(By.CSS_SELECTOR, "input[name='price']").send_keys(str(price)) # Set the price
+        steps = [("navigation", lambda: self._open_page(sell_link))] # Open the asset's sell page in the browser
+        steps.append(("price", lambda: self._use("price", lambda price_field: price_field.send_keys(str(price))))) # Set the price
 
-            if start_date is not None and end_date is not None: # If there are start and end dates, set them
-                self._find_element_timeout(By.CSS_SELECTOR, "button[id='duration']").click() # Click the duration button
+        if start_date is not None and end_date is not None: # If there are start and end dates, set them
+            steps.append(("duration", lambda: self._enter_duration(start_date, end_date)))
 
-                date_inputs = self._find_elements_timeout(By.CSS_SELECTOR, "input[type='date']") # Get the date inputs
-                start_date_field = date_inputs[0]
-                end_date_field = date_inputs[1]
+        steps.append(("submit", lambda: self._use("submit", lambda button: button.click()))) # Click the sell button
+        steps.append(("sign_window", lambda: windows.update(self._open_sign_window())))
+        steps.append(("sign", lambda: self._sign(windows["sign"], windows["main"], windows["clicked"])))
+        steps.append(("confirmation", self._await_listed))
+        return steps
 
-                start_date_field.click() # Enter the start date
-                start_date_field.send_keys(str(start_date.month).zfill(2))
-                start_date_field.send_keys(str(start_date.day).zfill(2))
+    def _enter_duration(self, start_date:datetime, end_date:datetime):
+        """
+        Enter the start and end of a sale in the duration box.
 
-                end_date_field.click() # Enter the end date
-                end_date_field.send_keys(str(end_date.month).zfill(2))
-                end_date_field.send_keys(str(end_date.day).zfill(2))
+        Args:
+            start_date (datetime): The start date of the sale.
+            end_date (datetime): The end date of the sale.
+        """
+        self._use("duration", lambda button: button.click()) # Click the duration button
 
-                start_time_field = self._find_element_timeout(By.CSS_SELECTOR, "input[id='start-time']") # Get the time fields
-                end_time_field = self._find_element_timeout(By.CSS_SELECTOR, "input[id='end-time']")
+        date_selector = self.selectors.get("date_inputs")
+        date_inputs = self._find_elements_timeout(date_selector.by, date_selector.value, min_count=2) # Get the date inputs
+        start_date_field = date_inputs[0]
+        end_date_field = date_inputs[1]
 
-                start_time_field.click() # Enter the start time
+        start_date_field.click() # Enter the start date
+        start_date_field.send_keys(str(start_date.month).zfill(2))
+        start_date_field.send_keys(str(start_date.day).zfill(2))
 
-                start_hour = start_date.hour # The datetime hour is not how OpenSea interprets the hour, so we need to convert it
+        end_date_field.click() # Enter the end date
+        end_date_field.send_keys(str(end_date.month).zfill(2))
+        end_date_field.send_keys(str(end_date.day).zfill(2))
 
-                if start_hour == 0: # If the hour is 0, it is 12 AM
-                    start_hour = 12
-                elif start_hour > 12: # If the hour is greater than 12, it is PM
-                    start_hour -= 12
+        start_time_field = self._find("start_time") # Get the time fields
+        end_time_field = self._find("end_time")
 
-                start_time_field.send_keys(str(start_hour).zfill(2))
-                start_time_field.send_keys(str(start_date.minute).zfill(2))
+        start_time_field.click() # Enter the start time
 
-                if start_date.hour < 12: # Enter AM/PM
-                    start_time_field.send_keys("a")
-                else:
-                    start_time_field.send_keys("p")
+        start_hour = start_date.hour # The datetime hour is not how OpenSea interprets the hour, so we need to convert it
 
-                end_time_field.click() # Enter the end time
+        if start_hour == 0: # If the hour is 0, it is 12 AM
+            start_hour = 12
+        elif start_hour > 12: # If the hour is greater than 12, it is PM
+            start_hour -= 12
 
-                end_hour = end_date.hour # The datetime hour is not how OpenSea interprets the hour, so we need to convert it
+        start_time_field.send_keys(str(start_hour).zfill(2))
+        start_time_field.send_keys(str(start_date.minute).zfill(2))
 
-                if end_date.hour == 0: # If the hour is 0, it is 12 AM
-                    end_hour = 12
-                elif end_date.hour > 12: # If the hour is greater than 12, it is PM
-                    end_hour -= 12
+        if start_date.hour < 12: # Enter AM/PM
+            start_time_field.send_keys("a")
+        else:
+            start_time_field.send_keys("p")
 
-                end_time_field.send_keys(str(end_hour).zfill(2))
-                end_time_field.send_keys(str(end_date.minute).zfill(2))
+        end_time_field.click() # Enter the end time
 
-                if end_date.hour < 12: # Enter AM/PM
-                    end_time_field.send_keys("a")
-                else:
-                    end_time_field.send_keys("p")
+        end_hour = end_date.hour # The datetime hour is not how OpenSea interprets the hour, so we need to convert it
 
-                self._find_element_timeout(By.CSS_SELECTOR, "input[name='price']").click() # Click the price field to escape the duration box
+        if end_date.hour == 0: # If the hour is 0, it is 12 AM
+            end_hour = 12
+        elif end_date.hour > 12: # If the hour is greater than 12, it is PM
+            end_hour -= 12
 
-            self._find_element_timeout(By.CSS_SELECTOR, "button[type='submit']").click() # Click the sell button
+        end_time_field.send_keys(str(end_hour).zfill(2))
+        end_time_field.send_keys(str(end_date.minute).zfill(2))
 
-            before_windows = self.driver.window_handles # Get existing window handles
-            main_window = self.driver.current_window_handle # The main window handle
+        if end_date.hour < 12: # Enter AM/PM
+            end_time_field.send_keys("a")
+        else:
+            end_time_field.send_keys("p")
 
-            self._find_element_content_timeout(By.CSS_SELECTOR, "button[type='button']", "Sign").click() # Click the sign button
+        self._use("price", lambda price_field: price_field.click()) # Click the price field to escape the duration box
 
-            sign_window = None # The sign window handle. A new window is opened by MetaMask for signing the transaction
-            loop_count = 0
+    def _open_sign_window(self, timeout:float = 7.5):
+        """
+        Click the sign button on the sell page and find the window MetaMask opens for signing.
 
-            while sign_window is None and loop_count < 15:
-                time.sleep(0.5)
-                loop_count += 1
+        Args:
+            timeout (float, optional): How long to wait for the window. Defaults to 7.5.
 
-                after_windows = self.driver.window_handles
+        Raises:
+            ElementTimeoutError: If the sign window doesn't open.
 
-                for window in after_windows: # Check for a new window handle
-                    if window not in before_windows:
-                        sign_window = window
-                        break
+        Returns:
+            dict: The "main" window handle, the "sign" window handle, and "clicked", the time.perf_counter() when the sign button was clicked.
+        """
+        before_windows = set(self.driver.window_handles) # Get existing window handles
+        main_window = self.driver.current_window_handle # The main window handle
 
-            if sign_window is None:
-                raise Exception("Failed to find transaction sign window") # If the sign window was not found, raise an exception
+        self._use("sign", lambda button: button.click()) # Click the sign button
+        clicked = time.perf_counter()
 
-            self.driver.switch_to.window(sign_window) # Focus on the sign window
+        def new_window(): # A new window is opened by MetaMask for signing the transaction
+            for window in self.driver.window_handles:
+                if window not in before_windows:
+                    return window
 
-            self._find_element_timeout(By.CSS_SELECTOR, "button[data-testid='request-signature__sign']").click() # Click the sign button
+            return None
 
-            self.driver.switch_to.window(main_window) # Focus on the main window
+        sign_window = self.waiter.until(new_window, timeout, "sign window", error_message="Failed to find transaction sign window")
+        return {"main": main_window, "sign": sign_window, "clicked": clicked}
 
-            if self._find_element_content_timeout(By.CSS_SELECTOR, "h4", "Your NFT is listed!", timeout=15) is not None: # Check if the asset was sold successfully
-                return True
-            else:
-                raise Exception("Failed to sell asset")
+    def _sign(self, sign_window:str, main_window:str, clicked:float = None):
+        """
+        Sign the listing in the MetaMask window, then return to the main window.
+        The locator that found the sign button is tried first next time.
+
+        Args:
+            sign_window (str): The handle of the sign window.
+            main_window (str): The handle of the window with the sell page.
+            clicked (float, optional): The time.perf_counter() when signing was requested, to report the sign latency. Defaults to None.
+
+        Raises:
+            SignRejectedError: If the sign window closes before it is signed.
+            ElementTimeoutError: If the sign button isn't found.
+        """
+        locators = [self._sign_locator] + [locator for locator in OSSBrowser.sign_button_locators if locator != self._sign_locator]
+
+        def sign_button():
+            for locator in locators:
+                buttons = self.driver.find_elements(*locator)
+
+                if len(buttons) > 0:
+                    self._sign_locator = locator # Remember which locator works for this MetaMask version
+                    return buttons[0]
+
+            return None
+
+        self._switch_window(sign_window) # Focus on the sign window
+
+        try:
+            try:
+                self.waiter.until(sign_button, 7, "sign button").click() # Click the sign button
+            except NoSuchWindowException:
+                raise SignRejectedError("Sign window closed before signing") # Rejected, or closed by the extension
+
+            if clicked is not None:
+                self.last_sign_latency = time.perf_counter() - clicked
+                self.tracer.record(SpanRecord("sell.sign_latency", time.time() - self.last_sign_latency, self.last_sign_latency, True, {}))
+        finally:
+            self._switch_window(main_window) # Focus on the main window, even if signing failed, so later operations don't run in the popup
+
+    def _await_listed(self, timeout:float = 15):
+        """
+        Wait for the message shown once an asset is listed, returning early if the page shows a known rejection.
+
+        Args:
+            timeout (float, optional): How long to wait for the message. Defaults to 15.
+
+        Raises:
+            SignRejectedError: If the listing was rejected.
+            ConfirmationMissingError: If the message doesn't appear.
+
+        Returns:
+            bool: True once the asset is listed.
+        """
+        try:
+            state = self.waiter.until(lambda: self.driver.execute_script(Scripts.LISTING_STATE, "Your NFT is listed!", OSSBrowser.rejection_texts), timeout, "listed", error_message="Failed to sell asset")
+        except ElementTimeoutError as e:
+            raise ConfirmationMissingError(str(e))
+
+        if state != "listed":
+            raise SignRejectedError("Listing rejected: " + state)
+
+        return True
+
+    def sell_asset(self, asset_link:str, price:float, start_date:datetime = None, end_date:datetime = None, retries:int = 1):
+        """
+        Sell an uploaded asset from the given URL. The StepError a sale failed with is stored in last_error.
+
+        Args:
+            asset_link (str): The URL of the asset to sell.
+            price (float): The price to sell the asset for.
+            start_date (datetime, optional): The start date of the sale.
+            end_date (datetime, optional): The end date of the sale.
+            retries (int, optional): How many times to retry after a transient failure, from the failed step when that is safe. Defaults to 1.
+
+        Returns:
+            True if the asset was sold successfully, False otherwise.
+        """
+        try:
+            self._before_operation()
+            return self._run_operation("sell", self._sell_steps(asset_link, price, start_date, end_date), retries, asset=asset_link)
 
         except Exception as e:
             print("Error:", e)
+            self.last_error = e
             return False
 
+    def upload_assets(self, assets, create_link:str = "https://opensea.io/asset/create?enable_supply=true", journal = None, cache = None):
+        """
+        Upload many assets one after another. If a journal is given, assets it shows were already uploaded
+        are skipped, so a crashed batch can be resumed by running it again with the same journal.
+        If a cache is given, assets uploaded in any earlier batch are skipped too.
+
+        Args:
+            assets (iterable): The AssetOptions to upload.
+            create_link (str, optional): The URL to use to upload. Defaults to "https://opensea.io/asset/create?enable_supply=true".
+            journal (UploadJournal, optional): The journal recording the batch's progress. Defaults to None.
+            cache (UploadCache, optional): The cache of assets already uploaded. Defaults to None.
+
+        Yields:
+            tuple: The AssetOptions and the upload result, False or the URL of the asset.
+        """
+        for asset_options in assets:
+            if cache is not None:
+                yield asset_options, cache.upload(self, asset_options, create_link, journal)
+            elif journal is not None:
+                yield asset_options, journal.upload(self, asset_options, create_link)
+            else:
+                yield asset_options, self.upload_asset(asset_options, create_link)
+
+    def upload_and_sell_assets(self, assets, price:float, start_date:datetime = None, end_date:datetime = None, create_link:str = "https://opensea.io/asset/create?enable_supply=true", journal = None, cache = None, retries:int = 1):
+        """
+        Upload and list many assets, overlapping the waits of one with the work of another using two tabs.
+        Once asset N's form is submitted in the upload tab, asset N - 1 is listed and signed in the sell tab while
+        OpenSea creates N. Then N's creation is confirmed, and by then N - 1's listing has had time to go through,
+        so its confirmation is collected before N + 1's form is started.
+        If a journal or cache is given, listed assets are skipped and uploaded ones are only listed.
+        If the browser has a recycler, Chrome is relaunched between assets once the asset being listed is finished.
+        Uploads and sales are paced by an attached scheduler and retried like upload_asset and sell_asset,
+        including their confirmations, which resume on the same page.
+
+        Args:
+            assets (iterable): The AssetOptions to upload and list.
+            price (float): The price to sell each asset for.
+            start_date (datetime, optional): The start date of the sales.
+            end_date (datetime, optional): The end date of the sales.
+            create_link (str, optional): The URL to use to upload. Defaults to "https://opensea.io/asset/create?enable_supply=true".
+            journal (UploadJournal, optional): The journal recording the batch's progress. Defaults to None.
+            cache (UploadCache, optional): The cache of assets uploaded in earlier batches. Defaults to None.
+            retries (int, optional): How many times to retry each part of an upload or sale after a transient failure. Defaults to 1.
+
+        Yields:
+            tuple: The AssetOptions, the upload result (False or the URL of the asset), and whether it was listed.
+        """
+        upload_tab = self.driver.current_window_handle
+        self.selectors.switch(upload_tab)
+        self.driver.switch_to.new_window("tab")
+        sell_tab = self.driver.current_window_handle
+        self.selectors.switch(sell_tab)
+
+        def attempt(part, *args, **kwargs):
+            """
+            Run a part of an operation, returning False instead of raising if it fails.
+            """
+            try:
+                return part(*args, **kwargs)
+            except Exception as e:
+                print("Error:", e)
+                self.last_error = e
+                return False
+
+        def start_sell(asset_options, url):
+            self._switch_window(sell_tab)
+            steps = self._sell_steps(url, price, start_date, end_date)
+            self._run_operation("sell", steps, retries, len(steps) - 1, asset=url) # Everything before the confirmation
+            return steps
+
+        def finish_sell(asset_options, url, steps):
+            self._switch_window(sell_tab)
+            listed = steps not in (None, False) and attempt(self._finish_operation, "sell", steps, len(steps) - 1, retries, asset=url) is True
+
+            if cache is not None and listed:
+                cache.put(asset_options, url, listed=True)
+
+            if journal is not None:
+                if listed:
+                    journal.record(asset_options, journal.LISTED, url)
+                else:
+                    journal.record_failure(self, asset_options, url)
+
+            return asset_options, url, listed
+
+        selling = None # (asset, url, sell steps) of the asset being listed
+
+        try:
+            for asset_options in assets:
+                due = self.recycler.due(self) if self.recycler is not None else None
+
+                if due is not None: # Finish listing the previous asset, then relaunch with fresh tabs
+                    if selling is not None:
+                        sell_steps = attempt(start_sell, selling[0], selling[1])
+                        yield finish_sell(selling[0], selling[1], sell_steps)
+                        selling = None
+
+                    self.recycler.recycle(self, *due)
+                    upload_tab = self.driver.current_window_handle
+                    self.selectors.switch(upload_tab)
+                    self.driver.switch_to.new_window("tab")
+                    sell_tab = self.driver.current_window_handle
+                    self.selectors.switch(sell_tab)
+
+                self.operations += 1
+                record = journal.get(asset_options) if journal is not None else None
+
+                if record is not None and record["state"] == journal.LISTED:
+                    asset_options.set_listed_link(record["url"])
+                    yield asset_options, record["url"], True
+                    continue
+
+                if journal is not None and journal.is_uncertain(asset_options, listed=True): # May have gone through, don't repeat it
+                    print("Error: Skipping", asset_options.get_name() + ",", record["reason"])
+                    yield asset_options, record["url"] or False, False
+                    continue
+
+                known = (attempt(cache.get, asset_options) or None) if cache is not None else None
+
+                if known is not None and known["listed"]:
+                    yield asset_options, known["url"], True
+                    continue
+
+                if known is not None: # Uploaded in an earlier batch, only list it
+                    creation = None
+                    url = known["url"]
+                elif journal is not None and journal.is_complete(asset_options): # Uploaded in an earlier run, only list it
+                    creation = None
+                    url = record["url"]
+                else:
+                    if journal is not None:
+                        journal.record(asset_options, journal.PENDING)
+
+                    self._switch_window(upload_tab)
+                    steps = self._upload_steps(asset_options, create_link)
+                    creation = steps if attempt(self._run_operation, "upload", steps, retries, len(steps) - 1, asset=asset_options.get_name()) is not False else False
+                    url = None
+
+                if selling is not None: # List the previous asset while this one is being created
+                    sell_steps = attempt(start_sell, selling[0], selling[1])
+                    selling = (selling[0], selling[1], sell_steps)
+
+                if creation is not None: # Collect this asset's creation
+                    self._switch_window(upload_tab)
+                    url = attempt(self._finish_operation, "upload", creation, len(creation) - 1, retries, asset=asset_options.get_name()) if creation is not False else False
+
+                    if cache is not None and url:
+                        attempt(cache.put, asset_options, url)
+
+                    if journal is not None:
+                        if url:
+                            journal.record(asset_options, journal.UPLOADED, url)
+                        else:
+                            journal.record_failure(self, asset_options)
+
+                if selling is not None:
+                    yield finish_sell(*selling)
+                    selling = None
+
+                if url:
+                    selling = (asset_options, url, None)
+                else:
+                    yield asset_options, False, False
+
+            if selling is not None: # List the last asset
+                sell_steps = attempt(start_sell, selling[0], selling[1])
+                yield finish_sell(selling[0], selling[1], sell_steps)
+        finally:
+            self._switch_window(sell_tab)
+            self.driver.close() # Close the sell tab
+            self.selectors.invalidate(sell_tab)
+            self._switch_window(upload_tab)
+
+    def is_throttled(self):
+        """
+        Check the current page for an error banner OpenSea shows when throttling, from throttle_texts.
+
+        Returns:
+            str: The banner text found, or None if there is none or the page can't be read.
+        """
+        try:
+            return self.driver.execute_script(Scripts.FIND_TEXT, OSSBrowser.throttle_texts)
+        except Exception:
+            return None
+
     def get_session_data(self):
         """
         Returns the session data for this OSSBrowser instance. Used for reconnecting instead
@@ -371,7 +1130,7 @@ class OSSBrowser:
         Returns:
             dict: The session data, containing the command_executor_url and session_id.
         """
-        return {"command_executor_url": self.driver.command_executor._url, "session_id": self.driver.session_id}
+        return {"command_executor_url": self.driver.command_executor.client_config.remote_server_addr, "session_id": self.driver.session_id}
 
     def close(self):
         """
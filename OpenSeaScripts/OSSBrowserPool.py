@@ -0,0 +1,276 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import collections, os, queue, threading
+
+class OSSBrowserPool:
+    def __init__(self, size:int = 2, profile_root:str = "OSSProfiles", headless:bool = False, max_concurrency:int = None, browser_factory = None, browser_options:dict = None, scheduler = None):
+        """
+        Create a pool of OSSBrowser sessions for uploading and selling assets in parallel.
+        Each session uses its own Chrome profile directory, profile_root/worker_<n>, so each can stay signed in
+        to its own MetaMask wallet. Sessions are opened the first time they are needed.
+
+        Args:
+            size (int, optional): The number of browser sessions. Defaults to 2.
+            profile_root (str, optional): The directory holding each session's profile directory. Defaults to "OSSProfiles".
+            headless (bool, optional): Wether to operate the browsers in headless mode or not. Defaults to False.
+            max_concurrency (int, optional): The most operations allowed to run at once across all sessions.
+                Defaults to the smaller of size and the number of CPU cores.
+            browser_factory (callable, optional): Called with a worker index to create its browser, instead of opening
+                an OSSBrowser with that worker's profile. Defaults to None.
+            browser_options (dict, optional): Extra keyword arguments for each OSSBrowser, such as {"offline": True}.
+                Browsers don't open a start page unless a start_url is given here. Defaults to None.
+            scheduler (RateScheduler, optional): Paces each browser's uploads and sales, backing off when OpenSea throttles.
+                Its concurrency limit applies on top of max_concurrency. Defaults to None.
+
+        Raises:
+            ValueError: If size or max_concurrency is less than 1.
+        """
+        if not isinstance(size, int) or size < 1:
+            raise ValueError("Size must be a positive integer")
+
+        if max_concurrency is None:
+            max_concurrency = min(size, os.cpu_count() or 1)
+        elif not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise ValueError("Max concurrency must be a positive integer")
+
+        self.size = size
+        self.profile_root = profile_root
+        self.headless = headless
+        self.max_concurrency = max_concurrency
+        self.browser_factory = browser_factory
+        self.browser_options = {"start_url": None} # Every operation opens its own page, so skip the home page
+        self.browser_options.update(browser_options or {})
+        self.browsers = [] # Every browser opened by this pool
+        self.scheduler = scheduler
+
+        self._free = queue.Queue() # Browsers not currently running an operation
+        self._lock = threading.Lock()
+        self._launched = 0 # Browsers opened or opening
+        self._slots = threading.BoundedSemaphore(max_concurrency) # The global concurrency cap
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="OSSBrowserPool")
+
+    def _launch(self, index:int):
+        """
+        Open the browser for the worker with the given index.
+
+        Args:
+            index (int): The worker index, from 0 to size - 1.
+
+        Returns:
+            OSSBrowser: The new browser.
+        """
+        if self.browser_factory is not None:
+            return self.browser_factory(index)
+
+        from OpenSeaScripts.OSSBrowser import OSSBrowser # Imported here so building a pool doesn't need Selenium
+
+        profile_dir = os.path.abspath(os.path.join(self.profile_root, "worker_" + str(index)))
+        os.makedirs(profile_dir, exist_ok=True)
+        return OSSBrowser(headless=self.headless, user_data_dir=profile_dir, **self.browser_options)
+
+    def _open(self):
+        """
+        Open a new browser for the next unused worker index.
+
+        Returns:
+            OSSBrowser: The new browser, or None if the pool is already full.
+        """
+        with self._lock:
+            index = self._launched
+
+            if index >= self.size:
+                return None
+
+            self._launched += 1 # Reserve the index while the browser opens
+
+        try:
+            browser = self._launch(index)
+        except Exception:
+            with self._lock:
+                self._launched -= 1 # Let a later checkout try again
+
+            raise
+
+        if self.scheduler is not None:
+            self.scheduler.attach(browser)
+
+        with self._lock:
+            self.browsers.append(browser)
+
+        return browser
+
+    def _checkout(self):
+        """
+        Take a free browser, opening a new one if none are free and the pool is not full.
+
+        Returns:
+            OSSBrowser: A browser reserved for the caller until it is returned with _checkin.
+        """
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+
+        browser = self._open()
+
+        if browser is None:
+            return self._free.get() # Wait for another operation to finish
+
+        return browser
+
+    def _checkin(self, browser):
+        """
+        Return a browser taken with _checkout to the pool.
+
+        Args:
+            browser (OSSBrowser): The browser to return.
+        """
+        self._free.put(browser)
+
+    def _run_one(self, func, item):
+        """
+        Run func on a free browser while holding one of the concurrency slots.
+
+        Args:
+            func (callable): Called with a browser and item.
+            item: The work item.
+
+        Returns:
+            The value returned by func.
+        """
+        with self._slots:
+            browser = self._checkout()
+
+            try:
+                return func(browser, item) # An attached scheduler paces the browser's own uploads and sales
+            finally:
+                self._checkin(browser)
+
+    def warm(self, url:str = None):
+        """
+        Open every browser in the pool now, in parallel, instead of when each is first needed,
+        so the first operations of a batch don't wait for Chrome to start.
+
+        Args:
+            url (str, optional): A page for every browser to load, such as the create page, so it is cached. Defaults to None.
+
+        Returns:
+            int: The number of browsers in the pool.
+        """
+        def start(index):
+            browser = self._open()
+
+            if browser is None:
+                return
+
+            if url is not None:
+                browser.driver.get(url)
+
+            self._checkin(browser)
+
+        with ThreadPoolExecutor(max_workers=self.size) as starter:
+            list(starter.map(start, range(self.size - self._launched)))
+
+        return len(self.browsers)
+
+    def run(self, func, items, ordered:bool = True):
+        """
+        Run func on each item using the pool's browsers, yielding results as a generator.
+        Items are pulled from the iterable only as workers become free, so large batches aren't held in memory.
+
+        Args:
+            func (callable): Called with a browser and an item, such as lambda browser, asset: browser.upload_asset(asset).
+            items (iterable): The work items.
+            ordered (bool, optional): Whether to yield results in the order of items, or as they complete. Defaults to True.
+
+        Yields:
+            tuple: The item and the value func returned for it.
+        """
+        items = iter(items)
+        pending = collections.deque() # (item, future) pairs in submission order
+        limit = self.max_concurrency * 2 # Keep workers busy without reading the whole iterable
+
+        def fill():
+            while len(pending) < limit:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    return
+
+                pending.append((item, self._executor.submit(self._run_one, func, item)))
+
+        fill()
+
+        while pending:
+            if ordered:
+                item, future = pending.popleft()
+                result = future.result()
+            else:
+                wait([future for item, future in pending], return_when=FIRST_COMPLETED)
+                item, future = next(pair for pair in pending if pair[1].done())
+                pending.remove((item, future))
+                result = future.result()
+
+            fill()
+            yield item, result
+
+    def upload_assets(self, assets, create_link:str = "https://opensea.io/asset/create?enable_supply=true", ordered:bool = True, journal = None, cache = None):
+        """
+        Upload many assets using the pool's browsers. If a journal is given, assets it shows were already
+        uploaded are skipped, so a crashed batch can be resumed by running it again with the same journal.
+        If a cache is given, assets uploaded in any earlier batch are skipped too.
+
+        Args:
+            assets (iterable): The AssetOptions to upload.
+            create_link (str, optional): The URL to use to upload. Defaults to "https://opensea.io/asset/create?enable_supply=true".
+            ordered (bool, optional): Whether to yield results in the order of assets, or as they complete. Defaults to True.
+            journal (UploadJournal, optional): The journal recording the batch's progress. Defaults to None.
+            cache (UploadCache, optional): The cache of assets already uploaded. Defaults to None.
+
+        Yields:
+            tuple: The AssetOptions and the upload_asset result, False or the URL of the asset.
+        """
+        if cache is not None:
+            return self.run(lambda browser, asset: cache.upload(browser, asset, create_link, journal), assets, ordered)
+
+        if journal is not None:
+            return self.run(lambda browser, asset: journal.upload(browser, asset, create_link), assets, ordered)
+
+        return self.run(lambda browser, asset: browser.upload_asset(asset, create_link), assets, ordered)
+
+    def sell_assets(self, listings, ordered:bool = True):
+        """
+        Sell many uploaded assets using the pool's browsers.
+
+        Args:
+            listings (iterable): Tuples of sell_asset arguments: (asset_link, price) or (asset_link, price, start_date, end_date).
+            ordered (bool, optional): Whether to yield results in the order of listings, or as they complete. Defaults to True.
+
+        Yields:
+            tuple: The listing and the sell_asset result, True or False.
+        """
+        return self.run(lambda browser, listing: browser.sell_asset(*listing), listings, ordered)
+
+    def cancel(self):
+        """
+        Make every wait of the pool's browsers fail immediately, so operations still running stop at their next wait
+        instead of finishing, such as when a batch is interrupted. The browsers can't wait again until their waiters are reset.
+        """
+        for browser in list(self.browsers):
+            browser.waiter.cancel()
+
+    def close(self):
+        """
+        Closes every browser in the pool. Operations not started yet are dropped, and running ones are waited for.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+        for browser in self.browsers:
+            browser.close()
+
+        self.browsers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
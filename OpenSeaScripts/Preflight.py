@@ -0,0 +1,195 @@
+from concurrent.futures import ProcessPoolExecutor
+from OpenSeaScripts.AssetOptions import AssetOptions
+from OpenSeaScripts.ContentHash import file_hash
+import collections, os
+
+PreflightIssue = collections.namedtuple("PreflightIssue", ["asset", "problems"])
+PreflightDuplicate = collections.namedtuple("PreflightDuplicate", ["asset", "original", "media_hash"])
+
+class PreflightReport:
+    def __init__(self):
+        """
+        The result of Preflight.check: the assets worth uploading, and why the others were left out.
+        """
+        self.assets = [] # AssetOptions that passed every check, in their original order, without duplicates
+        self.rejected = [] # A PreflightIssue for each asset that failed a check
+        self.duplicates = [] # A PreflightDuplicate for each asset whose media matches an earlier asset's
+        self.hashes = {} # Media path -> content hash of every asset hashed
+        self.total_bytes = 0 # Size of the media of every accepted asset
+
+    def summary(self):
+        """
+        Returns the report as text, with one line per rejected or duplicate asset.
+
+        Returns:
+            str: The report.
+        """
+        lines = [str(len(self.assets)) + " assets ready (" + str(round(self.total_bytes / 1024 / 1024, 1)) + " MiB), " +
+            str(len(self.rejected)) + " rejected, " + str(len(self.duplicates)) + " duplicates"]
+
+        for issue in self.rejected:
+            lines.append("Rejected " + issue.asset.get_name() + ": " + "; ".join(issue.problems))
+
+        for duplicate in self.duplicates:
+            lines.append("Duplicate " + duplicate.asset.get_name() + ": same media as " + duplicate.original.get_name())
+
+        return "\n".join(lines)
+
+class Preflight:
+    media_extensions = ["jpg", "jpeg", "png", "gif", "svg", "mp4", "webm", "mp3", "wav", "ogg", "glb", "gltf"] # Media types OpenSea accepts
+    preview_image_extensions = ["jpg", "jpeg", "png", "gif"] # Image types OpenSea accepts as a preview
+    max_media_size = 100 * 1024 * 1024 # OpenSea's upload limit, 100 MB
+
+    def __init__(self, max_size:int = None, extensions:list = None, workers:int = None, dedupe:bool = True):
+        """
+        Create a pre-flight check, which finds assets that would fail to upload before any browser work is done.
+        Files are checked and hashed in a process pool, so large batches of large files are checked quickly.
+
+        Args:
+            max_size (int, optional): The largest media file allowed, in bytes. Defaults to Preflight.max_media_size.
+            extensions (list, optional): The media file extensions allowed. Defaults to Preflight.media_extensions.
+            workers (int, optional): The number of worker processes, or 0 to check in this process. Defaults to the number of CPU cores.
+            dedupe (bool, optional): Whether to leave out assets whose media matches an earlier asset's. Defaults to True.
+        """
+        self.max_size = max_size if max_size is not None else Preflight.max_media_size
+        self.extensions = [extension.lower() for extension in (extensions or Preflight.media_extensions)]
+        self.workers = workers
+        self.dedupe = dedupe
+
+    def _check_fields(self, asset_options:AssetOptions):
+        """
+        Check the fields of an asset that don't need the file system.
+
+        Args:
+            asset_options (AssetOptions): The asset to check.
+
+        Returns:
+            list: What is wrong with the asset, empty if nothing is.
+        """
+        if not isinstance(asset_options, AssetOptions):
+            return ["Not an instance of AssetOptions"]
+
+        problems = []
+
+        if not isinstance(asset_options.get_name(), str) or asset_options.get_name() == "":
+            problems.append("Name must be a non-empty string")
+
+        if not isinstance(asset_options.get_asset_path(), str) or asset_options.get_asset_path() == "":
+            problems.append("Asset path must be a non-empty string")
+
+        if not isinstance(asset_options.get_supply(), int) or asset_options.get_supply() < 1:
+            problems.append("Supply must be a positive integer")
+
+        return problems
+
+    def check(self, assets):
+        """
+        Check a batch of assets: that their media and previews exist, are allowed types and sizes, and that
+        assets that need a preview have one. Media is hashed to find duplicates.
+
+        Args:
+            assets (iterable): The AssetOptions to check.
+
+        Returns:
+            PreflightReport: The assets worth uploading, and the problems found.
+        """
+        report = PreflightReport()
+        assets = list(assets)
+        checked = [] # Assets whose files need checking
+        jobs = []
+
+        for asset_options in assets:
+            problems = self._check_fields(asset_options)
+
+            if len(problems) > 0:
+                report.rejected.append(PreflightIssue(asset_options, problems))
+            else:
+                checked.append(asset_options)
+                jobs.append((asset_options.get_asset_path(), asset_options.get_preview_path(), self.max_size, self.extensions))
+
+        executor = None
+
+        if self.workers == 0 or len(jobs) < 2: # Not worth starting processes
+            results = map(_inspect_files, jobs)
+        else:
+            workers = self.workers or os.cpu_count() or 1
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(_inspect_files, jobs, chunksize=max(len(jobs) // (workers * 4), 1))
+
+        try:
+            originals = {} # Media hash -> first asset with that media
+
+            for asset_options, (problems, media_hash, size) in zip(checked, results):
+                if media_hash is not None:
+                    report.hashes[asset_options.get_asset_path()] = media_hash
+
+                if len(problems) > 0:
+                    report.rejected.append(PreflightIssue(asset_options, problems))
+                elif self.dedupe and media_hash in originals:
+                    report.duplicates.append(PreflightDuplicate(asset_options, originals[media_hash], media_hash))
+                else:
+                    originals[media_hash] = asset_options
+                    report.assets.append(asset_options)
+                    report.total_bytes += size
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return report
+
+def _inspect_files(job:tuple):
+    """
+    Check and hash the files of one asset. Run in a worker process.
+
+    Args:
+        job (tuple): The asset path, the preview path, the largest media size allowed, and the media extensions allowed.
+
+    Returns:
+        tuple: The list of problems found, the media hash or None if it wasn't hashed, and the media size in bytes.
+    """
+    asset_path, preview_path, max_size, extensions = job
+    problems = []
+    media_hash = None
+    size = 0
+    extension = os.path.splitext(asset_path)[1][1:].lower()
+
+    if extension not in extensions:
+        problems.append("Unsupported media type ." + extension)
+
+    try:
+        size = os.path.getsize(asset_path)
+
+        if size == 0:
+            problems.append("Media file is empty")
+        elif size > max_size:
+            problems.append("Media file is " + str(size) + " bytes, over the " + str(max_size) + " byte limit")
+        elif len(problems) == 0: # Only hash media that could be uploaded
+            media_hash = file_hash(asset_path)
+    except OSError as e:
+        problems.append("Can't read media file: " + (e.strerror or str(e)))
+
+    if AssetOptions.needs_preview(extension):
+        if preview_path == "":
+            problems.append("Multimedia files need a preview image")
+        elif os.path.splitext(preview_path)[1][1:].lower() not in Preflight.preview_image_extensions:
+            problems.append("Preview must be an image")
+        elif not os.path.isfile(preview_path):
+            problems.append("Preview file not found")
+
+    return problems, media_hash, size
+
+def preflight(assets, max_size:int = None, extensions:list = None, workers:int = None, dedupe:bool = True):
+    """
+    Shortcut for Preflight(...).check(assets).
+
+    Args:
+        assets (iterable): The AssetOptions to check.
+        max_size (int, optional): See Preflight.
+        extensions (list, optional): See Preflight.
+        workers (int, optional): See Preflight.
+        dedupe (bool, optional): See Preflight.
+
+    Returns:
+        PreflightReport: The assets worth uploading, and the problems found.
+    """
+    return Preflight(max_size, extensions, workers, dedupe).check(assets)
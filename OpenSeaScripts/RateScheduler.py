@@ -0,0 +1,273 @@
+import collections, threading, time
+
+class RateScheduler:
+    def __init__(self, initial_rate:float = 6, min_rate:float = 0.5, max_rate:float = 60, increase:float = 0.5, decrease:float = 0.5,
+        max_concurrency:int = 4, cooldown:float = 60, slow_threshold:float = 10, timeout_threshold:int = 3, failure_threshold:int = 3):
+        """
+        Create a scheduler that paces uploads and sales to stay near the fastest rate the site allows, using
+        additive-increase/multiplicative-decrease (AIMD). Each success raises the rate a little, and every
+        throttling signal cuts the rate and the concurrency limit, then holds them for a cooldown.
+        Throttling signals are error banners on the page, slow confirmations, repeated element wait timeouts,
+        and repeated failures.
+
+        Args:
+            initial_rate (float, optional): Operations started per minute at first. Defaults to 6.
+            min_rate (float, optional): The lowest rate. Defaults to 0.5.
+            max_rate (float, optional): The highest rate. Defaults to 60.
+            increase (float, optional): Operations per minute added after each success. Defaults to 0.5.
+            decrease (float, optional): The factor the rate and concurrency limit are multiplied by when throttled. Defaults to 0.5.
+            max_concurrency (int, optional): The most operations running at once. The limit starts here. Defaults to 4.
+            cooldown (float, optional): Seconds after a backoff before the rate increases again. Defaults to 60.
+            slow_threshold (float, optional): A confirmation taking more seconds than this is a throttling signal. Defaults to 10.
+            timeout_threshold (int, optional): This many element wait timeouts in a row is a throttling signal. Defaults to 3.
+            failure_threshold (int, optional): This many failed operations in a row is a throttling signal. Defaults to 3.
+
+        Raises:
+            ValueError: If initial_rate isn't between min_rate and max_rate.
+        """
+        if not min_rate <= initial_rate <= max_rate:
+            raise ValueError("initial_rate must be between min_rate (" + str(min_rate) + ") and max_rate (" + str(max_rate) + ")")
+
+        self.rate = float(initial_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.max_concurrency = max_concurrency
+        self.concurrency_limit = max_concurrency
+        self.cooldown = cooldown
+        self.slow_threshold = slow_threshold
+        self.timeout_threshold = timeout_threshold
+        self.failure_threshold = failure_threshold
+
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self.backoffs = 0
+        self.last_reason = "" # Why the last backoff happened
+
+        self._completions = collections.deque() # time.monotonic() of each completion in the last minute
+        self._next_start = 0.0
+        self._backoff_until = 0.0
+        self._timeouts_in_row = 0
+        self._failures_in_row = 0
+        self._successes_in_row = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Wait until another operation may start, under both the rate and the concurrency limit.
+        Every acquire must be followed by a release.
+        """
+        with self._condition:
+            while True:
+                wait = self._try_start()
+
+                if wait == 0:
+                    return
+
+                self._condition.wait(wait)
+
+    def try_acquire(self):
+        """
+        Start another operation if the rate and concurrency limit allow it now, without waiting, such as from asyncio.
+        A successful try_acquire must be followed by a release.
+
+        Returns:
+            float: 0 if the operation may start, the seconds until the rate allows it, or None if it must wait for a release.
+        """
+        with self._condition:
+            return self._try_start()
+
+    def _try_start(self):
+        """
+        Count another operation as started if the limits allow it now. Must be called while holding self._condition.
+
+        Returns:
+            float: 0 if it started, the seconds until the rate allows it, or None if the concurrency limit is full.
+        """
+        now = time.monotonic()
+        rate_wait = self._next_start - now
+
+        if self.in_flight >= self.concurrency_limit:
+            return None
+
+        if rate_wait > 0:
+            return rate_wait
+
+        self.in_flight += 1
+        self._next_start = now + 60 / self.rate
+        return 0
+
+    def release(self, ok:bool, throttled:bool = False, reason:str = ""):
+        """
+        Report that an operation started with acquire has finished, and adjust the rate.
+
+        Args:
+            ok (bool): Whether the operation succeeded.
+            throttled (bool, optional): Whether the site showed it was throttling. Defaults to False.
+            reason (str, optional): What showed the throttling. Defaults to "".
+        """
+        with self._condition:
+            now = time.monotonic()
+            self.in_flight -= 1
+
+            if ok:
+                self.successes += 1
+                self._failures_in_row = 0
+                self._successes_in_row += 1
+                self._completions.append(now)
+                self._trim(now)
+
+                if now >= self._backoff_until: # Additive increase
+                    self.rate = min(self.rate + self.increase, self.max_rate)
+
+                    if self._successes_in_row >= self.concurrency_limit and self.concurrency_limit < self.max_concurrency:
+                        self.concurrency_limit += 1
+                        self._successes_in_row = 0
+            else:
+                self.failures += 1
+                self._failures_in_row += 1
+                self._successes_in_row = 0
+
+            if throttled:
+                self._back_off(reason or "Throttled")
+            elif self._failures_in_row >= self.failure_threshold:
+                self._back_off(str(self._failures_in_row) + " failures in a row")
+                self._failures_in_row = 0
+
+            self._condition.notify_all()
+
+    def _trim(self, now:float):
+        """
+        Forget completions more than a minute old. Must be called while holding self._condition.
+
+        Args:
+            now (float): The current time.monotonic().
+        """
+        while len(self._completions) > 0 and self._completions[0] < now - 60:
+            self._completions.popleft()
+
+    def _back_off(self, reason:str):
+        """
+        Multiplicatively decrease the rate and concurrency limit, unless already cooling down from an earlier signal.
+        Must be called while holding self._condition.
+
+        Args:
+            reason (str): What caused the backoff.
+        """
+        now = time.monotonic()
+
+        if now < self._backoff_until:
+            return # One decrease per throttling event
+
+        self.rate = max(self.rate * self.decrease, self.min_rate)
+        self.concurrency_limit = max(int(self.concurrency_limit * self.decrease), 1)
+        self._backoff_until = now + self.cooldown
+        self._next_start = now + 60 / self.rate
+        self.backoffs += 1
+        self.last_reason = reason
+
+    def signal_throttle(self, reason:str):
+        """
+        Report a throttling signal seen outside of release, and back off.
+
+        Args:
+            reason (str): What showed the throttling.
+        """
+        with self._condition:
+            self._back_off(reason)
+            self._condition.notify_all()
+
+    def observe_span(self, span_record):
+        """
+        Tracer hook treating slow confirmations as a throttling signal.
+
+        Args:
+            span_record (SpanRecord): A finished span.
+        """
+        if span_record.name.endswith(".confirmation") and span_record.duration > self.slow_threshold:
+            self.signal_throttle("Slow " + span_record.name + " (" + str(round(span_record.duration, 1)) + "s)")
+
+    def observe_wait(self, wait_record):
+        """
+        ElementWaiter hook treating repeated wait timeouts as a throttling signal.
+
+        Args:
+            wait_record (WaitRecord): A finished wait.
+        """
+        with self._condition:
+            if wait_record.found:
+                self._timeouts_in_row = 0
+                return
+
+            self._timeouts_in_row += 1
+
+            if self._timeouts_in_row >= self.timeout_threshold:
+                self._timeouts_in_row = 0
+                self._back_off(str(self.timeout_threshold) + " element timeouts in a row")
+                self._condition.notify_all()
+
+    def attach(self, browser):
+        """
+        Pace a browser's upload_asset and sell_asset calls, and watch its tracer and element waits for throttling signals.
+
+        Args:
+            browser (OSSBrowser): The browser.
+        """
+        browser.tracer.add_hook(self.observe_span)
+        previous = browser.waiter.on_wait
+
+        def on_wait(wait_record):
+            self.observe_wait(wait_record)
+
+            if previous is not None:
+                previous(wait_record)
+
+        browser.waiter.on_wait = on_wait
+        browser.scheduler = self
+
+    def call(self, browser, operation, *args, **kwargs):
+        """
+        Run a browser operation when the scheduler allows it, and report its outcome. The operation succeeded if it
+        returns and failed if it raises, whatever it returns. A failed operation is checked for error banners
+        with browser.is_throttled(). Attached browsers already run their uploads and sales through this.
+
+        Args:
+            browser (OSSBrowser): The browser running the operation.
+            operation (callable): The operation, which raises if it fails.
+            *args: Arguments for operation.
+            **kwargs: Keyword arguments for operation.
+
+        Raises:
+            Exception: Whatever operation raised.
+
+        Returns:
+            The value returned by operation.
+        """
+        self.acquire()
+        ok = False
+
+        try:
+            result = operation(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            throttled = browser.is_throttled() if not ok else None
+            self.release(ok, throttled is not None, throttled or "")
+
+    def stats(self):
+        """
+        Returns the scheduler's current state.
+
+        Returns:
+            dict: The "rate" (operations started per minute), "concurrency_limit", "in_flight", "throughput"
+                (operations completed in the last minute), "backing_off", "backoffs", "last_reason", "successes" and "failures".
+        """
+        with self._condition:
+            now = time.monotonic()
+            self._trim(now)
+
+            return {"rate": self.rate, "concurrency_limit": self.concurrency_limit, "in_flight": self.in_flight,
+                "throughput": len(self._completions), "backing_off": now < self._backoff_until, "backoffs": self.backoffs,
+                "last_reason": self.last_reason, "successes": self.successes, "failures": self.failures}
@@ -0,0 +1,130 @@
+"""
+JavaScript snippets run in the page through driver.execute_script.
+Each one does in a single round trip what would otherwise take one WebDriver call per element.
+"""
+
+# Click the button with text arguments[1] until there are arguments[2] elements matching arguments[0].
+# arguments[3] is the CSS selector of the button, "button[type='button']" if not given.
+# Returns the number of clicks, or -1 if the button was not found.
+ADD_ROWS = """
+var selector = arguments[0], label = arguments[1], wanted = arguments[2];
+var rows = document.querySelectorAll(selector).length;
+var button = Array.from(document.querySelectorAll(arguments[3] || "button[type='button']")).find(function (b) {
+    return b.innerText.trim() === label;
+});
+
+if (!button) {
+    return -1;
+}
+
+for (var i = rows; i < wanted; i++) {
+    button.click();
+}
+
+return Math.max(wanted - rows, 0);
+"""
+
+# Set the values of many inputs or textareas. arguments[0] is a list of [selector, index, value] items.
+# Values are set through the native value setter and followed by input and change events, so
+# React picks up the change like it would from typing. Returns the positions of the items that failed.
+SET_VALUES = """
+var items = arguments[0], failed = [];
+
+items.forEach(function (item, position) {
+    var field = document.querySelectorAll(item[0])[item[1]];
+
+    if (!field) {
+        failed.push(position);
+        return;
+    }
+
+    var prototype = field instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(prototype, "value").set.call(field, item[2]);
+    field.dispatchEvent(new Event("input", {bubbles: true}));
+    field.dispatchEvent(new Event("change", {bubbles: true}));
+
+    if (field.value !== item[2]) {
+        failed.push(position);
+    }
+});
+
+return failed;
+"""
+
+# Measure the current page with the Navigation and Resource Timing APIs. Times are in milliseconds since navigation
+# started; ready is when the document was parsed, load is when every resource finished, or 0 if they haven't yet.
+PAGE_STATS = """
+var navigation = performance.getEntriesByType("navigation")[0];
+var resources = performance.getEntriesByType("resource");
+var bytes = navigation ? navigation.transferSize : 0;
+
+resources.forEach(function (resource) {
+    bytes += resource.transferSize || 0;
+});
+
+return {
+    ready: navigation ? navigation.domContentLoadedEventEnd : 0,
+    load: navigation ? navigation.loadEventEnd : 0,
+    bytes: bytes,
+    count: resources.length
+};
+"""
+
+# Read the values of many inputs or textareas. arguments[0] is a list of [selector, index] items.
+# Returns a value for each item, or null for items that were not found.
+GET_VALUES = """
+return arguments[0].map(function (item) {
+    var field = document.querySelectorAll(item[0])[item[1]];
+    return field ? field.value : null;
+});
+"""
+
+# Check the sell page for the listed message or a known rejection. arguments[0] is the listed message, and
+# arguments[1] is a list of rejection texts. Returns "listed", the rejection text found, or null.
+LISTING_STATE = """
+var headings = document.querySelectorAll("h4");
+
+for (var i = 0; i < headings.length; i++) {
+    if (headings[i].innerText === arguments[0]) {
+        return "listed";
+    }
+}
+
+var text = document.body ? document.body.innerText : "";
+
+for (var j = 0; j < arguments[1].length; j++) {
+    if (text.indexOf(arguments[1][j]) >= 0) {
+        return arguments[1][j];
+    }
+}
+
+return null;
+"""
+
+# Find the first of many texts shown anywhere on the page. arguments[0] is a list of texts, matched ignoring case.
+# Returns the text found, or null.
+FIND_TEXT = """
+var text = document.body ? document.body.innerText.toLowerCase() : "";
+
+for (var i = 0; i < arguments[0].length; i++) {
+    if (text.indexOf(arguments[0][i].toLowerCase()) >= 0) {
+        return arguments[0][i];
+    }
+}
+
+return null;
+"""
+
+# Find the first element matching the CSS selector arguments[0] whose visible text is exactly arguments[1].
+# Returns the element, or null.
+FIND_BY_TEXT = """
+var elements = document.querySelectorAll(arguments[0]);
+
+for (var i = 0; i < elements.length; i++) {
+    if ((elements[i].innerText || elements[i].textContent || "").trim() === arguments[1]) {
+        return elements[i];
+    }
+}
+
+return null;
+"""
@@ -0,0 +1,155 @@
+from selenium.webdriver.common.by import By
+import collections, threading
+
+Selector = collections.namedtuple("Selector", ["by", "value", "text"]) # text is the exact content to match, or None for any
+
+class SelectorRegistry:
+    selectors = {
+        "media": Selector(By.ID, "media", None),
+        "preview": Selector(By.NAME, "preview", None),
+        "name": Selector(By.CSS_SELECTOR, "#name", None),
+        "external_link": Selector(By.CSS_SELECTOR, "#external_link", None),
+        "description": Selector(By.CSS_SELECTOR, "#description", None),
+        "attribute_button": Selector(By.CSS_SELECTOR, "button[aria-label='{}']", None), # Format with the label, such as "Add properties"
+        "property_name": Selector(By.CSS_SELECTOR, "input[placeholder='Character']", None),
+        "property_value": Selector(By.CSS_SELECTOR, "input[placeholder='Male']", None),
+        "level_name": Selector(By.CSS_SELECTOR, "input[placeholder='Speed']", None),
+        "level_max": Selector(By.CSS_SELECTOR, "input[placeholder='Max']", None),
+        "level_value": Selector(By.CSS_SELECTOR, "input[placeholder='Min']", None),
+        "add_more": Selector(By.CSS_SELECTOR, "button[type='button']", "Add more"),
+        "save": Selector(By.CSS_SELECTOR, "button[type='button']", "Save"),
+        "unlockable_toggle": Selector(By.CSS_SELECTOR, "input[id='unlockable-content-toggle']", None),
+        "unlockable_content": Selector(By.CSS_SELECTOR, "textarea[placeholder='Enter content (access key, code to redeem, link to a file, etc.)']", None),
+        "explicit_toggle": Selector(By.CSS_SELECTOR, "input[id='explicit-content-toggle']", None),
+        "supply": Selector(By.CSS_SELECTOR, "input[id='supply']", None),
+        "chain": Selector(By.CSS_SELECTOR, "input[id='chain']", None),
+        "polygon_option": Selector(By.CSS_SELECTOR, "div[id='tippy-9']", None),
+        "create": Selector(By.CSS_SELECTOR, "button[type='button']", "Create"),
+        "created": Selector(By.CSS_SELECTOR, "h4", "You created {}!"), # Format with the asset name
+        "price": Selector(By.CSS_SELECTOR, "input[name='price']", None),
+        "duration": Selector(By.CSS_SELECTOR, "button[id='duration']", None),
+        "date_inputs": Selector(By.CSS_SELECTOR, "input[type='date']", None),
+        "start_time": Selector(By.CSS_SELECTOR, "input[id='start-time']", None),
+        "end_time": Selector(By.CSS_SELECTOR, "input[id='end-time']", None),
+        "submit": Selector(By.CSS_SELECTOR, "button[type='submit']", None),
+        "sign": Selector(By.CSS_SELECTOR, "button[type='button']", "Sign"),
+    }
+
+    def __init__(self, selectors:dict = None):
+        """
+        Create a registry of the selectors used on OpenSea's pages, which also caches the elements they find.
+        A cached element is reused for as long as its page is open, so a form doesn't look up the same element
+        again. The cache of a window is cleared when it navigates, and everything is cleared if an element goes stale.
+        Each OSSBrowser needs its own registry, since it tracks the browser's current window.
+
+        Args:
+            selectors (dict, optional): Selectors to add or replace, by name, such as after OpenSea changes a page.
+                Defaults to None.
+        """
+        self.selectors = dict(SelectorRegistry.selectors)
+        self.selectors.update(selectors or {})
+        self.window = None # The window handle elements are currently cached under
+        self.hits = 0 # Lookups answered from the cache
+        self.misses = 0 # Lookups that had to search the page
+        self._cache = {} # Window handle -> {Selector: element}
+        self._lock = threading.Lock()
+
+    def get(self, name:str, *args):
+        """
+        Returns a selector by name, formatted with args if it has placeholders.
+
+        Args:
+            name (str): The name of the selector, such as "create".
+            *args: Values for the selector's {} placeholders.
+
+        Raises:
+            KeyError: If there is no selector with that name.
+
+        Returns:
+            Selector: The selector.
+        """
+        selector = self.selectors[name]
+
+        if len(args) == 0:
+            return selector
+
+        return Selector(selector.by, selector.value.format(*args), selector.text.format(*args) if selector.text is not None else None)
+
+    def css(self, name:str, *args):
+        """
+        Returns the CSS selector of a selector by name, for use in scripts.
+
+        Args:
+            name (str): The name of the selector.
+            *args: Values for the selector's {} placeholders.
+
+        Raises:
+            ValueError: If the selector isn't a CSS selector.
+
+        Returns:
+            str: The CSS selector.
+        """
+        selector = self.get(name, *args)
+
+        if selector.by == By.ID:
+            return "#" + selector.value
+        elif selector.by == By.NAME:
+            return "[name='" + selector.value + "']"
+        elif selector.by != By.CSS_SELECTOR:
+            raise ValueError(name + " is not a CSS selector")
+
+        return selector.value
+
+    def cached(self, selector:Selector):
+        """
+        Returns the element cached for a selector in the current window.
+
+        Args:
+            selector (Selector): The selector.
+
+        Returns:
+            selenium.webdriver.remote.webelement.WebElement: The element, or None if it isn't cached.
+        """
+        with self._lock:
+            element = self._cache.get(self.window, {}).get(selector)
+
+            if element is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+            return element
+
+    def store(self, selector:Selector, element):
+        """
+        Cache the element a selector found in the current window.
+
+        Args:
+            selector (Selector): The selector.
+            element (selenium.webdriver.remote.webelement.WebElement): The element found.
+        """
+        with self._lock:
+            self._cache.setdefault(self.window, {})[selector] = element
+
+    def switch(self, window:str):
+        """
+        Cache elements under another window, after the browser switches to it.
+
+        Args:
+            window (str): The window handle.
+        """
+        with self._lock:
+            self.window = window
+
+    def invalidate(self, window:str = None):
+        """
+        Forget cached elements, such as after navigating.
+
+        Args:
+            window (str, optional): Only forget the elements of this window. Defaults to every window.
+        """
+        with self._lock:
+            if window is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(window, None)
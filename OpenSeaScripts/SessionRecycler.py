@@ -0,0 +1,180 @@
+from OpenSeaScripts.Tracer import SpanRecord
+import collections, os, threading, time
+
+RecycleRecord = collections.namedtuple("RecycleRecord", ["time", "reason", "operations", "rss_before", "rss_after", "seconds"])
+
+def process_tree_rss(pid:int):
+    """
+    Returns the total resident memory of a process and all of its descendants, such as chromedriver and every
+    Chrome process it started. Uses psutil if it is installed, or /proc on Linux.
+
+    Args:
+        pid (int): The id of the root process.
+
+    Returns:
+        int: The resident memory in bytes, or None if it can't be measured on this system.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            total = 0
+
+            for process in [root] + root.children(recursive=True):
+                try:
+                    total += process.memory_info().rss
+                except psutil.Error:
+                    pass # Exited while we were counting
+
+            return total
+        except psutil.Error:
+            return None
+
+    if not os.path.isdir("/proc"):
+        return None
+
+    children = collections.defaultdict(list) # Parent pid -> child pids
+
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+
+        try:
+            with open("/proc/" + entry + "/stat", "r") as file:
+                stat = file.read()
+        except OSError:
+            continue
+
+        children[int(stat[stat.rfind(")") + 2:].split()[1])].append(int(entry)) # The name can contain spaces, so split after it
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    pending = [pid]
+
+    while pending:
+        current = pending.pop()
+        pending.extend(children[current])
+
+        try:
+            with open("/proc/" + str(current) + "/statm", "r") as file:
+                total += int(file.read().split()[1]) * page_size
+        except OSError:
+            pass
+
+    return total
+
+class SessionRecycler:
+    def __init__(self, max_rss:int = 1536 * 1024 * 1024, max_operations:int = 250, check_every:int = 5, history_size:int = 1000):
+        """
+        Create a recycler that quits and relaunches a browser's Chrome once it has grown too large, bounding memory in
+        long batches. Give it to OSSBrowser with the recycler argument. Chrome is checked before an upload or sale,
+        never during one, and relaunched on the same user_data_dir, so the MetaMask login is kept.
+        One recycler can be shared by many browsers, such as through OSSBrowserPool's browser_options.
+
+        Args:
+            max_rss (int, optional): Relaunch when Chrome's processes use more resident memory than this many bytes,
+                or None to not measure memory. Defaults to 1.5 GiB.
+            max_operations (int, optional): Relaunch after this many uploads and sales, or None for no limit. Defaults to 250.
+            check_every (int, optional): Measure memory every this many operations. Defaults to 5.
+            history_size (int, optional): How many RecycleRecords to keep. Defaults to 1000.
+        """
+        self.max_rss = max_rss
+        self.max_operations = max_operations
+        self.check_every = check_every
+        self.history = collections.deque(maxlen=history_size) # A RecycleRecord for every relaunch, oldest first
+        self._lock = threading.Lock()
+
+    def due(self, browser):
+        """
+        Check whether a browser's Chrome has passed a limit. Browsers attached to a remote session are never due.
+
+        Args:
+            browser (OSSBrowser): The browser.
+
+        Returns:
+            tuple: The reason and the memory measured in bytes (or None), or None if the browser isn't due.
+        """
+        pid = browser.chrome_pid()
+
+        if pid is None:
+            return None
+
+        if self.max_operations is not None and browser.operations >= self.max_operations:
+            return str(browser.operations) + " operations", None
+
+        if self.max_rss is not None and browser.operations > 0 and browser.operations % self.check_every == 0:
+            rss = process_tree_rss(pid)
+
+            if rss is not None and rss > self.max_rss:
+                return str(rss // (1024 * 1024)) + " MiB resident", rss
+
+        return None
+
+    def check(self, browser):
+        """
+        Relaunch a browser's Chrome if it has passed a limit.
+
+        Args:
+            browser (OSSBrowser): The browser, about to start another operation.
+
+        Returns:
+            bool: Whether the browser was relaunched.
+        """
+        due = self.due(browser)
+
+        if due is None:
+            return False
+
+        return self.recycle(browser, *due)
+
+    def recycle(self, browser, reason:str = "Requested", rss_before:int = None):
+        """
+        Quit and relaunch a browser's Chrome now, recording its memory before and after.
+
+        Args:
+            browser (OSSBrowser): The browser.
+            reason (str, optional): Why it is being relaunched. Defaults to "Requested".
+            rss_before (int, optional): The memory already measured before relaunching. Defaults to measuring it.
+
+        Returns:
+            bool: True once the browser is relaunched.
+        """
+        if rss_before is None:
+            rss_before = process_tree_rss(browser.chrome_pid())
+
+        operations = browser.operations
+        start = time.time()
+        begin = time.perf_counter()
+        browser.relaunch()
+        seconds = time.perf_counter() - begin
+        rss_after = process_tree_rss(browser.chrome_pid())
+        record = RecycleRecord(start, reason, operations, rss_before, rss_after, seconds)
+
+        with self._lock:
+            self.history.append(record)
+
+        browser.tracer.record(SpanRecord("browser.recycle", start, seconds, True, {"reason": reason, "operations": operations,
+            "rss_before": rss_before, "rss_after": rss_after}))
+        print("Relaunched Chrome after", reason)
+        return True
+
+    def summary(self):
+        """
+        Returns statistics of every relaunch so far.
+
+        Returns:
+            dict: The "count" of relaunches, the mean "rss_before" and "rss_after" in bytes, and the mean "seconds" a relaunch took.
+        """
+        with self._lock:
+            records = list(self.history)
+
+        def mean(values):
+            values = [value for value in values if value is not None]
+            return sum(values) / len(values) if len(values) > 0 else None
+
+        return {"count": len(records), "rss_before": mean(record.rss_before for record in records),
+            "rss_after": mean(record.rss_after for record in records), "seconds": mean(record.seconds for record in records)}
@@ -0,0 +1,57 @@
+class StepError(Exception):
+    resumable = False # Whether the failed step can run again on the same page
+    retryable = True # Whether trying again could succeed at all
+    committed = False # Whether the operation failed at or after its commit step, so the asset may have been created or listed anyway
+
+    def __init__(self, message:str, step:str = None, operation:str = None):
+        """
+        Create an error raised by a step of an operation, such as the "details" step of "upload".
+        Errors raised inside a step are tagged with the step and operation by OSSBrowser, and other
+        exceptions are wrapped in a StepError, so last_error always shows where an operation failed.
+
+        Args:
+            message (str): What went wrong.
+            step (str, optional): The name of the step that failed. Defaults to None.
+            operation (str, optional): The name of the operation, "upload" or "sell". Defaults to None.
+        """
+        super().__init__(message)
+        self.message = message
+        self.step = step
+        self.operation = operation
+
+    def __str__(self):
+        if self.step is None:
+            return self.message
+
+        return self.message + " (" + str(self.operation) + "." + self.step + ")"
+
+class ElementTimeoutError(StepError):
+    """
+    An element or condition didn't appear in time. The page may just be slow, so the step can run again.
+    """
+    resumable = True
+
+class ValidationError(StepError, ValueError):
+    """
+    The asset, or a value entered for it, was rejected. Trying again won't help.
+    """
+    retryable = False
+
+class ConfirmationMissingError(StepError):
+    """
+    The message shown once an asset is created or listed didn't appear. Waiting longer may still find it,
+    but the operation must not be started over, or the asset could be created or listed twice.
+    """
+    resumable = True
+
+class SignRejectedError(StepError):
+    """
+    The listing was rejected in MetaMask, or the sign window closed before signing.
+    """
+    retryable = False
+
+class WaitCancelledError(StepError):
+    """
+    The operation was cancelled with ElementWaiter.cancel.
+    """
+    retryable = False
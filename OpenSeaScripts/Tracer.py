@@ -0,0 +1,212 @@
+import collections, contextlib, json, os, tempfile, threading, time
+
+SpanRecord = collections.namedtuple("SpanRecord", ["name", "start", "duration", "ok", "attributes"])
+
+class Tracer:
+    def __init__(self, hooks:list = None, history_size:int = 10000):
+        """
+        Create a Tracer, which times named spans such as each phase of upload_asset and sell_asset.
+        Every finished span is kept in history and passed to each hook, such as the exporters in this module.
+
+        Args:
+            hooks (list, optional): Callables called with the SpanRecord of every finished span. Defaults to None.
+            history_size (int, optional): How many SpanRecords to keep for summary(). Defaults to 10000.
+        """
+        self.hooks = list(hooks or [])
+        self.history = collections.deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        """
+        Add a callable to be called with the SpanRecord of every finished span.
+
+        Args:
+            hook (callable): The hook.
+        """
+        self.hooks.append(hook)
+
+    @contextlib.contextmanager
+    def span(self, name:str, **attributes):
+        """
+        Time the code run inside a with block. A span is marked as not ok if the block raises.
+
+        Args:
+            name (str): The span name, such as "upload.media".
+            **attributes: Extra values stored in the SpanRecord, such as the asset name.
+        """
+        start = time.time()
+        begin = time.perf_counter()
+        ok = False
+
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(SpanRecord(name, start, time.perf_counter() - begin, ok, attributes))
+
+    def record(self, span_record:SpanRecord):
+        """
+        Store a finished span and pass it to every hook. A hook that fails is reported, not raised,
+        so a broken exporter never fails the operation being traced.
+
+        Args:
+            span_record (SpanRecord): The finished span.
+        """
+        with self._lock:
+            self.history.append(span_record)
+
+        for hook in self.hooks:
+            try:
+                hook(span_record)
+            except Exception as e:
+                print("Error: Tracer hook failed:", e)
+
+    def summary(self):
+        """
+        Returns statistics of every span name in history.
+
+        Returns:
+            dict: For each span name, a dict with its "count", "errors", "mean", "p50", "p99" and "max" durations in seconds.
+        """
+        with self._lock:
+            durations = collections.defaultdict(list)
+            errors = collections.Counter()
+
+            for span_record in self.history:
+                durations[span_record.name].append(span_record.duration)
+
+                if not span_record.ok:
+                    errors[span_record.name] += 1
+
+        summary = {}
+
+        for name, values in durations.items():
+            values.sort()
+            summary[name] = {"count": len(values), "errors": errors[name], "mean": sum(values) / len(values),
+                "p50": percentile(values, 50), "p99": percentile(values, 99), "max": values[-1]}
+
+        return summary
+
+def percentile(sorted_values:list, percent:float):
+    """
+    Returns a percentile of sorted values, using the nearest-rank method.
+
+    Args:
+        sorted_values (list): The values, sorted from smallest to largest.
+        percent (float): The percentile, from 0 to 100.
+
+    Returns:
+        float: The percentile, or 0 if there are no values.
+    """
+    if len(sorted_values) == 0:
+        return 0.0
+
+    rank = max(int(-(-percent * len(sorted_values) // 100)), 1) # Ceiling of percent% of the count
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+class JsonLinesExporter:
+    def __init__(self, path:str):
+        """
+        Create a Tracer hook that appends every span to a JSON lines file.
+
+        Args:
+            path (str): The file to append to.
+        """
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __call__(self, span_record:SpanRecord):
+        line = json.dumps({"name": span_record.name, "start": span_record.start, "duration": span_record.duration,
+            "ok": span_record.ok, "attributes": span_record.attributes}, default=str)
+
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        self._file.close()
+
+class PrometheusTextfileExporter:
+    default_buckets = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60]
+
+    def __init__(self, path:str, prefix:str = "openseascripts", buckets:list = None, interval:float = 10):
+        """
+        Create a Tracer hook that keeps a histogram of span durations and writes it to a file in the
+        Prometheus text format, for the node_exporter textfile collector. Percentiles such as p50 and p99
+        can then be found with histogram_quantile.
+
+        Args:
+            path (str): The .prom file to write.
+            prefix (str, optional): The start of every metric name. Defaults to "openseascripts".
+            buckets (list, optional): The histogram bucket upper bounds, in seconds. Defaults to PrometheusTextfileExporter.default_buckets.
+            interval (float, optional): The least seconds between writes. Call write() to write immediately. Defaults to 10.
+        """
+        self.path = path
+        self.prefix = prefix
+        self.buckets = sorted(buckets or PrometheusTextfileExporter.default_buckets)
+        self.interval = interval
+        self._histograms = {} # Span name -> [bucket counts, sum, count, errors]
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, span_record:SpanRecord):
+        with self._lock:
+            histogram = self._histograms.setdefault(span_record.name, [[0] * len(self.buckets), 0.0, 0, 0])
+
+            for i, bound in enumerate(self.buckets):
+                if span_record.duration <= bound:
+                    histogram[0][i] += 1
+
+            histogram[1] += span_record.duration
+            histogram[2] += 1
+
+            if not span_record.ok:
+                histogram[3] += 1
+
+            due = time.time() - self._last_write >= self.interval
+
+            if due:
+                self._last_write = time.time() # Claim this write, so other threads finishing spans now don't write too
+
+        if due:
+            self.write()
+
+    def write(self):
+        """
+        Write the current metrics to the file, replacing it atomically so a half-written file is never collected.
+        """
+        seconds = self.prefix + "_span_duration_seconds"
+        errors = self.prefix + "_span_errors_total"
+        lines = ["# HELP " + seconds + " Time spent in each phase of OpenSeaScripts operations.", "# TYPE " + seconds + " histogram"]
+        error_lines = ["# HELP " + errors + " Spans that ended with an error.", "# TYPE " + errors + " counter"]
+
+        with self._lock:
+            for name, (counts, total, count, failed) in sorted(self._histograms.items()):
+                label = 'span="' + name.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(seconds + "_bucket{" + label + ',le="' + repr(float(bound)) + '"} ' + str(bucket_count))
+
+                lines.append(seconds + "_bucket{" + label + ',le="+Inf"} ' + str(count))
+                lines.append(seconds + "_sum{" + label + "} " + repr(total))
+                lines.append(seconds + "_count{" + label + "} " + str(count))
+                error_lines.append(errors + "{" + label + "} " + str(failed))
+
+            self._last_write = time.time()
+
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp") # Unique, so concurrent writes don't collide
+
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as file:
+                file.write("\n".join(lines + error_lines) + "\n")
+
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+            raise
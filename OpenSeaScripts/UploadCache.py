@@ -0,0 +1,228 @@
+from OpenSeaScripts.ContentHash import file_hash, file_signature
+import hashlib, json, os, sqlite3, threading, time
+
+class UploadCache:
+    def __init__(self, path:str, max_entries:int = None, max_age:float = None):
+        """
+        Open a persistent cache of assets already uploaded, so re-running a collection that overlaps an earlier drop
+        doesn't create the same NFT again. Assets are keyed by the hash of their media and a digest of the fields that
+        define the NFT, so the same asset is recognized whatever its file is called, and an edited one is uploaded again.
+        Unlike an UploadJournal, which belongs to one batch, one cache can be shared by every batch.
+
+        Args:
+            path (str): The SQLite file to keep the cache in, created if needed.
+            max_entries (int, optional): Keep only this many of the most recently used assets. Defaults to no limit.
+            max_age (float, optional): Forget assets not used for this many seconds. Defaults to no limit.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None) # Used by every thread, under _lock
+
+        with self._lock:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS assets (key TEXT PRIMARY KEY, media_hash TEXT NOT NULL, url TEXT NOT NULL, "
+                "listed INTEGER NOT NULL DEFAULT 0, created REAL, last_used REAL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS assets_url ON assets (url)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS media (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, hash TEXT)")
+
+    def _media_hash(self, path:str):
+        """
+        Returns the content hash of a media file, only hashing it again if it changed since it was last hashed.
+
+        Args:
+            path (str): The media file.
+
+        Raises:
+            OSError: If the file can't be read.
+
+        Returns:
+            str: The content hash.
+        """
+        path = os.path.abspath(path)
+        size, mtime_ns = file_signature(path)
+
+        with self._lock:
+            row = self._connection.execute("SELECT hash FROM media WHERE path = ? AND size = ? AND mtime_ns = ?", (path, size, mtime_ns)).fetchone()
+
+        if row is not None:
+            return row[0]
+
+        content_hash = file_hash(path)
+
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO media (path, size, mtime_ns, hash) VALUES (?, ?, ?, ?)", (path, size, mtime_ns, content_hash))
+
+        return content_hash
+
+    def key(self, asset_options):
+        """
+        Returns the cache key of an asset: the hash of its media and a canonical digest of its name, description,
+        external link, traits, unlockable content, explicit flag, supply and blockchain. The order traits were
+        added in doesn't matter.
+
+        Args:
+            asset_options (AssetOptions): The asset.
+
+        Raises:
+            OSError: If the media file can't be read.
+
+        Returns:
+            tuple: The key and the media hash.
+        """
+        def traits(items):
+            return sorted(json.dumps(item, sort_keys=True) for item in items)
+
+        fields = {"name": asset_options.get_name(), "description": asset_options.get_description(), "external_link": asset_options.get_external_link(),
+            "properties": traits(asset_options.get_properties()), "levels": traits(asset_options.get_levels()), "stats": traits(asset_options.get_stats()),
+            "unlockable_content": asset_options.get_unlockable_content(), "explicit": asset_options.get_explicit(), "supply": asset_options.get_supply(),
+            "blockchain": asset_options.get_blockchain()}
+        media_hash = self._media_hash(asset_options.get_asset_path())
+        digest = hashlib.sha256(json.dumps(fields, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+        return media_hash + ":" + digest, media_hash
+
+    def get(self, asset_options):
+        """
+        Returns what is known about an asset from earlier uploads, setting its listed link if it was uploaded.
+
+        Args:
+            asset_options (AssetOptions): The asset.
+
+        Returns:
+            dict: The "url" of the asset and whether it was "listed", or None if it was never uploaded.
+        """
+        key, media_hash = self.key(asset_options)
+
+        with self._lock:
+            row = self._connection.execute("SELECT url, listed FROM assets WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                return None
+
+            self._connection.execute("UPDATE assets SET last_used = ? WHERE key = ?", (time.time(), key))
+
+        asset_options.set_listed_link(row[0])
+        return {"url": row[0], "listed": bool(row[1])}
+
+    def put(self, asset_options, url:str, listed:bool = False):
+        """
+        Remember that an asset was uploaded, and whether it was listed. Old entries are evicted if limits are set.
+
+        Args:
+            asset_options (AssetOptions): The asset.
+            url (str): The URL upload_asset returned.
+            listed (bool, optional): Whether the asset has been listed for sale. Defaults to False.
+        """
+        key, media_hash = self.key(asset_options)
+        now = time.time()
+
+        with self._lock:
+            self._connection.execute("INSERT INTO assets (key, media_hash, url, listed, created, last_used) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET url = excluded.url, listed = MAX(listed, excluded.listed), last_used = excluded.last_used",
+                (key, media_hash, url, int(listed), now, now))
+
+        if self.max_entries is not None or self.max_age is not None:
+            self.evict(self.max_entries, self.max_age)
+
+    def invalidate(self, asset_options = None, url:str = None):
+        """
+        Forget an asset, so it is uploaded again next time. Use this if an asset was deleted from OpenSea.
+
+        Args:
+            asset_options (AssetOptions, optional): The asset to forget. Defaults to None.
+            url (str, optional): Forget every asset uploaded to this URL. Defaults to None.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        removed = 0
+
+        if asset_options is not None:
+            key, media_hash = self.key(asset_options)
+
+            with self._lock:
+                removed += self._connection.execute("DELETE FROM assets WHERE key = ?", (key,)).rowcount
+
+        if url is not None:
+            with self._lock:
+                removed += self._connection.execute("DELETE FROM assets WHERE url = ?", (url,)).rowcount
+
+        return removed
+
+    def evict(self, max_entries:int = None, max_age:float = None):
+        """
+        Remove the least recently used entries.
+
+        Args:
+            max_entries (int, optional): Keep only this many entries. Defaults to no limit.
+            max_age (float, optional): Remove entries not used for this many seconds. Defaults to no limit.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        removed = 0
+
+        with self._lock:
+            if max_age is not None:
+                removed += self._connection.execute("DELETE FROM assets WHERE last_used < ?", (time.time() - max_age,)).rowcount
+
+            if max_entries is not None:
+                removed += self._connection.execute("DELETE FROM assets WHERE key NOT IN (SELECT key FROM assets ORDER BY last_used DESC LIMIT ?)",
+                    (max_entries,)).rowcount
+
+        return removed
+
+    def clear(self):
+        """
+        Forget every asset.
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM assets")
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+
+    def upload(self, browser, asset_options, create_link:str = "https://opensea.io/asset/create?enable_supply=true", journal = None):
+        """
+        Upload an asset with browser, unless it was uploaded before, remembering the URL.
+
+        Args:
+            browser (OSSBrowser): The browser to upload with.
+            asset_options (AssetOptions): The asset to upload.
+            create_link (str, optional): The URL to use to upload. Defaults to "https://opensea.io/asset/create?enable_supply=true".
+            journal (UploadJournal, optional): Also record the upload in this journal. Defaults to None.
+
+        Returns:
+            Boolean: False if the asset was not uploaded.
+            str: The URL of the asset if it was uploaded, now or before.
+        """
+        try:
+            known = self.get(asset_options)
+        except OSError:
+            known = None # Let the upload report the unreadable file
+
+        if known is not None:
+            return known["url"]
+
+        if journal is not None:
+            result = journal.upload(browser, asset_options, create_link)
+        else:
+            result = browser.upload_asset(asset_options, create_link)
+
+        if result:
+            self.put(asset_options, result)
+
+        return result
+
+    def close(self):
+        """
+        Closes the cache file.
+        """
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,316 @@
+from OpenSeaScripts.ContentHash import file_hash, file_signature
+import json, os, threading, time
+
+class UploadJournal:
+    PENDING = "pending"
+    UPLOADED = "uploaded"
+    LISTED = "listed"
+    FAILED = "failed"
+    UNCERTAIN = "uncertain" # Failed after the create or sign click, so it may have gone through and isn't tried again
+
+    def __init__(self, path:str):
+        """
+        Open an append-only journal recording the upload state of every asset in a batch, creating it if needed.
+        Each asset is keyed by its absolute path and the hash of its contents, so an edited file is uploaded again.
+        Every record is flushed and fsynced before the operation it describes continues, so the journal survives crashes.
+
+        Args:
+            path (str): The path of the JSON lines journal file.
+        """
+        self.path = path
+        self.entries = {} # The latest record for each key
+        self._signatures = {} # Absolute asset path -> (signature, hash), to skip re-hashing unchanged files
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            self._load()
+
+        self._file = open(path, "a", encoding="utf-8")
+
+        if self._file.tell() > 0 and not self._ends_with_newline():
+            self._file.write("\n") # Start after a partially written last line instead of joining it
+
+    def _load(self):
+        """
+        Read every record in the journal file, keeping the latest for each key.
+        A partially written last line, left by a crash, is ignored.
+        """
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+
+                self.entries[(record["path"], record["hash"])] = record
+
+                if record["signature"] is not None: # Not recorded while the file was unreadable
+                    self._signatures[record["path"]] = (record["signature"], record["hash"])
+
+    def _ends_with_newline(self):
+        """
+        Returns whether the journal file ends with a newline.
+        """
+        with open(self.path, "rb") as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def key(self, asset_options):
+        """
+        Returns the journal key of an asset, hashing its file only if it changed since it was last recorded.
+
+        Args:
+            asset_options (AssetOptions): The asset.
+
+        Raises:
+            OSError: If the asset file can't be read.
+
+        Returns:
+            tuple: The absolute asset path, its content hash, and its file signature.
+        """
+        path = os.path.abspath(asset_options.get_asset_path())
+        signature = file_signature(path)
+        known = self._signatures.get(path)
+
+        if known is not None and known[0] == signature:
+            return path, known[1], signature
+
+        content_hash = file_hash(path)
+        self._signatures[path] = (signature, content_hash)
+        return path, content_hash, signature
+
+    def _record_key(self, asset_options):
+        """
+        Returns key(), or if the asset file can't be read, its absolute path with an empty hash and no signature,
+        so a missing file can still be recorded as failed.
+
+        Args:
+            asset_options (AssetOptions): The asset.
+
+        Returns:
+            tuple: The absolute asset path, its content hash, and its file signature.
+        """
+        try:
+            return self.key(asset_options)
+        except OSError:
+            return os.path.abspath(asset_options.get_asset_path()), "", None
+
+    def record(self, asset_options, state:str, url:str = "", reason:str = ""):
+        """
+        Append a record of an asset's state to the journal.
+
+        Args:
+            asset_options (AssetOptions): The asset.
+            state (str): One of UploadJournal.PENDING, UPLOADED, LISTED, FAILED or UNCERTAIN.
+            url (str, optional): The OpenSea URL of the asset, once uploaded. Defaults to "".
+            reason (str, optional): Why the asset failed. Defaults to "".
+
+        Raises:
+            ValueError: If state is not a known state.
+
+        Returns:
+            dict: The record written.
+        """
+        if state not in (UploadJournal.PENDING, UploadJournal.UPLOADED, UploadJournal.LISTED, UploadJournal.FAILED, UploadJournal.UNCERTAIN):
+            raise ValueError("Unknown journal state: " + str(state))
+
+        path, content_hash, signature = self._record_key(asset_options)
+
+        with self._lock:
+            previous = self.entries.get((path, content_hash))
+
+            if url == "" and previous is not None:
+                url = previous["url"] # Keep the URL of an uploaded asset when it is later listed or fails to list
+
+            record = {"path": path, "hash": content_hash, "signature": signature, "state": state, "url": url, "reason": reason, "time": time.time()}
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.entries[(path, content_hash)] = record
+
+        return record
+
+    def get(self, asset_options):
+        """
+        Returns the latest record of an asset, or None if it has never been recorded.
+
+        Args:
+            asset_options (AssetOptions): The asset.
+
+        Returns:
+            dict: The latest record, with "state", "url" and "reason" keys.
+        """
+        path, content_hash, signature = self._record_key(asset_options)
+        return self.entries.get((path, content_hash))
+
+    def is_complete(self, asset_options, listed:bool = False):
+        """
+        Returns whether an asset has already been uploaded, or listed if listed is True.
+
+        Args:
+            asset_options (AssetOptions): The asset.
+            listed (bool, optional): Whether the asset must also have been listed for sale. Defaults to False.
+
+        Returns:
+            bool: True if the work for this asset is done.
+        """
+        record = self.get(asset_options)
+
+        if record is None:
+            return False
+
+        if listed:
+            return record["state"] == UploadJournal.LISTED
+        else:
+            return record["state"] in (UploadJournal.UPLOADED, UploadJournal.LISTED) or (record["state"] in (UploadJournal.FAILED, UploadJournal.UNCERTAIN) and record["url"] != "")
+
+    def is_uncertain(self, asset_options, listed:bool = False):
+        """
+        Returns whether an asset's upload, or its sale if listed is True, failed after the create or sign button was
+        clicked. It may have gone through, so it isn't tried again until it is checked on OpenSea and recorded again.
+
+        Args:
+            asset_options (AssetOptions): The asset.
+            listed (bool, optional): Whether to check the sale instead of the upload. Defaults to False.
+
+        Returns:
+            bool: True if the asset needs to be checked by hand.
+        """
+        record = self.get(asset_options)
+
+        if record is None or record["state"] != UploadJournal.UNCERTAIN:
+            return False
+
+        return listed or record["url"] == "" # An uncertain sale still has the URL of its upload
+
+    def record_failure(self, browser, asset_options, url:str = ""):
+        """
+        Record a failed upload or sale, as UNCERTAIN if browser's error shows it failed after its commit step.
+
+        Args:
+            browser (OSSBrowser): The browser the operation failed in.
+            asset_options (AssetOptions): The asset.
+            url (str, optional): The OpenSea URL of the asset, if it was uploaded. Defaults to "".
+        """
+        error = getattr(browser, "last_error", None)
+
+        if getattr(error, "committed", False):
+            self.record(asset_options, UploadJournal.UNCERTAIN, url, "May have gone through, check manually: " + str(error))
+        else:
+            self.record(asset_options, UploadJournal.FAILED, url, str(error if error is not None else ""))
+
+    def upload(self, browser, asset_options, create_link:str = "https://opensea.io/asset/create?enable_supply=true"):
+        """
+        Upload an asset with browser, unless the journal shows it was already uploaded, recording the outcome.
+
+        Args:
+            browser (OSSBrowser): The browser to upload with.
+            asset_options (AssetOptions): The asset to upload.
+            create_link (str, optional): The URL to use to upload. Defaults to "https://opensea.io/asset/create?enable_supply=true".
+
+        Returns:
+            Boolean: False if the asset was not uploaded.
+            str: The URL of the asset if it was uploaded, now or in an earlier run.
+        """
+        try:
+            self.key(asset_options)
+        except OSError as e:
+            print("Error:", e)
+            self.record(asset_options, UploadJournal.FAILED, reason=str(e)) # Recorded so the rest of the batch carries on
+            return False
+
+        if self.is_complete(asset_options):
+            url = self.get(asset_options)["url"]
+            asset_options.set_listed_link(url)
+            return url
+
+        if self.is_uncertain(asset_options):
+            print("Error: Not uploading", asset_options.get_name(), "again,", self.get(asset_options)["reason"])
+            return False
+
+        self.record(asset_options, UploadJournal.PENDING)
+        result = browser.upload_asset(asset_options, create_link)
+
+        if result:
+            self.record(asset_options, UploadJournal.UPLOADED, result)
+        else:
+            self.record_failure(browser, asset_options)
+
+        return result
+
+    def sell(self, browser, asset_options, price:float, start_date = None, end_date = None):
+        """
+        List an uploaded asset for sale with browser, unless the journal shows it was already listed, recording the outcome.
+
+        Args:
+            browser (OSSBrowser): The browser to sell with.
+            asset_options (AssetOptions): The asset to sell. Its URL is taken from the journal or its listed link.
+            price (float): The price to sell the asset for.
+            start_date (datetime, optional): The start date of the sale.
+            end_date (datetime, optional): The end date of the sale.
+
+        Returns:
+            True if the asset is listed for sale, False otherwise.
+        """
+        if self.is_complete(asset_options, listed=True):
+            return True
+
+        if self.is_uncertain(asset_options, listed=True):
+            print("Error: Not listing", asset_options.get_name(), "again,", self.get(asset_options)["reason"])
+            return False
+
+        record = self.get(asset_options)
+        url = record["url"] if record is not None and record["url"] != "" else asset_options.get_listed_link()
+
+        if url == "":
+            self.record(asset_options, UploadJournal.FAILED, reason="Asset has not been uploaded")
+            return False
+
+        if browser.sell_asset(url, price, start_date, end_date):
+            self.record(asset_options, UploadJournal.LISTED, url)
+            return True
+
+        self.record_failure(browser, asset_options, url)
+        return False
+
+    def pending(self, assets, listed:bool = False):
+        """
+        Yield only the assets whose work is not done yet. Uncertain assets are left out, since they must be checked by hand.
+
+        Args:
+            assets (iterable): The AssetOptions in the batch.
+            listed (bool, optional): Whether assets must also have been listed to be skipped. Defaults to False.
+
+        Yields:
+            AssetOptions: Each asset still to be uploaded, or listed.
+        """
+        for asset_options in assets:
+            if not self.is_complete(asset_options, listed) and not self.is_uncertain(asset_options, listed):
+                yield asset_options
+
+    def counts(self):
+        """
+        Returns how many assets are in each state.
+
+        Returns:
+            dict: The number of assets for each state.
+        """
+        with self._lock:
+            counts = {UploadJournal.PENDING: 0, UploadJournal.UPLOADED: 0, UploadJournal.LISTED: 0, UploadJournal.FAILED: 0, UploadJournal.UNCERTAIN: 0}
+
+            for record in self.entries.values():
+                counts[record["state"]] += 1
+
+        return counts
+
+    def close(self):
+        """
+        Closes the journal file.
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,413 @@
+from OpenSeaScripts.AssetOptions import AssetOptions
+from abc import ABC, abstractmethod
+import collections, datetime, json, os, socket, sqlite3, threading, time
+
+Job = collections.namedtuple("Job", ["id", "kind", "payload", "attempts", "worker"])
+
+class QueueBackend(ABC):
+    """
+    The storage behind a WorkQueue. Subclass this to share jobs through something other than SQLite,
+    such as a database server. Every method must be safe to call from many processes and machines at once.
+    """
+    QUEUED = "queued"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+
+    @abstractmethod
+    def put(self, kind:str, payload:dict):
+        """
+        Add a job. Returns its id.
+        """
+
+    @abstractmethod
+    def lease(self, worker:str, lease_seconds:float, max_attempts:int):
+        """
+        Take the oldest queued job, or a leased job whose lease expired, for lease_seconds. Jobs whose lease
+        expired max_attempts times are marked failed instead. Returns a Job, or None if there is nothing to do.
+        """
+
+    @abstractmethod
+    def extend(self, job_id:int, worker:str, lease_seconds:float):
+        """
+        Extend a lease held by worker. Returns False if the lease was lost.
+        """
+
+    @abstractmethod
+    def ack(self, job_id:int, worker:str, result):
+        """
+        Mark a job done with its result.
+        """
+
+    @abstractmethod
+    def fail(self, job_id:int, worker:str, error:str, retry:bool):
+        """
+        Record a failed attempt, queueing the job again if retry is True.
+        """
+
+    @abstractmethod
+    def counts(self):
+        """
+        Returns a dict of the number of jobs in each state, keyed by QUEUED, LEASED, DONE and FAILED.
+        """
+
+class SQLiteQueueBackend(QueueBackend):
+    def __init__(self, path:str, busy_timeout:float = 30):
+        """
+        Create a queue backend in a SQLite file. SQLite's file locking keeps leases atomic between processes, so every
+        worker on a machine can use the same file. SQLite locking is unreliable on network file systems, so for workers
+        on several machines, put the file on one of them and point remote workers' browsers at it with remote WebDriver
+        sessions, or implement a QueueBackend on a shared database server.
+
+        Args:
+            path (str): The database file, created if needed.
+            busy_timeout (float, optional): Seconds to wait for another process's lock. Defaults to 30.
+        """
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local() # sqlite3 connections can't be shared between threads
+
+        with self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+                "state TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, lease_until REAL, result TEXT, error TEXT, updated REAL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id)")
+
+    def _connect(self):
+        """
+        Returns this thread's connection to the database.
+        """
+        if getattr(self._local, "connection", None) is None:
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None) # Transactions are started explicitly
+            connection.execute("PRAGMA journal_mode=WAL") # Readers don't block the writer
+            self._local.connection = connection
+
+        return _Transaction(self._local.connection)
+
+    def put(self, kind:str, payload:dict):
+        with self._connect() as connection:
+            cursor = connection.execute("INSERT INTO jobs (kind, payload, state, updated) VALUES (?, ?, ?, ?)",
+                (kind, json.dumps(payload), QueueBackend.QUEUED, time.time()))
+            return cursor.lastrowid
+
+    def lease(self, worker:str, lease_seconds:float, max_attempts:int):
+        now = time.time()
+
+        with self._connect() as connection:
+            connection.execute("UPDATE jobs SET state = ?, error = ?, updated = ? WHERE state = ? AND lease_until < ? AND attempts >= ?",
+                (QueueBackend.FAILED, "Lease expired " + str(max_attempts) + " times", now, QueueBackend.LEASED, now, max_attempts))
+            row = connection.execute("SELECT id, kind, payload, attempts FROM jobs WHERE state = ? OR (state = ? AND lease_until < ?) ORDER BY id LIMIT 1",
+                (QueueBackend.QUEUED, QueueBackend.LEASED, now)).fetchone()
+
+            if row is None:
+                return None
+
+            connection.execute("UPDATE jobs SET state = ?, worker = ?, lease_until = ?, attempts = attempts + 1, updated = ? WHERE id = ?",
+                (QueueBackend.LEASED, worker, now + lease_seconds, now, row[0]))
+
+        return Job(row[0], row[1], json.loads(row[2]), row[3] + 1, worker)
+
+    def extend(self, job_id:int, worker:str, lease_seconds:float):
+        with self._connect() as connection:
+            cursor = connection.execute("UPDATE jobs SET lease_until = ?, updated = ? WHERE id = ? AND worker = ? AND state = ?",
+                (time.time() + lease_seconds, time.time(), job_id, worker, QueueBackend.LEASED))
+            return cursor.rowcount == 1
+
+    def ack(self, job_id:int, worker:str, result):
+        with self._connect() as connection: # Recorded even if the lease was lost, so finished work isn't repeated
+            connection.execute("UPDATE jobs SET state = ?, worker = ?, result = ?, error = NULL, updated = ? WHERE id = ? AND state != ?",
+                (QueueBackend.DONE, worker, json.dumps(result), time.time(), job_id, QueueBackend.DONE))
+
+    def fail(self, job_id:int, worker:str, error:str, retry:bool):
+        state = QueueBackend.QUEUED if retry else QueueBackend.FAILED
+
+        with self._connect() as connection:
+            connection.execute("UPDATE jobs SET state = ?, error = ?, lease_until = NULL, updated = ? WHERE id = ? AND worker = ? AND state = ?",
+                (state, error, time.time(), job_id, worker, QueueBackend.LEASED))
+
+    def counts(self):
+        with self._connect() as connection:
+            counts = {QueueBackend.QUEUED: 0, QueueBackend.LEASED: 0, QueueBackend.DONE: 0, QueueBackend.FAILED: 0}
+            counts.update(dict(connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()))
+            return counts
+
+    def results(self, state:str = None):
+        """
+        Returns the jobs in a state, or every job.
+
+        Args:
+            state (str, optional): Only return jobs in this state, such as QueueBackend.FAILED. Defaults to None.
+
+        Returns:
+            list: A dict for each job, with its "id", "kind", "payload", "state", "attempts", "worker", "result" and "error".
+        """
+        query = "SELECT id, kind, payload, state, attempts, worker, result, error FROM jobs"
+        parameters = ()
+
+        if state is not None:
+            query += " WHERE state = ?"
+            parameters = (state,)
+
+        with self._connect() as connection:
+            return [{"id": row[0], "kind": row[1], "payload": json.loads(row[2]), "state": row[3], "attempts": row[4], "worker": row[5],
+                "result": json.loads(row[6]) if row[6] is not None else None, "error": row[7]} for row in connection.execute(query + " ORDER BY id", parameters)]
+
+class _Transaction:
+    """
+    Runs a with block as a transaction that takes the write lock at the start, so a lease can't be taken twice.
+    """
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+class WorkQueue:
+    UPLOAD = "upload"
+    SELL = "sell"
+
+    def __init__(self, backend, lease_seconds:float = 300, max_attempts:int = 3):
+        """
+        Create a queue of upload and sell jobs shared by workers in many processes or on many machines. Workers lease
+        a job, run it, and acknowledge it. A worker keeps its lease while the job runs, so if a worker dies its lease
+        expires and the job is given to another worker.
+
+        Args:
+            backend (QueueBackend or str): Where jobs are stored, or the path of a SQLite file to use.
+            lease_seconds (float, optional): How long a worker holds a job without renewing its lease. Defaults to 300.
+            max_attempts (int, optional): How many times a job is tried before it is marked failed. Defaults to 3.
+        """
+        self.backend = backend if isinstance(backend, QueueBackend) else SQLiteQueueBackend(backend)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def put_upload(self, asset_options:AssetOptions, create_link:str = "https://opensea.io/asset/create?enable_supply=true", price:float = None,
+        start_date:datetime.datetime = None, end_date:datetime.datetime = None):
+        """
+        Queue an asset to upload. If a price is given, a sell job is queued once it is uploaded.
+
+        Args:
+            asset_options (AssetOptions): The asset. Its files must be at the same path on every worker.
+            create_link (str, optional): The URL to use to upload. Defaults to "https://opensea.io/asset/create?enable_supply=true".
+            price (float, optional): The price to list the asset for after uploading. Defaults to None.
+            start_date (datetime, optional): The start date of the sale.
+            end_date (datetime, optional): The end date of the sale.
+
+        Returns:
+            int: The job id.
+        """
+        return self.backend.put(WorkQueue.UPLOAD, {"asset": asset_options.to_dict(), "create_link": create_link, "price": price,
+            "start_date": _to_iso(start_date), "end_date": _to_iso(end_date)})
+
+    def put_sell(self, asset_link:str, price:float, start_date:datetime.datetime = None, end_date:datetime.datetime = None):
+        """
+        Queue an uploaded asset to sell.
+
+        Args:
+            asset_link (str): The URL of the asset.
+            price (float): The price to sell the asset for.
+            start_date (datetime, optional): The start date of the sale.
+            end_date (datetime, optional): The end date of the sale.
+
+        Returns:
+            int: The job id.
+        """
+        return self.backend.put(WorkQueue.SELL, {"asset_link": asset_link, "price": price, "start_date": _to_iso(start_date), "end_date": _to_iso(end_date)})
+
+    def lease(self, worker:str):
+        """
+        Take the next job for a worker.
+
+        Args:
+            worker (str): The worker's id.
+
+        Returns:
+            Job: The job, or None if there is nothing to do.
+        """
+        return self.backend.lease(worker, self.lease_seconds, self.max_attempts)
+
+    def counts(self):
+        """
+        Returns the number of jobs in each state.
+        """
+        return self.backend.counts()
+
+class QueueWorker:
+    def __init__(self, queue:WorkQueue, browser, worker_id:str = None):
+        """
+        Create a worker that runs jobs from a WorkQueue with one browser, which can be a local Chrome window or a
+        remote WebDriver session opened with OSSBrowser(command_executor_url, session_id).
+
+        Args:
+            queue (WorkQueue): The queue.
+            browser (OSSBrowser): The browser to run jobs with.
+            worker_id (str, optional): The name leases are taken under. Defaults to "<host name>-<process id>".
+        """
+        self.queue = queue
+        self.browser = browser
+        self.worker_id = worker_id if worker_id is not None else socket.gethostname() + "-" + str(os.getpid())
+        self.completed = 0
+        self.failed = 0
+        self._stop = threading.Event()
+
+    def _run_job(self, job:Job):
+        """
+        Run a job with the browser.
+
+        Args:
+            job (Job): The job.
+
+        Returns:
+            The upload_asset or sell_asset result.
+        """
+        payload = job.payload
+
+        if job.kind == WorkQueue.UPLOAD:
+            asset_options = AssetOptions.from_dict(payload["asset"])
+            result = self.browser.upload_asset(asset_options, payload["create_link"])
+
+            if result and payload.get("price") is not None: # List it from any worker
+                self.queue.put_sell(result, payload["price"], _from_iso(payload["start_date"]), _from_iso(payload["end_date"]))
+
+            return result
+
+        if job.kind == WorkQueue.SELL:
+            return self.browser.sell_asset(payload["asset_link"], payload["price"], _from_iso(payload["start_date"]), _from_iso(payload["end_date"]))
+
+        raise ValueError("Unknown job kind: " + str(job.kind))
+
+    def run_one(self):
+        """
+        Lease, run and acknowledge one job, renewing the lease while it runs.
+
+        Returns:
+            bool: False if there was no job to run.
+        """
+        job = self.queue.lease(self.worker_id)
+
+        if job is None:
+            return False
+
+        done = threading.Event()
+
+        def renew():
+            while not done.wait(self.queue.lease_seconds / 3):
+                if not self.queue.backend.extend(job.id, self.worker_id, self.queue.lease_seconds):
+                    return # Lease lost, another worker may run the job too
+
+        renewer = threading.Thread(target=renew, name="QueueWorker-lease", daemon=True)
+        renewer.start()
+
+        try:
+            result = self._run_job(job)
+            error = self.browser.last_error
+        except Exception as e:
+            result = False
+            error = e
+        finally:
+            done.set()
+            renewer.join()
+
+        if result:
+            self.queue.backend.ack(job.id, self.worker_id, result)
+            self.completed += 1
+        else:
+            committed = getattr(error, "committed", False) # Running it again could create or list the asset twice
+            retry = getattr(error, "retryable", True) and not committed and job.attempts < self.queue.max_attempts
+            reason = str(error)
+
+            if committed:
+                reason = ("May have been created" if job.kind == WorkQueue.UPLOAD else "May have been listed") + ", check manually: " + reason
+
+            self.queue.backend.fail(job.id, self.worker_id, reason, retry)
+            self.failed += 1
+
+        return True
+
+    def run(self, stop_when_empty:bool = True, poll_interval:float = 5):
+        """
+        Run jobs until the queue is empty, or until stop() is called.
+
+        Args:
+            stop_when_empty (bool, optional): Whether to return once there are no jobs, instead of waiting for more. Defaults to True.
+            poll_interval (float, optional): Seconds to wait before checking an empty queue again. Defaults to 5.
+
+        Returns:
+            int: The number of jobs completed.
+        """
+        while not self._stop.is_set():
+            if not self.run_one():
+                counts = self.queue.counts()
+
+                if stop_when_empty and counts[QueueBackend.LEASED] == 0 and counts[QueueBackend.QUEUED] == 0:
+                    break
+
+                self._stop.wait(poll_interval) # Jobs may still come back from other workers' expired leases
+
+        return self.completed
+
+    def stop(self):
+        """
+        Stop after the current job.
+        """
+        self._stop.set()
+
+def _to_iso(date:datetime.datetime):
+    return date.isoformat() if date is not None else None
+
+def _from_iso(text:str):
+    return datetime.datetime.fromisoformat(text) if text is not None else None
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run or fill a queue of OpenSea upload and sell jobs shared by many workers")
+    parser.add_argument("queue", help="The SQLite queue file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Queue every asset in a manifest")
+    enqueue.add_argument("manifest", help="A manifest file or metadata directory, see ManifestLoader")
+    enqueue.add_argument("--create-link", default="https://opensea.io/asset/create?enable_supply=true")
+    enqueue.add_argument("--price", type=float, help="List each asset for this price after uploading")
+
+    worker = commands.add_parser("worker", help="Run jobs until the queue is empty")
+    worker.add_argument("--command-executor-url", help="Attach to a remote WebDriver session instead of opening Chrome")
+    worker.add_argument("--session-id", help="The remote session to attach to")
+    worker.add_argument("--profile", help="The Chrome profile directory of a new browser")
+    worker.add_argument("--headless", action="store_true")
+    worker.add_argument("--worker-id")
+    worker.add_argument("--lease", type=float, default=300, help="Lease length in seconds")
+    worker.add_argument("--wait", action="store_true", help="Wait for more jobs instead of stopping when the queue is empty")
+
+    commands.add_parser("status", help="Show the number of jobs in each state")
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        from OpenSeaScripts.ManifestLoader import ManifestLoader
+
+        work_queue = WorkQueue(args.queue)
+        count = 0
+
+        for asset_options in ManifestLoader(args.manifest, on_error=print):
+            work_queue.put_upload(asset_options, args.create_link, args.price)
+            count += 1
+
+        print("Queued", count, "assets")
+    elif args.command == "worker":
+        from OpenSeaScripts.OSSBrowser import OSSBrowser
+
+        browser = OSSBrowser(args.command_executor_url, args.session_id, args.headless, args.profile, start_url=None)
+        queue_worker = QueueWorker(WorkQueue(args.queue, args.lease), browser, args.worker_id)
+
+        try:
+            queue_worker.run(not args.wait)
+        finally:
+            if args.command_executor_url is None:
+                browser.close() # Leave remote sessions open for the next run
+
+        print(queue_worker.worker_id, "completed", queue_worker.completed, "jobs,", queue_worker.failed, "failed")
+    else:
+        print(WorkQueue(args.queue).counts())